@@ -0,0 +1,10 @@
+"""Throughput benchmarks (run with ``python -m benchmarks.run``)."""
+
+from __future__ import annotations
+
+from pathlib import Path
+import sys
+
+_SRC_PATH = str(Path(__file__).resolve().parents[1] / "src")
+if _SRC_PATH not in sys.path:
+    sys.path.insert(0, _SRC_PATH)
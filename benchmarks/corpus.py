@@ -0,0 +1,403 @@
+"""Reproducible synthetic corpora for throughput benchmarks.
+
+Workbooks are written with openpyxl, legacy .xls workbooks with the
+minimal BIFF8 writer in legacy_xls, and Word documents as hand-built
+WordprocessingML, then every ZIP entry is normalized (fixed timestamps and
+document properties) so the same profile and seed always produce
+byte-identical files. ``manifest.json`` records the spec and checksums.
+"""
+
+from __future__ import annotations
+
+import hashlib
+import json
+import random
+import re
+import shutil
+import struct
+import zipfile
+import zlib
+from dataclasses import asdict, dataclass
+from pathlib import Path
+from typing import Iterator
+from xml.sax.saxutils import escape
+
+from openpyxl import Workbook
+
+from .legacy_xls import LegacySheet, write_xls
+
+MANIFEST_NAME = "manifest.json"
+_FIXED_ZIP_TIME = (1980, 1, 1, 0, 0, 0)
+_FIXED_TIMESTAMP = "2000-01-01T00:00:00Z"
+_WORDS = (
+    "alpha", "beta", "gamma", "delta", "売上", "在庫", "顧客", "請求",
+    "north", "south", "east", "west", "対応済", "未対策", "確認", "備考",
+)
+
+
+@dataclass(frozen=True)
+class CorpusSpec:
+    """Shape of a generated corpus."""
+
+    wide_rows: int
+    wide_cols: int
+    tall_rows: int
+    tall_cols: int
+    many_sheets: int
+    many_sheet_rows: int
+    image_sheets: int
+    formula_rows: int
+    docx_table_rows: int
+    docx_table_cols: int
+    deep_depth: int
+    deep_fanout: int
+    legacy_rows: int
+
+
+PROFILES = {
+    "smoke": CorpusSpec(
+        wide_rows=10,
+        wide_cols=40,
+        tall_rows=300,
+        tall_cols=6,
+        many_sheets=6,
+        many_sheet_rows=10,
+        image_sheets=3,
+        formula_rows=50,
+        docx_table_rows=40,
+        docx_table_cols=5,
+        deep_depth=3,
+        deep_fanout=2,
+        legacy_rows=300,
+    ),
+    "default": CorpusSpec(
+        wide_rows=100,
+        wide_cols=256,
+        tall_rows=30_000,
+        tall_cols=8,
+        many_sheets=60,
+        many_sheet_rows=50,
+        image_sheets=6,
+        formula_rows=3_000,
+        docx_table_rows=2_000,
+        docx_table_cols=6,
+        deep_depth=8,
+        deep_fanout=2,
+        legacy_rows=60_000,
+    ),
+}
+
+
+def generate_corpus(root: Path, profile: str = "default", seed: int = 0) -> Path:
+    """Generate (or reuse) the corpus for profile/seed under root."""
+    spec = PROFILES[profile]
+    expected = {"profile": profile, "seed": seed, "spec": asdict(spec)}
+    manifest_path = root / MANIFEST_NAME
+    if manifest_path.exists():
+        manifest = json.loads(manifest_path.read_text(encoding="utf-8"))
+        if {key: manifest.get(key) for key in expected} == expected and verify_corpus(root):
+            return root
+        shutil.rmtree(root)
+
+    root.mkdir(parents=True, exist_ok=True)
+    rng = random.Random(seed)
+
+    _write_grid_workbook(root / "xlsx" / "wide.xlsx", rng, spec.wide_rows, spec.wide_cols)
+    _write_grid_workbook(root / "xlsx" / "tall.xlsx", rng, spec.tall_rows, spec.tall_cols)
+    _write_many_sheets(root / "xlsx" / "many_sheets.xlsx", rng, spec.many_sheets, spec.many_sheet_rows)
+    _write_image_workbook(root / "xlsx" / "images.xlsx", rng, spec.image_sheets)
+    _write_formula_workbook(root / "xlsx" / "formulas.xlsx", rng, spec.formula_rows)
+    _write_docx_table(
+        root / "docx" / "large_table.docx", rng, spec.docx_table_rows, spec.docx_table_cols
+    )
+    _write_legacy_export(root / "xls" / "export.xls", rng, spec.legacy_rows)
+    _write_legacy_report(root / "xls" / "report.xls", rng, spec.image_sheets, spec.formula_rows)
+    _write_deep_tree(root / "deep", rng, spec.deep_depth, spec.deep_fanout)
+
+    files = sorted(path for path in root.rglob("*") if path.is_file() and path.name != MANIFEST_NAME)
+    manifest = dict(expected)
+    manifest["files"] = {
+        path.relative_to(root).as_posix(): _sha256(path) for path in files
+    }
+    manifest_path.write_text(json.dumps(manifest, indent=2), encoding="utf-8")
+    return root
+
+
+def verify_corpus(root: Path) -> bool:
+    """Return True when every file matches the checksum in the manifest."""
+    manifest = json.loads((root / MANIFEST_NAME).read_text(encoding="utf-8"))
+    for relative, digest in manifest.get("files", {}).items():
+        path = root / relative
+        if not path.is_file() or _sha256(path) != digest:
+            return False
+    return True
+
+
+def _write_grid_workbook(path: Path, rng: random.Random, rows: int, cols: int) -> None:
+    workbook = Workbook()
+    sheet = workbook.active
+    sheet.title = "Data"
+    sheet.append([f"col_{index}" for index in range(cols)])
+    for _ in range(rows):
+        sheet.append([_cell_value(rng) for _ in range(cols)])
+    _save_workbook(workbook, path)
+
+
+def _write_many_sheets(path: Path, rng: random.Random, sheets: int, rows: int) -> None:
+    workbook = Workbook()
+    workbook.remove(workbook.active)
+    for index in range(sheets):
+        sheet = workbook.create_sheet(f"Sheet{index + 1:03d}")
+        sheet.append(["id", "name", "amount", "note"])
+        for row in range(rows):
+            sheet.append([row + 1, rng.choice(_WORDS), rng.randint(0, 10_000), _text(rng, 4)])
+    _save_workbook(workbook, path)
+
+
+def _write_image_workbook(path: Path, rng: random.Random, sheets: int) -> None:
+    workbook = Workbook()
+    workbook.remove(workbook.active)
+    for index in range(sheets):
+        sheet = workbook.create_sheet(f"Chart{index + 1}")
+        sheet.append(["label", "value"])
+        for row in range(20):
+            sheet.append([rng.choice(_WORDS), rng.random()])
+    _save_workbook(workbook, path)
+    # Every other sheet gets a picture; written as raw DrawingML so that no
+    # imaging library is needed to build the corpus.
+    _add_pictures(path, list(range(1, sheets + 1, 2)))
+
+
+def _write_formula_workbook(path: Path, rng: random.Random, rows: int) -> None:
+    workbook = Workbook()
+    sheet = workbook.active
+    sheet.title = "Formulas"
+    sheet.append(["a", "b", "sum", "product"])
+    for row in range(2, rows + 2):
+        sheet.append([rng.randint(0, 999), rng.randint(0, 999), f"=A{row}+B{row}", f"=A{row}*B{row}"])
+    # openpyxl never stores cached results, so every formula lacks a value.
+    _save_workbook(workbook, path)
+
+
+def _write_legacy_export(path: Path, rng: random.Random, rows: int) -> None:
+    def export_rows() -> Iterator[list[object]]:
+        yield ["id", "code", "name", "amount", "rate", "note"]
+        for row in range(rows):
+            yield [
+                row + 1,
+                f"C{rng.randint(0, 99_999):05d}",
+                rng.choice(_WORDS),
+                rng.randint(0, 1_000_000),
+                round(rng.random(), 4),
+                _text(rng, 3),
+            ]
+
+    write_xls(path, [LegacySheet("Export", export_rows())])
+
+
+def _write_legacy_report(path: Path, rng: random.Random, sheets: int, formula_rows: int) -> None:
+    report = [
+        LegacySheet(
+            f"Chart{index + 1}",
+            [["label", "value"]] + [[rng.choice(_WORDS), rng.random()] for _ in range(20)],
+            picture=index % 2 == 0,
+        )
+        for index in range(sheets)
+    ]
+    formulas = [["a", "b", "sum"]] + [
+        [rng.randint(0, 999), rng.randint(0, 999), f"=A{row}+B{row}"]
+        for row in range(2, formula_rows + 2)
+    ]
+    write_xls(path, [*report, LegacySheet("Formulas", formulas)])
+
+
+def _write_docx_table(path: Path, rng: random.Random, rows: int, cols: int) -> None:
+    header = "".join(_docx_cell(f"Header {index + 1}") for index in range(cols))
+    body = [f"<w:tr>{header}</w:tr>"]
+    for _ in range(rows):
+        cells = "".join(_docx_cell(_text(rng, rng.randint(1, 6))) for _ in range(cols))
+        body.append(f"<w:tr>{cells}</w:tr>")
+    paragraphs = "".join(_docx_paragraph(_text(rng, 12)) for _ in range(5))
+    _write_docx(path, f"{paragraphs}<w:tbl>{''.join(body)}</w:tbl>")
+
+
+def _write_deep_tree(root: Path, rng: random.Random, depth: int, fanout: int) -> None:
+    pending = [(root, 0)]
+    while pending:
+        directory, level = pending.pop()
+        if level == depth:
+            _write_docx(directory / "leaf.docx", "".join(_docx_paragraph(_text(rng, 8)) for _ in range(3)))
+            workbook = Workbook()
+            workbook.active.append([_text(rng, 2), rng.randint(0, 100)])
+            _save_workbook(workbook, directory / "leaf.xlsx")
+            continue
+        for index in range(fanout):
+            pending.append((directory / f"level{level + 1:02d}_{index}", level + 1))
+
+
+def _save_workbook(workbook: Workbook, path: Path) -> None:
+    path.parent.mkdir(parents=True, exist_ok=True)
+    workbook.save(path)
+    _normalize_zip(path)
+
+
+def _write_docx(path: Path, body_xml: str) -> None:
+    path.parent.mkdir(parents=True, exist_ok=True)
+    word_ns = "http://schemas.openxmlformats.org/wordprocessingml/2006/main"
+    parts = {
+        "[Content_Types].xml": (
+            '<?xml version="1.0" encoding="UTF-8" standalone="yes"?>'
+            '<Types xmlns="http://schemas.openxmlformats.org/package/2006/content-types">'
+            '<Default Extension="rels" ContentType="application/vnd.openxmlformats-package.relationships+xml"/>'
+            '<Default Extension="xml" ContentType="application/xml"/>'
+            '<Override PartName="/word/document.xml" ContentType="application/'
+            'vnd.openxmlformats-officedocument.wordprocessingml.document.main+xml"/>'
+            "</Types>"
+        ),
+        "_rels/.rels": (
+            '<?xml version="1.0" encoding="UTF-8" standalone="yes"?>'
+            '<Relationships xmlns="http://schemas.openxmlformats.org/package/2006/relationships">'
+            '<Relationship Id="rId1" Type="http://schemas.openxmlformats.org/officeDocument/2006/'
+            'relationships/officeDocument" Target="word/document.xml"/>'
+            "</Relationships>"
+        ),
+        "word/document.xml": (
+            '<?xml version="1.0" encoding="UTF-8" standalone="yes"?>'
+            f'<w:document xmlns:w="{word_ns}"><w:body>{body_xml}</w:body></w:document>'
+        ),
+    }
+    with zipfile.ZipFile(path, "w", compression=zipfile.ZIP_DEFLATED) as archive:
+        for name, text in parts.items():
+            archive.writestr(zipfile.ZipInfo(name, _FIXED_ZIP_TIME), text.encode("utf-8"), zipfile.ZIP_DEFLATED)
+
+
+def _docx_paragraph(text: str) -> str:
+    return f"<w:p><w:r><w:t>{escape(text)}</w:t></w:r></w:p>"
+
+
+def _docx_cell(text: str) -> str:
+    return f"<w:tc>{_docx_paragraph(text)}</w:tc>"
+
+
+def _add_pictures(path: Path, sheet_numbers: list[int]) -> None:
+    with zipfile.ZipFile(path) as archive:
+        parts = {info.filename: archive.read(info.filename) for info in archive.infolist()}
+
+    content_types = parts["[Content_Types].xml"].decode("utf-8")
+    overrides = ['<Default Extension="png" ContentType="image/png"/>']
+    parts["xl/media/image1.png"] = _tiny_png()
+
+    for number in sheet_numbers:
+        sheet_part = f"xl/worksheets/sheet{number}.xml"
+        sheet_xml = parts[sheet_part].decode("utf-8")
+        if "xmlns:r=" not in sheet_xml:
+            sheet_xml = sheet_xml.replace(
+                "<worksheet ",
+                '<worksheet xmlns:r="http://schemas.openxmlformats.org/officeDocument/2006/relationships" ',
+                1,
+            )
+        sheet_xml = sheet_xml.replace("</worksheet>", '<drawing r:id="rIdPic1"/></worksheet>')
+        parts[sheet_part] = sheet_xml.encode("utf-8")
+        parts[f"xl/worksheets/_rels/sheet{number}.xml.rels"] = _relationships(
+            "rIdPic1",
+            "http://schemas.openxmlformats.org/officeDocument/2006/relationships/drawing",
+            f"../drawings/drawing{number}.xml",
+        )
+        parts[f"xl/drawings/drawing{number}.xml"] = _drawing_xml().encode("utf-8")
+        parts[f"xl/drawings/_rels/drawing{number}.xml.rels"] = _relationships(
+            "rId1",
+            "http://schemas.openxmlformats.org/officeDocument/2006/relationships/image",
+            "../media/image1.png",
+        )
+        overrides.append(
+            f'<Override PartName="/xl/drawings/drawing{number}.xml" '
+            'ContentType="application/vnd.openxmlformats-officedocument.drawing+xml"/>'
+        )
+
+    parts["[Content_Types].xml"] = content_types.replace(
+        "</Types>", "".join(overrides) + "</Types>"
+    ).encode("utf-8")
+    _write_zip(path, parts)
+
+
+def _relationships(rel_id: str, rel_type: str, target: str) -> bytes:
+    return (
+        '<?xml version="1.0" encoding="UTF-8" standalone="yes"?>'
+        '<Relationships xmlns="http://schemas.openxmlformats.org/package/2006/relationships">'
+        f'<Relationship Id="{rel_id}" Type="{rel_type}" Target="{target}"/>'
+        "</Relationships>"
+    ).encode("utf-8")
+
+
+def _drawing_xml() -> str:
+    return (
+        '<?xml version="1.0" encoding="UTF-8" standalone="yes"?>'
+        '<xdr:wsDr xmlns:xdr="http://schemas.openxmlformats.org/drawingml/2006/spreadsheetDrawing" '
+        'xmlns:a="http://schemas.openxmlformats.org/drawingml/2006/main" '
+        'xmlns:r="http://schemas.openxmlformats.org/officeDocument/2006/relationships">'
+        "<xdr:oneCellAnchor>"
+        "<xdr:from><xdr:col>3</xdr:col><xdr:colOff>0</xdr:colOff>"
+        "<xdr:row>1</xdr:row><xdr:rowOff>0</xdr:rowOff></xdr:from>"
+        '<xdr:ext cx="95250" cy="95250"/>'
+        "<xdr:pic>"
+        '<xdr:nvPicPr><xdr:cNvPr id="1" name="Picture 1"/><xdr:cNvPicPr/></xdr:nvPicPr>'
+        '<xdr:blipFill><a:blip r:embed="rId1"/><a:stretch><a:fillRect/></a:stretch></xdr:blipFill>'
+        '<xdr:spPr><a:prstGeom prst="rect"><a:avLst/></a:prstGeom></xdr:spPr>'
+        "</xdr:pic>"
+        "<xdr:clientData/>"
+        "</xdr:oneCellAnchor>"
+        "</xdr:wsDr>"
+    )
+
+
+def _tiny_png() -> bytes:
+    def chunk(kind: bytes, data: bytes) -> bytes:
+        body = kind + data
+        return struct.pack(">I", len(data)) + body + struct.pack(">I", zlib.crc32(body))
+
+    header = struct.pack(">IIBBBBB", 10, 10, 8, 2, 0, 0, 0)
+    pixels = b"".join(b"\x00" + b"\x20\x80\xe0" * 10 for _ in range(10))
+    return (
+        b"\x89PNG\r\n\x1a\n"
+        + chunk(b"IHDR", header)
+        + chunk(b"IDAT", zlib.compress(pixels, 9))
+        + chunk(b"IEND", b"")
+    )
+
+
+def _normalize_zip(path: Path) -> None:
+    with zipfile.ZipFile(path) as archive:
+        parts = {info.filename: archive.read(info.filename) for info in archive.infolist()}
+    core = parts.get("docProps/core.xml")
+    if core is not None:
+        parts["docProps/core.xml"] = re.sub(
+            rb"(<dcterms:(?:created|modified)[^>]*>)[^<]*(</dcterms:)",
+            rb"\g<1>" + _FIXED_TIMESTAMP.encode("ascii") + rb"\g<2>",
+            core,
+        )
+    _write_zip(path, parts)
+
+
+def _write_zip(path: Path, parts: dict[str, bytes]) -> None:
+    with zipfile.ZipFile(path, "w", compression=zipfile.ZIP_DEFLATED) as archive:
+        for name, payload in parts.items():
+            archive.writestr(zipfile.ZipInfo(name, _FIXED_ZIP_TIME), payload, zipfile.ZIP_DEFLATED)
+
+
+def _cell_value(rng: random.Random) -> object:
+    kind = rng.random()
+    if kind < 0.4:
+        return rng.randint(-100_000, 100_000)
+    if kind < 0.6:
+        return round(rng.uniform(-1000, 1000), 3)
+    if kind < 0.95:
+        return _text(rng, rng.randint(1, 3))
+    return None
+
+
+def _text(rng: random.Random, words: int) -> str:
+    return " ".join(rng.choice(_WORDS) for _ in range(words))
+
+
+def _sha256(path: Path) -> str:
+    return hashlib.sha256(path.read_bytes()).hexdigest()
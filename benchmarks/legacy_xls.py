@@ -0,0 +1,233 @@
+"""Minimal BIFF8 (.xls) writer for the synthetic benchmark corpus.
+
+Supports what the converter reads: shared strings (split over CONTINUE
+records), numbers, booleans, formulas (any string starting with ``=``,
+stored with an empty-string result like xlwt writes them) and picture
+objects. The output is deterministic and uses 512-byte OLE2 sectors like
+Excel.
+"""
+
+from __future__ import annotations
+
+import struct
+from dataclasses import dataclass
+from pathlib import Path
+from typing import Iterable, Sequence
+
+_SECTOR_SIZE = 512
+_IDS_PER_SECTOR = _SECTOR_SIZE // 4
+_MINI_STREAM_CUTOFF = 4096
+_END_OF_CHAIN = 0xFFFFFFFE
+_FAT_SECTOR = 0xFFFFFFFD
+_DIFAT_SECTOR = 0xFFFFFFFC
+_FREE_SECTOR = 0xFFFFFFFF
+_MAX_RECORD = 8224
+_MAX_ROWS = 65536
+
+
+@dataclass
+class LegacySheet:
+    """One worksheet: rows of str/int/float/bool/None, optionally a picture."""
+
+    name: str
+    rows: Iterable[Sequence[object]]
+    picture: bool = False
+
+
+def write_xls(path: Path, sheets: Sequence[LegacySheet]) -> None:
+    path.parent.mkdir(parents=True, exist_ok=True)
+    path.write_bytes(build_xls(sheets))
+
+
+def build_xls(sheets: Sequence[LegacySheet]) -> bytes:
+    strings: dict[str, int] = {}
+    bodies = [_sheet_body(sheet, strings) for sheet in sheets]
+
+    globals_head = _record(0x0809, struct.pack("<HHHHII", 0x0600, 0x0005, 0, 0, 0, 0))
+    globals_head += _record(0x0042, struct.pack("<H", 1200))
+    # Minimal font and XF tables; every cell uses XF 0 (General).
+    font = struct.pack("<HHHHHBBBB", 200, 0, 0x7FFF, 400, 0, 0, 0, 0, 0)
+    globals_head += _record(0x0031, font + _short_string("Arial"))
+    for index in range(16):
+        kind = 0xFFF5 if index < 15 else 0x0001
+        xf = struct.pack("<HHHBBBBIIH", 0, 0, kind, 0x20, 0, 0, 0, 0, 0, 0x20C0)
+        globals_head += _record(0x00E0, xf)
+    sheet_records_size = sum(len(_boundsheet(0, sheet.name)) for sheet in sheets)
+    globals_tail = _sst(strings) + _record(0x000A, b"")
+
+    offset = len(globals_head) + sheet_records_size + len(globals_tail)
+    boundsheets = b""
+    for sheet, body in zip(sheets, bodies):
+        boundsheets += _boundsheet(offset, sheet.name)
+        offset += len(body)
+
+    stream = globals_head + boundsheets + globals_tail + b"".join(bodies)
+    return _compound_file(stream)
+
+
+def _sheet_body(sheet: LegacySheet, strings: dict[str, int]) -> bytes:
+    cells = bytearray()
+    last_row = -1
+    width = 0
+    for row_index, row in enumerate(sheet.rows):
+        if row_index >= _MAX_ROWS:
+            raise ValueError(f"BIFF8 sheets hold at most {_MAX_ROWS} rows: {sheet.name}")
+        for col, value in enumerate(row):
+            if value is None:
+                continue
+            last_row = row_index
+            width = max(width, col + 1)
+            cells += _cell(row_index, col, value, strings)
+
+    body = _record(0x0809, struct.pack("<HHHHII", 0x0600, 0x0010, 0, 0, 0, 0))
+    body += _record(0x0200, struct.pack("<IIHHH", 0, last_row + 1, 0, width, 0))
+    body += bytes(cells)
+    if sheet.picture:
+        # OBJ with an ftCmo subrecord of type Picture, then ftEnd.
+        cmo = struct.pack("<HHHHH12s", 0x15, 0x12, 0x08, 1, 0x6011, b"\x00" * 12)
+        body += _record(0x005D, cmo + struct.pack("<HH", 0, 0))
+    return body + _record(0x000A, b"")
+
+
+def _cell(row: int, col: int, value: object, strings: dict[str, int]) -> bytes:
+    if isinstance(value, bool):
+        return _record(0x0205, struct.pack("<HHHBB", row, col, 0, int(value), 0))
+    if isinstance(value, (int, float)):
+        return _record(0x0203, struct.pack("<HHHd", row, col, 0, float(value)))
+    text = str(value)
+    if text.startswith("="):
+        # Empty-string result (kind 3) as written by tools that do not
+        # calculate; the expression is a constant integer token.
+        rgce = struct.pack("<BH", 0x1E, 0)
+        return _record(
+            0x0006,
+            struct.pack("<HHHQHIH", row, col, 0, 0xFFFF000000000003, 0, 0, len(rgce)) + rgce,
+        )
+    index = strings.setdefault(text, len(strings))
+    return _record(0x00FD, struct.pack("<HHHI", row, col, 0, index))
+
+
+def _sst(strings: dict[str, int]) -> bytes:
+    """SST record, continued in CONTINUE records as Excel does."""
+    records = b""
+    current = bytearray(struct.pack("<II", len(strings), len(strings)))
+    record_type = 0x00FC
+    for text in strings:
+        wide = any(ord(char) > 0xFF for char in text)
+        encoded = text.encode("utf-16-le" if wide else "latin-1")
+        header = struct.pack("<HB", len(text), 1 if wide else 0)
+        if len(current) + len(header) + (2 if wide else 1) > _MAX_RECORD:
+            records += _record(record_type, bytes(current))
+            current, record_type = bytearray(), 0x003C
+        current += header
+        width = 2 if wide else 1
+        while encoded:
+            room = (_MAX_RECORD - len(current)) // width * width
+            current += encoded[:room]
+            encoded = encoded[room:]
+            if encoded:
+                records += _record(record_type, bytes(current))
+                # A continued string starts with its own option byte.
+                current, record_type = bytearray([1 if wide else 0]), 0x003C
+    return records + _record(record_type, bytes(current))
+
+
+def _boundsheet(offset: int, name: str) -> bytes:
+    return _record(0x0085, struct.pack("<IBB", offset, 0, 0) + _short_string(name))
+
+
+def _short_string(text: str) -> bytes:
+    return struct.pack("<BB", len(text), 1) + text.encode("utf-16-le")
+
+
+def _record(record_type: int, payload: bytes) -> bytes:
+    return struct.pack("<HH", record_type, len(payload)) + payload
+
+
+def _compound_file(stream: bytes) -> bytes:
+    """Wrap stream as the only ``Workbook`` stream of an OLE2 (v3) file."""
+    # Streams below 4096 bytes would live in the mini stream; pad instead.
+    stream = stream.ljust(_MINI_STREAM_CUTOFF, b"\x00")
+    stream_sectors = -(-len(stream) // _SECTOR_SIZE)
+    fat_sectors = difat_sectors = 0
+    while True:
+        used = difat_sectors + fat_sectors + 1 + stream_sectors
+        if fat_sectors * _IDS_PER_SECTOR >= used and difat_sectors * (_IDS_PER_SECTOR - 1) >= max(0, fat_sectors - 109):
+            break
+        if fat_sectors * _IDS_PER_SECTOR < used:
+            fat_sectors += 1
+        else:
+            difat_sectors += 1
+
+    # Layout: DIFAT sectors, FAT sectors, one directory sector, the stream.
+    fat_ids = list(range(difat_sectors, difat_sectors + fat_sectors))
+    directory_id = difat_sectors + fat_sectors
+    first_stream = directory_id + 1
+    fat = [_DIFAT_SECTOR] * difat_sectors + [_FAT_SECTOR] * fat_sectors + [_END_OF_CHAIN]
+    fat += [first_stream + index + 1 for index in range(stream_sectors - 1)] + [_END_OF_CHAIN]
+    fat += [_FREE_SECTOR] * (fat_sectors * _IDS_PER_SECTOR - len(fat))
+
+    header_difat = (fat_ids[:109] + [_FREE_SECTOR] * 109)[:109]
+    header = struct.pack(
+        "<8s16sHHHHH6sIIIIIIIII109I",
+        b"\xd0\xcf\x11\xe0\xa1\xb1\x1a\xe1",
+        b"\x00" * 16,
+        0x003E,
+        0x0003,
+        0xFFFE,
+        9,
+        6,
+        b"\x00" * 6,
+        0,
+        fat_sectors,
+        directory_id,
+        0,
+        _MINI_STREAM_CUTOFF,
+        _END_OF_CHAIN,
+        0,
+        0 if difat_sectors else _END_OF_CHAIN,
+        difat_sectors,
+        *header_difat,
+    )
+
+    difat = b""
+    remaining = fat_ids[109:]
+    for index in range(difat_sectors):
+        chunk = remaining[: _IDS_PER_SECTOR - 1]
+        remaining = remaining[_IDS_PER_SECTOR - 1 :]
+        chunk += [_FREE_SECTOR] * (_IDS_PER_SECTOR - 1 - len(chunk))
+        chunk.append(index + 1 if index + 1 < difat_sectors else _END_OF_CHAIN)
+        difat += struct.pack(f"<{_IDS_PER_SECTOR}I", *chunk)
+
+    directory = (
+        _directory_entry("Root Entry", 5, child=1, start=_END_OF_CHAIN, size=0)
+        + _directory_entry("Workbook", 2, child=_FREE_SECTOR, start=first_stream, size=len(stream))
+        + _directory_entry("", 0, child=_FREE_SECTOR, start=0, size=0) * 2
+    )
+
+    return (
+        header
+        + difat
+        + struct.pack(f"<{len(fat)}I", *fat)
+        + directory
+        + stream.ljust(stream_sectors * _SECTOR_SIZE, b"\x00")
+    )
+
+
+def _directory_entry(name: str, kind: int, child: int, start: int, size: int) -> bytes:
+    encoded = (name + "\x00").encode("utf-16-le")
+    return struct.pack(
+        "<64sHBBIII16sI16sIQ",
+        encoded,
+        len(encoded),
+        kind,
+        1,
+        _FREE_SECTOR,
+        _FREE_SECTOR,
+        child,
+        b"\x00" * 16,
+        0,
+        b"\x00" * 16,
+        start,
+        size,
+    )
@@ -0,0 +1,299 @@
+"""End-to-end throughput benchmark.
+
+Usage (from the repository root)::
+
+    python -m benchmarks.run --profile smoke
+    python -m benchmarks.run --update-baseline
+    python -m benchmarks.run --baseline benchmarks/baseline.json
+    python -m benchmarks.run --profile default --no-baseline
+
+Each stage (scan, convert, pipeline) runs in its own child process so that
+peak RSS is measured per stage; with --repeat N the run with the median
+throughput of N is kept. Results are compared with the stored
+baseline; any throughput drop or RSS growth beyond the tolerance is
+reported as a regression and the process exits with status 1. Throughput
+depends on the machine, so no baseline is committed: record one with
+--update-baseline on the machine that runs the comparison. Without one
+at the default location the results are only reported; a --baseline
+file given explicitly must hold the profile (status 2 otherwise).
+"""
+
+from __future__ import annotations
+
+import argparse
+import json
+import os
+import shutil
+import subprocess
+import sys
+import tempfile
+import threading
+import time
+from collections import defaultdict
+from pathlib import Path
+from typing import Callable, Sequence
+
+from app.core.profiling import peak_rss_bytes
+
+from .corpus import PROFILES, generate_corpus
+
+STAGES = ("scan", "convert", "pipeline")
+DEFAULT_BASELINE = Path(__file__).resolve().parent / "baseline.json"
+_REPO_ROOT = Path(__file__).resolve().parents[1]
+# Metrics where a higher value is better; everything else must not grow.
+_HIGHER_IS_BETTER = ("files_per_second", "mb_per_second")
+_LOWER_IS_BETTER = ("peak_rss_mb",)
+_SCAN_BATCH = 5
+
+
+def run_stage(stage: str, corpus: Path) -> dict[str, object]:
+    """Run one stage in the current process and return its measurements."""
+    from app.core.file_scanner import scan_input_files
+
+    files = scan_input_files(corpus)
+    total_bytes = sum(path.stat().st_size for path in files)
+    groups: dict[str, float] = defaultdict(float)
+
+    if stage == "convert":
+        # Imported before timing starts so only conversion work is measured.
+        from app.core.document_converter import convert_document
+
+    started = time.perf_counter()
+    if stage == "scan":
+        # A scan takes well under a millisecond: time batches for at least
+        # half a second and keep the fastest, like timeit, to shed noise.
+        batches: list[float] = []
+        while len(batches) < 5 or time.perf_counter() - started < 0.5:
+            batch_started = time.perf_counter()
+            for _ in range(_SCAN_BATCH):
+                scan_input_files(corpus)
+            batches.append((time.perf_counter() - batch_started) / _SCAN_BATCH)
+        elapsed = min(batches)
+    elif stage == "convert":
+        for path in files:
+            file_started = time.perf_counter()
+            convert_document(path)
+            groups[_group_name(path, corpus)] += time.perf_counter() - file_started
+        elapsed = time.perf_counter() - started
+    elif stage == "pipeline":
+        elapsed = _run_pipeline(corpus)
+    else:
+        raise ValueError(f"Unknown stage: {stage}")
+
+    return {
+        "stage": stage,
+        "files": len(files),
+        "bytes": total_bytes,
+        "seconds": elapsed,
+        "files_per_second": len(files) / elapsed if elapsed > 0 else 0.0,
+        "mb_per_second": total_bytes / (1024 * 1024) / elapsed if elapsed > 0 else 0.0,
+        "peak_rss_mb": peak_rss_bytes() / (1024 * 1024),
+        "group_seconds": dict(sorted(groups.items())),
+    }
+
+
+def _run_pipeline(corpus: Path) -> float:
+    from app.controllers.conversion_controller import ConversionController
+    from app.models.conversion_options import ConversionOptions
+
+    done = threading.Event()
+    outcome: dict[str, object] = {}
+
+    def finish(key: str) -> Callable[[object], None]:
+        def callback(value: object) -> None:
+            outcome[key] = value
+            done.set()
+
+        return callback
+
+    controller = ConversionController(
+        dispatch=lambda callback: callback(),
+        on_start=lambda output_dir, total: outcome.setdefault("output_dir", output_dir),
+        on_progress=lambda event: None,
+        on_complete=finish("summary"),
+        on_error=finish("error"),
+    )
+    started = time.perf_counter()
+    controller.start(corpus, ConversionOptions(use_scan_index=False))
+    done.wait()
+    elapsed = time.perf_counter() - started
+
+    output_dir = outcome.get("output_dir")
+    if isinstance(output_dir, Path) and output_dir.exists():
+        shutil.rmtree(output_dir)
+    if "error" in outcome:
+        raise RuntimeError(f"Pipeline failed: {outcome['error']}")
+    return elapsed
+
+
+def _group_name(path: Path, corpus: Path) -> str:
+    relative = path.relative_to(corpus)
+    if relative.parts[0] == "deep":
+        return f"deep/*{path.suffix}"
+    return relative.as_posix()
+
+
+def _run_stage_in_child(stage: str, corpus: Path) -> dict[str, object]:
+    completed = subprocess.run(
+        [sys.executable, "-m", "benchmarks.run", "--child-stage", stage, "--corpus", str(corpus)],
+        cwd=_REPO_ROOT,
+        capture_output=True,
+        text=True,
+        check=False,
+    )
+    if completed.returncode != 0:
+        raise RuntimeError(f"Stage {stage} failed:\n{completed.stderr}")
+    return json.loads(completed.stdout.strip().splitlines()[-1])
+
+
+def _run_stage_median(stage: str, corpus: Path, repeat: int) -> dict[str, object]:
+    runs = sorted(
+        (_run_stage_in_child(stage, corpus) for _ in range(max(1, repeat))),
+        key=lambda result: float(result["files_per_second"]),
+    )
+    return runs[len(runs) // 2]
+
+
+def compare_with_baseline(
+    results: dict[str, dict[str, object]],
+    baseline: dict[str, dict[str, object]],
+    tolerance: float,
+) -> list[str]:
+    """Return human-readable regressions of results against baseline."""
+    regressions: list[str] = []
+    for stage, current in results.items():
+        reference = baseline.get(stage)
+        if not reference:
+            continue
+        for metric in _HIGHER_IS_BETTER:
+            expected = float(reference[metric])
+            actual = float(current[metric])
+            if expected > 0 and actual < expected * (1 - tolerance):
+                regressions.append(
+                    f"{stage}.{metric}: {actual:.2f} < baseline {expected:.2f} "
+                    f"(-{(1 - actual / expected) * 100:.0f}%)"
+                )
+        for metric in _LOWER_IS_BETTER:
+            expected = float(reference[metric])
+            actual = float(current[metric])
+            if expected > 0 and actual > expected * (1 + tolerance):
+                regressions.append(
+                    f"{stage}.{metric}: {actual:.1f} > baseline {expected:.1f} "
+                    f"(+{(actual / expected - 1) * 100:.0f}%)"
+                )
+    return regressions
+
+
+def _print_report(results: dict[str, dict[str, object]]) -> None:
+    print(f"{'stage':<10}{'files':>7}{'MB':>9}{'seconds':>10}{'files/s':>10}{'MB/s':>9}{'peak MB':>10}")
+    for stage, result in results.items():
+        print(
+            f"{stage:<10}{result['files']:>7}"
+            f"{float(result['bytes']) / (1024 * 1024):>9.2f}"
+            f"{float(result['seconds']):>10.3f}"
+            f"{float(result['files_per_second']):>10.1f}"
+            f"{float(result['mb_per_second']):>9.2f}"
+            f"{float(result['peak_rss_mb']):>10.1f}"
+        )
+        for group, seconds in dict(result.get("group_seconds") or {}).items():
+            print(f"    {group:<40}{seconds:>10.3f}s")
+
+
+def build_parser() -> argparse.ArgumentParser:
+    parser = argparse.ArgumentParser(prog="python -m benchmarks.run", description=__doc__.split("\n\n")[0])
+    parser.add_argument("--profile", choices=sorted(PROFILES), default="default")
+    parser.add_argument("--seed", type=int, default=0)
+    parser.add_argument(
+        "--corpus",
+        type=Path,
+        default=None,
+        help="Corpus directory (default: reused folder under the system temp dir).",
+    )
+    parser.add_argument("--stages", nargs="+", choices=STAGES, default=list(STAGES))
+    parser.add_argument(
+        "--repeat",
+        type=int,
+        default=3,
+        help="Runs per stage; the run with the median throughput is reported.",
+    )
+    parser.add_argument(
+        "--baseline",
+        type=Path,
+        default=None,
+        help="Baseline file (default: benchmarks/baseline.json, optional).",
+    )
+    parser.add_argument("--update-baseline", action="store_true")
+    parser.add_argument(
+        "--no-baseline",
+        action="store_true",
+        help="Only report results; do not require or compare with a baseline.",
+    )
+    parser.add_argument(
+        "--tolerance",
+        type=float,
+        default=0.25,
+        help="Allowed relative slowdown / RSS growth before failing.",
+    )
+    parser.add_argument("--json", type=Path, default=None, help="Also write results as JSON.")
+    parser.add_argument("--child-stage", choices=STAGES, help=argparse.SUPPRESS)
+    return parser
+
+
+def main(argv: Sequence[str] | None = None) -> int:
+    args = build_parser().parse_args(argv)
+
+    if args.child_stage:
+        print(json.dumps(run_stage(args.child_stage, args.corpus)))
+        return 0
+
+    explicit_baseline = args.baseline is not None
+    if args.baseline is None:
+        args.baseline = DEFAULT_BASELINE
+    baselines: dict[str, dict[str, dict[str, object]]] = {}
+    if args.baseline.exists():
+        baselines = json.loads(args.baseline.read_text(encoding="utf-8"))
+    key = f"{args.profile}/seed={args.seed}"
+    if key not in baselines and not (args.update_baseline or args.no_baseline):
+        if explicit_baseline:
+            print(
+                f"No baseline for {key} in {args.baseline}; "
+                "run with --update-baseline to record one or --no-baseline to skip the comparison.",
+                file=sys.stderr,
+            )
+            return 2
+        print(
+            f"No baseline for {key} on this machine; reporting without comparison "
+            "(record one with --update-baseline).",
+            file=sys.stderr,
+        )
+        args.no_baseline = True
+
+    corpus = args.corpus or Path(tempfile.gettempdir()) / f"docxxlsx-bench-{args.profile}-{args.seed}"
+    print(f"Corpus: {corpus} (profile={args.profile}, seed={args.seed})", file=sys.stderr)
+    generate_corpus(corpus, args.profile, args.seed)
+
+    results = {stage: _run_stage_median(stage, corpus, args.repeat) for stage in args.stages}
+    _print_report(results)
+    if args.json:
+        args.json.write_text(json.dumps(results, indent=2), encoding="utf-8")
+
+    if args.update_baseline:
+        baselines[key] = results
+        args.baseline.write_text(json.dumps(baselines, indent=2) + os.linesep, encoding="utf-8")
+        print(f"Baseline updated: {args.baseline} [{key}]", file=sys.stderr)
+        return 0
+
+    if args.no_baseline:
+        return 0
+
+    regressions = compare_with_baseline(results, baselines[key], args.tolerance)
+    for regression in regressions:
+        print(f"REGRESSION: {regression}", file=sys.stderr)
+    if regressions:
+        return 1
+    print("No regressions against baseline.", file=sys.stderr)
+    return 0
+
+
+if __name__ == "__main__":
+    sys.exit(main())
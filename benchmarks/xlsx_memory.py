@@ -0,0 +1,218 @@
+"""Peak-RSS benchmark for .xlsx workbooks with large shared-string tables.
+
+Usage (from the repository root)::
+
+    python -m benchmarks.xlsx_memory
+    python -m benchmarks.xlsx_memory --rows 1000000 --columns 4
+
+Generates a workbook whose cells are all distinct shared strings and
+converts it once with each engine in its own child process: ``markitdown``
+(the openpyxl-based path: MarkItDown/pandas, the image check and the two
+formula-check loads) and ``xlsx-compact`` (the streaming reader with the
+array-backed shared-string store). Peak RSS is reported in total and as
+growth over the process after importing the engine.
+"""
+
+from __future__ import annotations
+
+import argparse
+import json
+import random
+import subprocess
+import sys
+import tempfile
+import time
+import zipfile
+from pathlib import Path
+from typing import Sequence
+from xml.sax.saxutils import escape
+
+from app.core.excel_cells import column_letter
+from app.core.profiling import peak_rss_bytes
+
+ENGINES = ("markitdown", "xlsx-compact")
+_REPO_ROOT = Path(__file__).resolve().parents[1]
+_MAIN_NS = "http://schemas.openxmlformats.org/spreadsheetml/2006/main"
+_REL_NS = "http://schemas.openxmlformats.org/officeDocument/2006/relationships"
+_PKG_REL_NS = "http://schemas.openxmlformats.org/package/2006/relationships"
+_WORDS = ("売上", "顧客", "請求", "在庫", "order", "invoice", "customer", "東京", "大阪", "memo")
+
+
+def write_string_heavy_xlsx(path: Path, rows: int, columns: int, seed: int = 0) -> None:
+    """Write a workbook of rows x columns distinct shared strings plus an amount column."""
+    rnd = random.Random(seed)
+    path.parent.mkdir(parents=True, exist_ok=True)
+    string_count = (rows + 1) * columns
+    with zipfile.ZipFile(path, "w", compression=zipfile.ZIP_DEFLATED) as archive:
+        archive.writestr("[Content_Types].xml", _CONTENT_TYPES)
+        archive.writestr("_rels/.rels", _PACKAGE_RELS)
+        archive.writestr("xl/workbook.xml", _WORKBOOK)
+        archive.writestr("xl/_rels/workbook.xml.rels", _WORKBOOK_RELS)
+        archive.writestr("xl/styles.xml", _STYLES)
+
+        with archive.open("xl/sharedStrings.xml", "w") as handle:
+            handle.write(
+                f'<?xml version="1.0" encoding="UTF-8" standalone="yes"?>\n'
+                f'<sst xmlns="{_MAIN_NS}" count="{string_count}" uniqueCount="{string_count}">'.encode()
+            )
+            batch: list[str] = [f"<si><t>column {col}</t></si>" for col in range(columns)]
+            for row in range(rows):
+                for col in range(columns):
+                    text = f"{rnd.choice(_WORDS)}-{row:07d}-{col}-{rnd.getrandbits(40):010x}"
+                    batch.append(f"<si><t>{escape(text)}</t></si>")
+                if len(batch) >= 10_000:
+                    handle.write("".join(batch).encode("utf-8"))
+                    batch.clear()
+            batch.append("</sst>")
+            handle.write("".join(batch).encode("utf-8"))
+
+        last_column = column_letter(columns)
+        with archive.open("xl/worksheets/sheet1.xml", "w") as handle:
+            handle.write(
+                f'<?xml version="1.0" encoding="UTF-8" standalone="yes"?>\n'
+                f'<worksheet xmlns="{_MAIN_NS}"><dimension ref="A1:{last_column}{rows + 1}"/>'
+                f"<sheetData>".encode()
+            )
+            header = "".join(
+                f'<c r="{column_letter(col)}1" t="s"><v>{col}</v></c>' for col in range(columns)
+            )
+            batch = [f'<row r="1">{header}<c r="{last_column}1" t="inlineStr"><is><t>amount</t></is></c></row>']
+            index = columns
+            for row in range(2, rows + 2):
+                cells = []
+                for col in range(columns):
+                    cells.append(f'<c r="{column_letter(col)}{row}" t="s"><v>{index}</v></c>')
+                    index += 1
+                cells.append(f'<c r="{last_column}{row}"><v>{rnd.randint(0, 10**6)}</v></c>')
+                batch.append(f'<row r="{row}">{"".join(cells)}</row>')
+                if len(batch) >= 5_000:
+                    handle.write("".join(batch).encode("ascii"))
+                    batch.clear()
+            batch.append("</sheetData></worksheet>")
+            handle.write("".join(batch).encode("ascii"))
+
+
+def run_engine(engine: str, path: Path) -> dict[str, object]:
+    """Convert path with one engine in this process and return measurements."""
+    from app.core.engine_registry import MARKITDOWN_ENGINE, XLSX_COMPACT_ENGINE, default_registry
+
+    spec = {"markitdown": MARKITDOWN_ENGINE, "xlsx-compact": XLSX_COMPACT_ENGINE}[engine]
+    convert = default_registry.load(spec)
+    imported_rss = peak_rss_bytes()
+    started = time.perf_counter()
+    result = convert(path, None)
+    elapsed = time.perf_counter() - started
+    peak = peak_rss_bytes()
+    return {
+        "engine": engine,
+        "seconds": elapsed,
+        "peak_rss_mb": peak / (1024 * 1024),
+        "growth_mb": (peak - imported_rss) / (1024 * 1024),
+        "markdown_mb": len(result.markdown.encode("utf-8")) / (1024 * 1024),
+    }
+
+
+def _run_engine_in_child(engine: str, path: Path) -> dict[str, object]:
+    completed = subprocess.run(
+        [sys.executable, "-m", "benchmarks.xlsx_memory", "--child-engine", engine, "--path", str(path)],
+        cwd=_REPO_ROOT,
+        capture_output=True,
+        text=True,
+        check=False,
+    )
+    if completed.returncode != 0:
+        raise RuntimeError(f"Engine {engine} failed:\n{completed.stderr}")
+    return json.loads(completed.stdout.strip().splitlines()[-1])
+
+
+def build_parser() -> argparse.ArgumentParser:
+    parser = argparse.ArgumentParser(prog="python -m benchmarks.xlsx_memory", description=__doc__.split("\n\n")[0])
+    parser.add_argument("--rows", type=int, default=200_000)
+    parser.add_argument("--columns", type=int, default=4)
+    parser.add_argument("--seed", type=int, default=0)
+    parser.add_argument("--engines", nargs="+", choices=ENGINES, default=list(ENGINES))
+    parser.add_argument(
+        "--path",
+        type=Path,
+        default=None,
+        help="Workbook to convert (default: generated and reused under the system temp dir).",
+    )
+    parser.add_argument("--json", type=Path, default=None, help="Also write results as JSON.")
+    parser.add_argument("--child-engine", choices=ENGINES, help=argparse.SUPPRESS)
+    return parser
+
+
+def main(argv: Sequence[str] | None = None) -> int:
+    args = build_parser().parse_args(argv)
+
+    if args.child_engine:
+        print(json.dumps(run_engine(args.child_engine, args.path)))
+        return 0
+
+    path = args.path or Path(tempfile.gettempdir()) / (
+        f"docxxlsx-bench-strings-{args.rows}x{args.columns}-{args.seed}.xlsx"
+    )
+    if not path.exists():
+        print(f"Generating {path} ...", file=sys.stderr)
+        write_string_heavy_xlsx(path, args.rows, args.columns, args.seed)
+    print(f"Workbook: {path} ({path.stat().st_size / (1024 * 1024):.1f} MB)", file=sys.stderr)
+
+    results = {engine: _run_engine_in_child(engine, path) for engine in args.engines}
+    print(f"{'engine':<14}{'seconds':>10}{'peak MB':>10}{'growth MB':>11}{'output MB':>11}")
+    for engine, result in results.items():
+        print(
+            f"{engine:<14}{float(result['seconds']):>10.2f}"
+            f"{float(result['peak_rss_mb']):>10.1f}"
+            f"{float(result['growth_mb']):>11.1f}"
+            f"{float(result['markdown_mb']):>11.1f}"
+        )
+    if args.json:
+        args.json.write_text(json.dumps(results, indent=2), encoding="utf-8")
+    return 0
+
+
+_CONTENT_TYPES = (
+    '<?xml version="1.0" encoding="UTF-8" standalone="yes"?>\n'
+    '<Types xmlns="http://schemas.openxmlformats.org/package/2006/content-types">'
+    '<Default Extension="rels" ContentType="application/vnd.openxmlformats-package.relationships+xml"/>'
+    '<Default Extension="xml" ContentType="application/xml"/>'
+    '<Override PartName="/xl/workbook.xml" '
+    'ContentType="application/vnd.openxmlformats-officedocument.spreadsheetml.sheet.main+xml"/>'
+    '<Override PartName="/xl/worksheets/sheet1.xml" '
+    'ContentType="application/vnd.openxmlformats-officedocument.spreadsheetml.worksheet+xml"/>'
+    '<Override PartName="/xl/styles.xml" '
+    'ContentType="application/vnd.openxmlformats-officedocument.spreadsheetml.styles+xml"/>'
+    '<Override PartName="/xl/sharedStrings.xml" '
+    'ContentType="application/vnd.openxmlformats-officedocument.spreadsheetml.sharedStrings+xml"/>'
+    "</Types>"
+)
+_PACKAGE_RELS = (
+    f'<?xml version="1.0" encoding="UTF-8" standalone="yes"?>\n<Relationships xmlns="{_PKG_REL_NS}">'
+    f'<Relationship Id="rId1" Type="{_REL_NS}/officeDocument" Target="xl/workbook.xml"/>'
+    "</Relationships>"
+)
+_WORKBOOK = (
+    f'<?xml version="1.0" encoding="UTF-8" standalone="yes"?>\n'
+    f'<workbook xmlns="{_MAIN_NS}" xmlns:r="{_REL_NS}">'
+    '<sheets><sheet name="Export" sheetId="1" r:id="rId1"/></sheets></workbook>'
+)
+_WORKBOOK_RELS = (
+    f'<?xml version="1.0" encoding="UTF-8" standalone="yes"?>\n<Relationships xmlns="{_PKG_REL_NS}">'
+    f'<Relationship Id="rId1" Type="{_REL_NS}/worksheet" Target="worksheets/sheet1.xml"/>'
+    f'<Relationship Id="rId2" Type="{_REL_NS}/styles" Target="styles.xml"/>'
+    f'<Relationship Id="rId3" Type="{_REL_NS}/sharedStrings" Target="sharedStrings.xml"/>'
+    "</Relationships>"
+)
+_STYLES = (
+    f'<?xml version="1.0" encoding="UTF-8" standalone="yes"?>\n<styleSheet xmlns="{_MAIN_NS}">'
+    '<fonts count="1"><font><sz val="11"/><name val="Calibri"/></font></fonts>'
+    '<fills count="1"><fill><patternFill patternType="none"/></fill></fills>'
+    '<borders count="1"><border><left/><right/><top/><bottom/><diagonal/></border></borders>'
+    '<cellStyleXfs count="1"><xf numFmtId="0" fontId="0" fillId="0" borderId="0"/></cellStyleXfs>'
+    '<cellXfs count="1"><xf numFmtId="0" fontId="0" fillId="0" borderId="0" xfId="0"/></cellXfs>'
+    "</styleSheet>"
+)
+
+
+if __name__ == "__main__":
+    sys.exit(main())
@@ -0,0 +1,261 @@
+"""Command-line entry point for headless conversion runs."""
+
+from __future__ import annotations
+
+import argparse
+import dataclasses
+import json
+import sys
+import threading
+from pathlib import Path
+from typing import Callable, Sequence
+
+from app.config import APP_NAME, APP_VERSION
+from app.controllers.conversion_controller import (
+    ConversionController,
+    ConversionSummary,
+    limits_from_options,
+)
+from app.core.output_sink import OUTPUT_MODES
+from app.core.resource_governor import ResourceLimits, parse_byte_rate
+from app.models.conversion_options import ConversionOptions
+from app.models.progress_event import ProgressEvent
+
+_LIMITS_POLL_SECONDS = 1.0
+
+
+def build_parser() -> argparse.ArgumentParser:
+    parser = argparse.ArgumentParser(
+        prog="python -m app.cli",
+        description=f"{APP_NAME} v{APP_VERSION}",
+    )
+    parser.add_argument("input_dir", type=Path, help="Input folder to convert.")
+    parser.add_argument(
+        "--full-rescan",
+        action="store_true",
+        help="Ignore the cached scan index and list every directory again.",
+    )
+    parser.add_argument(
+        "--no-scan-index",
+        action="store_true",
+        help="Do not read or write the persistent scan index (used by default from the CLI).",
+    )
+    parser.add_argument(
+        "--scan-index",
+        type=Path,
+        default=None,
+        help="Location of the scan index file (default: per-user cache).",
+    )
+    parser.add_argument(
+        "--archives",
+        action="store_true",
+        help="Treat .zip/.tar archives as folders and convert their members.",
+    )
+    parser.add_argument(
+        "--output-mode",
+        choices=OUTPUT_MODES,
+        default="directory",
+        help="Write a folder of .md files (default) or a single zip/tar/jsonl bundle.",
+    )
+    parser.add_argument(
+        "--profile-seconds",
+        type=float,
+        default=None,
+        help="Profile files taking at least this long (rerun under cProfile/tracemalloc).",
+    )
+    parser.add_argument(
+        "--profile-memory-mb",
+        type=float,
+        default=None,
+        help="Profile files growing peak memory by at least this many MB.",
+    )
+    parser.add_argument(
+        "--profile-limit",
+        type=int,
+        default=5,
+        help="Maximum number of files to profile in one run.",
+    )
+    parser.add_argument(
+        "--read-limit",
+        type=parse_byte_rate,
+        default=None,
+        help="Limit reads of source files, e.g. 20M (bytes per second).",
+    )
+    parser.add_argument(
+        "--write-limit",
+        type=parse_byte_rate,
+        default=None,
+        help="Limit writes of Markdown and the log, e.g. 5M (bytes per second).",
+    )
+    parser.add_argument(
+        "--files-per-second",
+        type=float,
+        default=None,
+        help="Limit how many files are started per second.",
+    )
+    parser.add_argument(
+        "--nice",
+        type=int,
+        default=None,
+        help="Lower the CPU priority of the conversion worker by this niceness.",
+    )
+    parser.add_argument(
+        "--limits-file",
+        type=Path,
+        default=None,
+        help='JSON file with {"read": "20M", "write": "5M", "files": 10}; '
+        "re-read while running so limits can be changed mid-run.",
+    )
+    return parser
+
+
+def options_from_args(args: argparse.Namespace) -> ConversionOptions:
+    return ConversionOptions(
+        use_scan_index=not args.no_scan_index,
+        force_rescan=args.full_rescan,
+        scan_index_path=args.scan_index,
+        expand_archives=args.archives,
+        output_mode=args.output_mode,
+        profile_seconds=args.profile_seconds,
+        profile_memory_mb=args.profile_memory_mb,
+        profile_limit=args.profile_limit,
+        read_bytes_per_second=args.read_limit,
+        write_bytes_per_second=args.write_limit,
+        files_per_second=args.files_per_second,
+        worker_nice=args.nice,
+    )
+
+
+def main(argv: Sequence[str] | None = None) -> int:
+    args = build_parser().parse_args(argv)
+
+    done = threading.Event()
+    outcome: dict[str, object] = {}
+
+    def dispatch(callback: Callable[[], None]) -> None:
+        callback()
+
+    def on_start(output_dir: Path, total: int) -> None:
+        print(f"Output: {output_dir} ({total} files)", file=sys.stderr)
+
+    def on_progress(event: ProgressEvent) -> None:
+        print(f"{event.index}/{event.total}: {event.current_file}", file=sys.stderr)
+
+    def on_complete(summary: ConversionSummary) -> None:
+        outcome["summary"] = summary
+        done.set()
+
+    def on_error(error: Exception) -> None:
+        outcome["error"] = error
+        done.set()
+
+    controller = ConversionController(
+        dispatch=dispatch,
+        on_start=on_start,
+        on_progress=on_progress,
+        on_complete=on_complete,
+        on_error=on_error,
+    )
+    options = options_from_args(args)
+    limits_file = _LimitsFile(args.limits_file) if args.limits_file is not None else None
+    if limits_file is not None:
+        limits = limits_file.poll(limits_from_options(options))
+        if limits is not None:
+            options = _with_limits(options, limits)
+    controller.start(args.input_dir, options)
+    while not done.wait(_LIMITS_POLL_SECONDS):
+        if limits_file is None:
+            continue
+        limits = limits_file.poll(limits_from_options(options))
+        if limits is not None and controller.update_limits(limits):
+            options = _with_limits(options, limits)
+            print(f"Limits: {limits.describe()}", file=sys.stderr)
+
+    error = outcome.get("error")
+    if error is not None:
+        print(f"変換に失敗しました: {error}", file=sys.stderr)
+        return 2
+
+    summary = outcome["summary"]
+    assert isinstance(summary, ConversionSummary)
+    print(
+        f"成功: {summary.success_count} 失敗: {summary.failure_count} "
+        f"警告: {summary.warning_count}\n"
+        f"エンジン: {_describe_engines(summary)}\n"
+        f"I/O: {summary.resources.describe() if summary.resources else '-'}\n"
+        f"出力先: {summary.output_dir}\n"
+        f"ログ: {summary.log_path}"
+    )
+    return 1 if summary.failure_count else 0
+
+
+def _describe_engines(summary: ConversionSummary) -> str:
+    used = ", ".join(
+        f"{engine}={count} ({summary.engine_seconds.get(engine, 0.0):.1f}秒)"
+        for engine, count in sorted(summary.engine_files.items())
+    )
+    return f"{used or '-'} フォールバック: {summary.fallback_count}"
+
+
+class _LimitsFile:
+    """Re-read a JSON limits file whenever its modification time changes."""
+
+    def __init__(self, path: Path) -> None:
+        self.path = path
+        self._mtime_ns: int | None = None
+
+    def poll(self, current: ResourceLimits) -> ResourceLimits | None:
+        """Return the new limits if the file changed; keys left out keep current."""
+        try:
+            mtime_ns = self.path.stat().st_mtime_ns
+        except OSError:
+            return None
+        if mtime_ns == self._mtime_ns:
+            return None
+        self._mtime_ns = mtime_ns
+        try:
+            payload = json.loads(self.path.read_text(encoding="utf-8"))
+            read = _limit_value(payload, "read", current.read_bytes_per_second, parse_byte_rate)
+            write = _limit_value(payload, "write", current.write_bytes_per_second, parse_byte_rate)
+            files = _limit_value(payload, "files", current.files_per_second, _file_rate)
+        except (OSError, ValueError, TypeError) as exc:
+            print(f"制限ファイルを読み込めませんでした: {self.path}: {exc}", file=sys.stderr)
+            return None
+        return ResourceLimits(
+            read_bytes_per_second=read,
+            write_bytes_per_second=write,
+            files_per_second=files,
+        )
+
+
+def _limit_value(
+    payload: dict[str, object],
+    key: str,
+    current: float | None,
+    parse: Callable[[str], float | None],
+) -> float | None:
+    if key not in payload:
+        return current
+    value = payload[key]
+    if value is None:
+        return None
+    if isinstance(value, str):
+        return parse(value)
+    return float(value) or None
+
+
+def _file_rate(text: str) -> float | None:
+    return float(text) or None
+
+
+def _with_limits(options: ConversionOptions, limits: ResourceLimits) -> ConversionOptions:
+    return dataclasses.replace(
+        options,
+        read_bytes_per_second=limits.read_bytes_per_second,
+        write_bytes_per_second=limits.write_bytes_per_second,
+        files_per_second=limits.files_per_second,
+    )
+
+
+if __name__ == "__main__":
+    sys.exit(main())
@@ -6,3 +6,11 @@ LOG_FILE_NAME = "conversion.log"
 
 WINDOW_TITLE = f"{APP_NAME} v{APP_VERSION}"
 DEFAULT_WINDOW_SIZE = "760x420"
+
+CACHE_DIR_NAME = "DocxXlsxToMarkdown"
+SCAN_INDEX_DIR_NAME = "scan_index"
+
+WATCH_MANIFEST_NAME = ".watch_manifest.json"
+WATCH_METRICS_NAME = "watch_metrics.json"
+
+PROFILE_DIR_NAME = "conversion_profiles"
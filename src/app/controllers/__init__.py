@@ -1,5 +1,6 @@
 """Controllers package."""
 
 from .conversion_controller import ConversionController, ConversionSummary
+from .watch_controller import WatchController, WatchMetrics
 
-__all__ = ["ConversionController", "ConversionSummary"]
+__all__ = ["ConversionController", "ConversionSummary", "WatchController", "WatchMetrics"]
@@ -2,18 +2,33 @@
 
 from __future__ import annotations
 
-from dataclasses import dataclass
+import dataclasses
+from dataclasses import dataclass, field
 from pathlib import Path
 import threading
-from typing import Callable
+import time
+from typing import TYPE_CHECKING, Callable
 
-from app.config import LOG_FILE_NAME
+from app.core.archive_reader import ArchiveReader
 from app.core.document_converter import convert_document
+from app.core.engine_registry import EngineUsage
 from app.core.file_scanner import scan_input_files
 from app.core.logger import ConversionLogger
-from app.core.output_planner import plan_output_dir, plan_output_file
+from app.core.output_sink import OutputSink, create_output_sink
+from app.core.output_writer import WriteBehindWriter, WriteJob, WriteOutcome
+from app.core.resource_governor import (
+    ResourceGovernor,
+    ResourceLimits,
+    ResourceReport,
+    lower_thread_priority,
+)
+from app.core.scan_index import ScanIndex, default_scan_index_path
+from app.models.conversion_options import ConversionOptions
 from app.models.progress_event import ProgressEvent
 
+if TYPE_CHECKING:
+    from app.core.profiling import Outlier, OutlierProfiler
+
 
 @dataclass(frozen=True)
 class ConversionSummary:
@@ -25,6 +40,10 @@ class ConversionSummary:
     success_count: int
     failure_count: int
     warning_count: int
+    engine_files: dict[str, int] = field(default_factory=dict)
+    engine_seconds: dict[str, float] = field(default_factory=dict)
+    fallback_count: int = 0
+    resources: ResourceReport | None = None
 
 
 OnStart = Callable[[Path, int], None]
@@ -52,87 +71,269 @@ class ConversionController:
         self._on_error = on_error
         self._lock = threading.Lock()
         self._running = False
+        self._governor: ResourceGovernor | None = None
 
-    def start(self, input_dir: Path) -> bool:
+    def start(self, input_dir: Path, options: ConversionOptions | None = None) -> bool:
         """Start conversion if not already running."""
         with self._lock:
             if self._running:
                 return False
             self._running = True
+            options = options or ConversionOptions()
+            self._governor = ResourceGovernor(limits_from_options(options))
 
         thread = threading.Thread(
             target=self._run,
-            args=(input_dir,),
+            args=(input_dir, options, self._governor),
             name="conversion-worker",
             daemon=True,
         )
         thread.start()
         return True
 
-    def _run(self, input_dir: Path) -> None:
+    def update_limits(self, limits: ResourceLimits) -> bool:
+        """Change the I/O budgets of the running conversion.
+
+        Returns False when no conversion is running.
+        """
+        with self._lock:
+            if not self._running or self._governor is None:
+                return False
+            self._governor.update(limits)
+            return True
+
+    def _run(self, input_dir: Path, options: ConversionOptions, governor: ResourceGovernor) -> None:
         try:
+            lowered = options.worker_nice is not None and lower_thread_priority(options.worker_nice)
             if not input_dir.exists():
                 raise FileNotFoundError(input_dir)
             if not input_dir.is_dir():
                 raise NotADirectoryError(input_dir)
 
-            output_dir = plan_output_dir(input_dir)
-            output_dir.mkdir(parents=True, exist_ok=False)
-            log_path = output_dir / LOG_FILE_NAME
-            logger = ConversionLogger(log_path)
-            logger.info(f"Input folder: {input_dir}")
-
-            files = scan_input_files(input_dir)
-            total = len(files)
-            self._dispatch(
-                lambda output_dir=output_dir, total=total: self._on_start(
-                    output_dir,
-                    total,
-                )
+            sink = create_output_sink(input_dir, options.output_mode)
+            logger = dataclasses.replace(sink.open(), throttle=governor.write)
+            if options.worker_nice is not None and not lowered:
+                logger.warning("この環境ではワーカーの優先度を下げられません。")
+            try:
+                summary = self._convert_all(input_dir, options, sink, logger, governor)
+            finally:
+                sink.close(logger)
+            self._dispatch(lambda summary=summary: self._on_complete(summary))
+        except Exception as exc:  # pragma: no cover - runtime safety
+            self._dispatch(lambda exc=exc: self._on_error(exc))
+        finally:
+            with self._lock:
+                self._running = False
+                self._governor = None
+
+    def _convert_all(
+        self,
+        input_dir: Path,
+        options: ConversionOptions,
+        sink: OutputSink,
+        logger: ConversionLogger,
+        governor: ResourceGovernor,
+    ) -> ConversionSummary:
+        logger.info(f"Input folder: {input_dir}")
+        limits_revision = governor.revision
+        logger.info(f"Limits: {governor.limits.describe()}")
+
+        files = self._scan(input_dir, options, logger)
+        total = len(files)
+        output_dir = sink.location
+        self._dispatch(
+            lambda output_dir=output_dir, total=total: self._on_start(
+                output_dir,
+                total,
             )
+        )
 
-            if total == 0:
-                logger.warning("対象ファイルが見つかりませんでした。")
+        if total == 0:
+            logger.warning("対象ファイルが見つかりませんでした。")
 
-            success_count = 0
-            failure_count = 0
-            warning_count = 0
+        success_count = 0
+        failure_count = 0
+        warning_count = 0
+        profiler = _create_profiler(options, sink)
+        usage = EngineUsage()
+        engine_notes: dict[Path, str] = {}
 
+        def record(outcome: WriteOutcome) -> None:
+            # Files count as converted only once their output is written.
+            nonlocal success_count, failure_count, warning_count
+            job = outcome.job
+            note = engine_notes.pop(job.source, "")
+            if outcome.error is not None:
+                failure_count += 1
+                logger.error(f"FAILED: {job.source}: {outcome.error}")
+                return
+            success_count += 1
+            logger.info(f"SUCCESS: {job.source} -> {job.output_file} ({note})")
+            for warning in job.warnings:
+                warning_count += 1
+                logger.warning(f"{job.source}: {warning}")
+
+        writer = WriteBehindWriter(sink, throttle=governor.write)
+        # Per-file log lines are appended on the writer thread, not here.
+        logger = writer.deferred_logger(logger)
+        with ArchiveReader() as archive_reader, writer:
             for index, path in enumerate(files, start=1):
                 event = ProgressEvent(index=index, total=total, current_file=path)
                 self._dispatch(lambda event=event: self._on_progress(event))
 
+                if governor.revision != limits_revision:
+                    limits_revision = governor.revision
+                    logger.info(f"Limits changed: {governor.limits.describe()}")
+                governor.file()
+
+                data: bytes | None = None
+                probe = profiler.start() if profiler is not None else None
                 try:
-                    result = convert_document(path)
-                    output_file = plan_output_file(path, input_dir, output_dir)
-                    output_file.parent.mkdir(parents=True, exist_ok=True)
-                    output_file.write_text(result.markdown, encoding="utf-8")
-                    success_count += 1
-                    logger.info(f"SUCCESS: {path} -> {output_file}")
-
-                    for warning in result.warnings:
-                        warning_count += 1
-                        logger.warning(f"{path}: {warning}")
+                    data = _read_source(archive_reader, governor, path)
+                    started = time.perf_counter()
+                    result = convert_document(path, data)
+                    seconds = time.perf_counter() - started
+                    usage.record(result, seconds)
+                    engine_notes[path] = (
+                        f"engine={result.engine} fallbacks={result.fallbacks} seconds={seconds:.2f}"
+                    )
+                    output_file = sink.plan(path, input_dir)
+                    writer.submit(WriteJob(path, output_file, result.markdown, result.warnings))
                 except Exception as exc:  # pragma: no cover - runtime safety
                     failure_count += 1
                     logger.error(f"FAILED: {path}: {exc}")
 
-            summary = ConversionSummary(
-                output_dir=output_dir,
-                log_path=log_path,
-                total=total,
-                success_count=success_count,
-                failure_count=failure_count,
-                warning_count=warning_count,
-            )
-            logger.info(
-                "Completed. "
-                f"total={total} success={success_count} "
-                f"failure={failure_count} warnings={warning_count}"
+                if profiler is not None and probe is not None:
+                    outlier = profiler.check(probe)
+                    if outlier is not None:
+                        _profile_outlier(profiler, outlier, index, path, data, logger)
+
+                for outcome in writer.completed():
+                    record(outcome)
+
+            for outcome in writer.close():
+                record(outcome)
+
+        logger.info(f"Engines: {usage.describe() or '-'} fallbacks={usage.fallbacks}")
+        resources = governor.report()
+        logger.info(f"Resources: {resources.describe()}")
+        logger.info(
+            "Completed. "
+            f"total={total} success={success_count} "
+            f"failure={failure_count} warnings={warning_count}"
+        )
+        return ConversionSummary(
+            output_dir=output_dir,
+            log_path=sink.log_path,
+            total=total,
+            success_count=success_count,
+            failure_count=failure_count,
+            warning_count=warning_count,
+            engine_files=dict(usage.files),
+            engine_seconds=dict(usage.seconds),
+            fallback_count=usage.fallbacks,
+            resources=resources,
+        )
+
+    def _scan(
+        self,
+        input_dir: Path,
+        options: ConversionOptions,
+        logger: ConversionLogger,
+    ) -> list[Path]:
+        def on_archive_error(path: Path, error: Exception) -> None:
+            logger.warning(f"{path}: アーカイブを読み込めませんでした: {error}")
+
+        if not options.use_scan_index:
+            return scan_input_files(
+                input_dir,
+                expand_archives=options.expand_archives,
+                on_archive_error=on_archive_error,
             )
-            self._dispatch(lambda summary=summary: self._on_complete(summary))
-        except Exception as exc:  # pragma: no cover - runtime safety
-            self._dispatch(lambda exc=exc: self._on_error(exc))
-        finally:
-            with self._lock:
-                self._running = False
+
+        index_path = options.scan_index_path or default_scan_index_path(input_dir)
+        if options.force_rescan:
+            index = ScanIndex(input_dir)
+            logger.info("Scan index: full rescan requested.")
+        else:
+            index = ScanIndex.load(index_path, input_dir)
+
+        files = scan_input_files(
+            input_dir,
+            index=index,
+            expand_archives=options.expand_archives,
+            on_archive_error=on_archive_error,
+        )
+        logger.info(
+            "Scan index: "
+            f"reused={index.hits} listed={index.misses} index={index_path}"
+        )
+
+        try:
+            index.save(index_path)
+        except OSError as exc:
+            logger.warning(f"スキャンインデックスを保存できませんでした: {exc}")
+        return files
+
+
+def limits_from_options(options: ConversionOptions) -> ResourceLimits:
+    """Return the I/O budgets configured in options."""
+    return ResourceLimits(
+        read_bytes_per_second=options.read_bytes_per_second,
+        write_bytes_per_second=options.write_bytes_per_second,
+        files_per_second=options.files_per_second,
+    )
+
+
+def _read_source(
+    archive_reader: ArchiveReader,
+    governor: ResourceGovernor,
+    path: Path,
+) -> bytes | None:
+    """Return archive member bytes, or file bytes when reads are limited.
+
+    Plain files are left to the engine (None) unless a read budget is set;
+    then they are read once here, paced, and converted from memory. Either
+    way the source size is charged once as input; engines reading a file
+    themselves may read it more than once.
+    """
+    data = archive_reader.read(path)
+    if data is not None:
+        governor.read(len(data))
+        return data
+    if governor.read_limited:
+        return governor.read_file(path)
+    governor.read(path.stat().st_size)
+    return None
+
+
+def _create_profiler(options: ConversionOptions, sink: OutputSink) -> OutlierProfiler | None:
+    if options.profile_seconds is None and options.profile_memory_mb is None:
+        return None
+    # Imported only when enabled so that normal runs do not pay for it.
+    from app.core.profiling import OutlierProfiler
+
+    return OutlierProfiler(
+        sink.artifact_dir,
+        seconds=options.profile_seconds,
+        memory_mb=options.profile_memory_mb,
+        limit=options.profile_limit,
+    )
+
+
+def _profile_outlier(
+    profiler: OutlierProfiler,
+    outlier: Outlier,
+    index: int,
+    path: Path,
+    data: bytes | None,
+    logger: ConversionLogger,
+) -> None:
+    measured = f"seconds={outlier.seconds:.1f} peak_growth_mb={outlier.memory_mb:.0f}"
+    capture = profiler.capture(index, path, lambda: convert_document(path, data))
+    if capture is None:
+        logger.info(f"PROFILE: {path} ({measured}) skipped, limit={profiler.limit} reached")
+        return
+    logger.info(
+        f"PROFILE: {path} ({measured}) -> {capture.profile_path}, {capture.allocations_path}"
+    )
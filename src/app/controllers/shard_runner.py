@@ -0,0 +1,215 @@
+"""Run one node of a sharded conversion over a shared work queue."""
+
+from __future__ import annotations
+
+import os
+import socket
+import threading
+import time
+from pathlib import Path
+from typing import Callable
+
+from app.config import LOG_FILE_NAME
+from app.core.document_converter import ConversionResult, convert_document
+from app.core.file_scanner import scan_input_files
+from app.core.logger import ConversionLogger
+from app.core.output_planner import plan_output_dir
+from app.core.work_queue import (
+    DEFAULT_LEASE_SECONDS,
+    DEFAULT_MAX_ATTEMPTS,
+    DEFAULT_MAX_JOB_SECONDS,
+    Job,
+    WorkQueue,
+)
+
+from .conversion_controller import ConversionSummary
+
+Converter = Callable[[Path], ConversionResult]
+
+
+def default_queue_path(input_dir: Path) -> Path:
+    """Return the shared queue location next to the input directory."""
+    return input_dir.parent / f"{input_dir.name}_md.queue.sqlite"
+
+
+def default_node_id() -> str:
+    return f"{socket.gethostname()}-{os.getpid()}"
+
+
+class ShardedConversionRunner:
+    """Convert leased jobs until the shared queue is drained.
+
+    Any number of runners (processes or hosts) may point at the same input
+    directory and queue file. Each returns the merged summary of the whole
+    run, and exactly one of them writes the merged conversion.log.
+
+    Leases are renewed while jobs wait in the leased batch and for at most
+    max_job_seconds once a job's conversion has started, so a conversion
+    that hangs lets its lease expire and the job is reclaimed elsewhere.
+    """
+
+    def __init__(
+        self,
+        input_dir: Path,
+        queue_path: Path | None = None,
+        node_id: str | None = None,
+        output_dir: Path | None = None,
+        lease_seconds: float = DEFAULT_LEASE_SECONDS,
+        max_attempts: int = DEFAULT_MAX_ATTEMPTS,
+        max_job_seconds: float = DEFAULT_MAX_JOB_SECONDS,
+        batch_size: int = 1,
+        poll_interval: float = 2.0,
+        convert: Converter = convert_document,
+    ) -> None:
+        self.input_dir = input_dir
+        self.queue_path = queue_path or default_queue_path(input_dir)
+        self.node_id = node_id or default_node_id()
+        self.output_dir = output_dir
+        self.lease_seconds = lease_seconds
+        self.max_attempts = max_attempts
+        self.max_job_seconds = max_job_seconds
+        self.batch_size = batch_size
+        self.poll_interval = poll_interval
+        self._convert = convert
+        self.reclaimed = 0
+        self.processed = 0
+        # Leased job id -> monotonic start of its conversion (None: waiting).
+        self._held: dict[int, float | None] = {}
+        self._held_lock = threading.Lock()
+
+    def run(self) -> ConversionSummary:
+        if not self.input_dir.exists():
+            raise FileNotFoundError(self.input_dir)
+        if not self.input_dir.is_dir():
+            raise NotADirectoryError(self.input_dir)
+
+        with WorkQueue(self.queue_path, self.node_id) as queue:
+            output_dir = self._join(queue)
+            stop = threading.Event()
+            heartbeat = threading.Thread(
+                target=self._heartbeat,
+                args=(stop,),
+                name="lease-heartbeat",
+                daemon=True,
+            )
+            heartbeat.start()
+            try:
+                self._drain(queue, output_dir)
+            finally:
+                stop.set()
+                heartbeat.join()
+
+            log_path = output_dir / LOG_FILE_NAME
+            if queue.claim_finalization():
+                self._write_merged_log(queue, output_dir, log_path)
+            return self._summary(queue, output_dir, log_path)
+
+    def _join(self, queue: WorkQueue) -> Path:
+        if not queue.is_initialized():
+            planned_dir = self.output_dir or plan_output_dir(self.input_dir)
+            files = scan_input_files(self.input_dir)
+            if queue.initialize(self.input_dir, planned_dir, files):
+                planned_dir.mkdir(parents=True, exist_ok=True)
+
+        queued_root = queue.meta("input_root")
+        if queued_root != str(self.input_dir.resolve()):
+            raise ValueError(
+                f"Queue {self.queue_path} belongs to another input folder: {queued_root}"
+            )
+        return Path(str(queue.meta("output_dir")))
+
+    def _drain(self, queue: WorkQueue, output_dir: Path) -> None:
+        while True:
+            jobs, reclaimed = queue.lease(self.batch_size, self.lease_seconds, self.max_attempts)
+            self.reclaimed += reclaimed
+            with self._held_lock:
+                self._held.update((job.id, None) for job in jobs)
+            if not jobs:
+                if queue.counts().finished:
+                    return
+                # Other nodes still hold leases; wait in case they expire.
+                time.sleep(self.poll_interval)
+                continue
+            for job in jobs:
+                self._process(queue, job, output_dir)
+
+    def _process(self, queue: WorkQueue, job: Job, output_dir: Path) -> None:
+        source = self.input_dir.joinpath(*job.source.split("/"))
+        output_file = output_dir.joinpath(*job.output.split("/"))
+        started = time.perf_counter()
+        with self._held_lock:
+            self._held[job.id] = time.monotonic()
+        try:
+            result = self._convert(source)
+            _write_atomic(output_file, result.markdown, self.node_id)
+        except Exception as exc:  # pragma: no cover - runtime safety
+            queue.fail(job, str(exc), time.perf_counter() - started)
+        else:
+            queue.complete(job, result.warnings, time.perf_counter() - started)
+        finally:
+            with self._held_lock:
+                self._held.pop(job.id, None)
+        self.processed += 1
+
+    def _heartbeat(self, stop: threading.Event) -> None:
+        with WorkQueue(self.queue_path, self.node_id) as queue:
+            while not stop.wait(self.lease_seconds / 3):
+                queue.renew(self.lease_seconds, self._renewable_jobs())
+
+    def _renewable_jobs(self) -> list[int]:
+        deadline = time.monotonic() - self.max_job_seconds
+        with self._held_lock:
+            return [
+                job_id
+                for job_id, started in self._held.items()
+                if started is None or started > deadline
+            ]
+
+    def _write_merged_log(self, queue: WorkQueue, output_dir: Path, log_path: Path) -> None:
+        logger = ConversionLogger(log_path)
+        logger.info(f"Input folder: {self.input_dir}")
+        logger.info(f"Queue: {self.queue_path} (finalized by {self.node_id})")
+        for record in queue.records():
+            source = self.input_dir.joinpath(*record.source.split("/"))
+            origin = f"node={record.node} attempts={record.attempts}"
+            if record.state == "done":
+                output_file = output_dir.joinpath(*record.output.split("/"))
+                logger.info(f"SUCCESS: {source} -> {output_file} ({origin})")
+                for warning in record.warnings:
+                    logger.warning(f"{source}: {warning}")
+            else:
+                logger.error(f"FAILED: {source}: {record.error} ({origin})")
+
+        summary = self._summary(queue, output_dir, log_path)
+        logger.info(
+            "Completed. "
+            f"total={summary.total} success={summary.success_count} "
+            f"failure={summary.failure_count} warnings={summary.warning_count}"
+        )
+
+    def _summary(self, queue: WorkQueue, output_dir: Path, log_path: Path) -> ConversionSummary:
+        total = success = failure = warnings = 0
+        for record in queue.records():
+            total += 1
+            if record.state == "done":
+                success += 1
+                warnings += len(record.warnings)
+            else:
+                failure += 1
+        return ConversionSummary(
+            output_dir=output_dir,
+            log_path=log_path,
+            total=total,
+            success_count=success,
+            failure_count=failure,
+            warning_count=warnings,
+        )
+
+
+def _write_atomic(path: Path, text: str, node_id: str) -> None:
+    # A reclaimed job may be written by two nodes; each writes its own temp
+    # file and the rename makes the last complete copy win.
+    path.parent.mkdir(parents=True, exist_ok=True)
+    temp_path = path.with_name(f".{path.name}.{node_id}.tmp")
+    temp_path.write_text(text, encoding="utf-8")
+    os.replace(temp_path, path)
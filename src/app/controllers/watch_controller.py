@@ -0,0 +1,323 @@
+"""Controller for watch-folder mode: incremental conversion of dropped files."""
+
+from __future__ import annotations
+
+import json
+import os
+import threading
+import time
+import zipfile
+from concurrent.futures import Future, ThreadPoolExecutor
+from dataclasses import asdict, dataclass
+from pathlib import Path
+from typing import Callable
+
+from app.config import LOG_FILE_NAME, WATCH_MANIFEST_NAME, WATCH_METRICS_NAME
+from app.core.document_converter import ConversionResult, convert_document
+from app.core.folder_watcher import WatchEvents, create_watcher, is_watched_file, snapshot_files
+from app.core.latency_stats import LatencyStats
+from app.core.logger import ConversionLogger
+from app.core.output_planner import plan_output_file, stable_output_dir
+from app.core.path_utils import is_excluded_output_dir_name, relative_to_root
+
+Converter = Callable[[Path], ConversionResult]
+
+_OLE2_SIGNATURE = b"\xd0\xcf\x11\xe0\xa1\xb1\x1a\xe1"
+# A file that is stable but never becomes readable is converted anyway so
+# the failure ends up in the log instead of being retried forever.
+_MAX_INCOMPLETE_CHECKS = 5
+
+
+@dataclass(frozen=True)
+class WatchMetrics:
+    """Counters and drop-to-Markdown latency (seconds) of a watch session."""
+
+    converted: int
+    failed: int
+    removed: int
+    pending: int
+    latency_p50: float | None
+    latency_p95: float | None
+    latency_max: float | None
+
+
+@dataclass
+class _PendingFile:
+    first_seen: float
+    last_event: float
+    stat: tuple[int, int] | None
+    incomplete_checks: int = 0
+
+
+class WatchController:
+    """Watch input_dir and keep a stable output directory up to date.
+
+    Bursts of events are debounced, Office temp files and files that are
+    still being written are ignored, and only changed files are converted
+    on a worker pool that stays alive between batches.
+    """
+
+    def __init__(
+        self,
+        input_dir: Path,
+        output_dir: Path | None = None,
+        debounce_seconds: float = 2.0,
+        workers: int = 2,
+        poll_interval: float = 2.0,
+        force_polling: bool = False,
+        convert: Converter = convert_document,
+    ) -> None:
+        self.input_dir = input_dir
+        self.output_dir = output_dir or stable_output_dir(input_dir)
+        self.debounce_seconds = debounce_seconds
+        self.workers = workers
+        self.poll_interval = poll_interval
+        self.force_polling = force_polling
+        self._convert = convert
+
+        self._logger = ConversionLogger(self.output_dir / LOG_FILE_NAME)
+        self._manifest_path = self.output_dir / WATCH_MANIFEST_NAME
+        self._metrics_path = self.output_dir / WATCH_METRICS_NAME
+        self._manifest: dict[str, dict[str, object]] = {}
+        self._pending: dict[Path, _PendingFile] = {}
+        self._in_flight: dict[Path, tuple[Future[ConversionResult], Path, tuple[int, int], float]] = {}
+        self._latencies = LatencyStats()
+        self._metrics_lock = threading.Lock()
+        self._converted = 0
+        self._failed = 0
+        self._removed = 0
+
+    def run(self, stop: threading.Event) -> None:
+        """Run until stop is set. Blocks the calling thread."""
+        if not self.input_dir.is_dir():
+            raise NotADirectoryError(self.input_dir)
+        self.output_dir.mkdir(parents=True, exist_ok=True)
+        self._load_manifest()
+
+        watcher = create_watcher(self.input_dir, self.poll_interval, self.force_polling)
+        executor = ThreadPoolExecutor(max_workers=self.workers, thread_name_prefix="watch-worker")
+        self._logger.info(
+            f"Watching: {self.input_dir} -> {self.output_dir} ({type(watcher).__name__})"
+        )
+        try:
+            self._sync_all(time.monotonic())
+            while not stop.is_set():
+                events = watcher.poll(min(self.debounce_seconds / 4, 0.5))
+                now = time.monotonic()
+                if events.rescan:
+                    self._sync_all(now)
+                self._record(events, now)
+                self._dispatch_ready(executor, now)
+                self._collect_done(block=False)
+        finally:
+            watcher.close()
+            executor.shutdown(wait=True)
+            self._collect_done(block=True)
+            self._logger.info("Watch stopped.")
+
+    def metrics(self) -> WatchMetrics:
+        with self._metrics_lock:
+            return WatchMetrics(
+                converted=self._converted,
+                failed=self._failed,
+                removed=self._removed,
+                pending=len(self._pending) + len(self._in_flight),
+                latency_p50=self._latencies.percentile(0.50),
+                latency_p95=self._latencies.percentile(0.95),
+                latency_max=self._latencies.maximum(),
+            )
+
+    def _sync_all(self, now: float) -> None:
+        # Queue files that changed while nobody was watching, and outputs
+        # whose sources have disappeared.
+        current = snapshot_files(self.input_dir)
+        for path, stat in current.items():
+            entry = self._manifest.get(self._key(path))
+            if entry is None or tuple(entry["stat"]) != stat:  # type: ignore[arg-type]
+                self._touch(path, now)
+        for key in list(self._manifest):
+            path = self.input_dir.joinpath(*key.split("/"))
+            if path not in current:
+                self._touch(path, now)
+
+    def _record(self, events: WatchEvents, now: float) -> None:
+        for path in events.paths:
+            if not is_watched_file(path) or self._in_excluded_dir(path):
+                continue
+            self._touch(path, now)
+
+    def _touch(self, path: Path, now: float) -> None:
+        pending = self._pending.get(path)
+        if pending is None:
+            self._pending[path] = _PendingFile(first_seen=now, last_event=now, stat=_stat(path))
+        else:
+            pending.last_event = now
+            pending.stat = _stat(path)
+
+    def _dispatch_ready(self, executor: ThreadPoolExecutor, now: float) -> None:
+        for path, pending in list(self._pending.items()):
+            if now - pending.last_event < self.debounce_seconds or path in self._in_flight:
+                continue
+
+            stat = _stat(path)
+            if stat is None:
+                del self._pending[path]
+                self._remove_output(path)
+                continue
+            if stat != pending.stat:
+                # Still being written: wait for another quiet period.
+                pending.stat = stat
+                pending.last_event = now
+                continue
+            if not _looks_complete(path) and pending.incomplete_checks < _MAX_INCOMPLETE_CHECKS:
+                pending.incomplete_checks += 1
+                pending.last_event = now
+                continue
+
+            del self._pending[path]
+            output_file = self._plan(path)
+            future = executor.submit(self._convert_and_write, path, output_file)
+            self._in_flight[path] = (future, output_file, stat, pending.first_seen)
+
+    def _convert_and_write(self, path: Path, output_file: Path) -> ConversionResult:
+        result = self._convert(path)
+        output_file.parent.mkdir(parents=True, exist_ok=True)
+        # Consumers of the output folder must never see a half-written file.
+        temp_path = output_file.with_name(f".{output_file.name}.tmp")
+        temp_path.write_text(result.markdown, encoding="utf-8")
+        os.replace(temp_path, output_file)
+        return result
+
+    def _collect_done(self, block: bool) -> None:
+        changed = False
+        for path, (future, output_file, stat, first_seen) in list(self._in_flight.items()):
+            if not block and not future.done():
+                continue
+            del self._in_flight[path]
+            changed = True
+            try:
+                result = future.result()
+            except Exception as exc:
+                with self._metrics_lock:
+                    self._failed += 1
+                self._logger.error(f"FAILED: {path}: {exc}")
+                self._discard_output(path, output_file)
+                continue
+
+            latency = time.monotonic() - first_seen
+            with self._metrics_lock:
+                self._converted += 1
+            self._latencies.record(latency)
+            self._manifest[self._key(path)] = {
+                "output": output_file.relative_to(self.output_dir).as_posix(),
+                "stat": list(stat),
+            }
+            self._logger.info(
+                f"SUCCESS: {path} -> {output_file} "
+                f"({latency:.2f}s engine={result.engine} fallbacks={result.fallbacks})"
+            )
+            for warning in result.warnings:
+                self._logger.warning(f"{path}: {warning}")
+
+        if changed:
+            self._save_state()
+
+    def _plan(self, path: Path) -> Path:
+        entry = self._manifest.get(self._key(path))
+        if entry is not None:
+            return self.output_dir.joinpath(*str(entry["output"]).split("/"))
+
+        taken = {
+            self.output_dir.joinpath(*str(item["output"]).split("/"))
+            for item in self._manifest.values()
+        }
+        taken.update(output for _, output, _, _ in self._in_flight.values())
+        return plan_output_file(
+            path,
+            self.input_dir,
+            self.output_dir,
+            exists=lambda candidate: candidate in taken or candidate.exists(),
+        )
+
+    def _remove_output(self, path: Path) -> None:
+        entry = self._manifest.pop(self._key(path), None)
+        if entry is None:
+            return
+        output_file = self.output_dir.joinpath(*str(entry["output"]).split("/"))
+        try:
+            output_file.unlink()
+        except FileNotFoundError:
+            pass
+        except OSError as exc:
+            self._logger.warning(f"{output_file}: 削除できませんでした: {exc}")
+        with self._metrics_lock:
+            self._removed += 1
+        self._logger.info(f"REMOVED: {path} -> {output_file}")
+        self._save_state()
+
+    def _discard_output(self, path: Path, output_file: Path) -> None:
+        # The previous Markdown no longer matches the source; leaving it
+        # would make a failed re-conversion look current.
+        entry = self._manifest.get(self._key(path))
+        if entry is not None:
+            entry["stat"] = []
+        for stale in (output_file, output_file.with_name(f".{output_file.name}.tmp")):
+            try:
+                stale.unlink()
+            except FileNotFoundError:
+                continue
+            except OSError as exc:
+                self._logger.warning(f"{stale}: 削除できませんでした: {exc}")
+                continue
+            if stale == output_file:
+                self._logger.info(f"REMOVED: {path} -> {output_file} (変換に失敗したため)")
+
+    def _key(self, path: Path) -> str:
+        return relative_to_root(path, self.input_dir).as_posix()
+
+    def _in_excluded_dir(self, path: Path) -> bool:
+        relative = relative_to_root(path, self.input_dir)
+        return any(is_excluded_output_dir_name(part) for part in relative.parts[:-1])
+
+    def _load_manifest(self) -> None:
+        try:
+            with self._manifest_path.open("r", encoding="utf-8") as handle:
+                data = json.load(handle)
+        except (OSError, ValueError):
+            return
+        if isinstance(data, dict):
+            self._manifest = data
+
+    def _save_state(self) -> None:
+        _write_json_atomic(self._manifest_path, self._manifest)
+        _write_json_atomic(self._metrics_path, asdict(self.metrics()))
+
+
+def _stat(path: Path) -> tuple[int, int] | None:
+    try:
+        stat_result = os.stat(path)
+    except OSError:
+        return None
+    return (stat_result.st_mtime_ns, stat_result.st_size)
+
+
+def _looks_complete(path: Path) -> bool:
+    """Reject files that are still being copied or saved.
+
+    .docx/.xlsx must have a readable ZIP central directory (written last)
+    and .xls must start with the OLE2 signature.
+    """
+    if path.suffix.lower() == ".xls":
+        try:
+            with path.open("rb") as handle:
+                return handle.read(len(_OLE2_SIGNATURE)) == _OLE2_SIGNATURE
+        except OSError:
+            return False
+    return zipfile.is_zipfile(path)
+
+
+def _write_json_atomic(path: Path, payload: object) -> None:
+    temp_path = path.with_name(f"{path.name}.tmp")
+    with temp_path.open("w", encoding="utf-8") as handle:
+        json.dump(payload, handle, ensure_ascii=False, indent=2)
+    os.replace(temp_path, path)
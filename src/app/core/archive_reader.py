@@ -0,0 +1,134 @@
+"""Read ZIP/TAR archives as virtual input directories.
+
+Members of an archive are addressed by virtual paths of the form
+``<archive path>/<member name>``, so they flow through scanning, output
+planning and logging exactly like regular files.
+"""
+
+from __future__ import annotations
+
+import tarfile
+import zipfile
+from pathlib import Path, PurePosixPath
+
+from .path_utils import (
+    is_archive_file_name,
+    is_excluded_output_dir_name,
+    is_supported_extension,
+    is_temp_office_file,
+)
+
+
+class ArchiveReadError(RuntimeError):
+    """Raised when an archive or one of its members cannot be read."""
+
+
+def list_archive_members(archive_path: Path) -> list[str]:
+    """Return supported document members of an archive in stored order.
+
+    Keeping the stored order lets compressed tar archives be read front to
+    back instead of seeking backwards. The same exclusion rules as
+    directory scanning apply to member paths. Nested archives are not
+    expanded.
+    """
+    try:
+        names = _read_member_names(archive_path)
+    except (OSError, zipfile.BadZipFile, tarfile.TarError) as exc:
+        raise ArchiveReadError(f"Failed to read archive {archive_path}: {exc}") from exc
+
+    members: list[str] = []
+    for name in names:
+        member = PurePosixPath(name)
+        if member.is_absolute() or ".." in member.parts:
+            continue
+        if any(is_excluded_output_dir_name(part) for part in member.parts[:-1]):
+            continue
+        path = Path(member.name)
+        if is_temp_office_file(path) or not is_supported_extension(path):
+            continue
+        members.append(member.as_posix())
+    return members
+
+
+def split_archive_path(path: Path) -> tuple[Path, str] | None:
+    """Split a virtual member path into (archive path, member name).
+
+    Returns None for paths that do not point inside an archive.
+    """
+    parts = path.parts
+    for index in range(len(parts) - 1, 0, -1):
+        if not is_archive_file_name(parts[index - 1]):
+            continue
+        archive_path = Path(*parts[:index])
+        if archive_path.is_file():
+            return archive_path, "/".join(parts[index:])
+    return None
+
+
+class ArchiveReader:
+    """Read member bytes, keeping the most recently used archive open.
+
+    Members of one archive are contiguous in the scan result and in stored
+    order, so a single open handle avoids re-reading the archive directory
+    per member and tar members are read front to back.
+    """
+
+    def __init__(self) -> None:
+        self._archive_path: Path | None = None
+        self._handle: zipfile.ZipFile | tarfile.TarFile | None = None
+        # TarFile.getmember() scans the member list on every call.
+        self._tar_members: dict[str, tarfile.TarInfo] = {}
+
+    def read(self, path: Path) -> bytes | None:
+        """Return member bytes for a virtual path, or None for regular files."""
+        location = split_archive_path(path)
+        if location is None:
+            return None
+        archive_path, member = location
+        try:
+            handle = self._open(archive_path)
+            if isinstance(handle, zipfile.ZipFile):
+                return handle.read(member)
+            extracted = handle.extractfile(self._tar_members[member])
+            if extracted is None:
+                raise KeyError(member)
+            with extracted:
+                return extracted.read()
+        except (OSError, KeyError, zipfile.BadZipFile, tarfile.TarError) as exc:
+            raise ArchiveReadError(f"Failed to read {member} from {archive_path}: {exc}") from exc
+
+    def close(self) -> None:
+        if self._handle is not None:
+            self._handle.close()
+        self._handle = None
+        self._archive_path = None
+        self._tar_members = {}
+
+    def __enter__(self) -> "ArchiveReader":
+        return self
+
+    def __exit__(self, *exc_info: object) -> None:
+        self.close()
+
+    def _open(self, archive_path: Path) -> zipfile.ZipFile | tarfile.TarFile:
+        if self._handle is not None and self._archive_path == archive_path:
+            return self._handle
+        self.close()
+        self._handle = _open_archive(archive_path)
+        self._archive_path = archive_path
+        if isinstance(self._handle, tarfile.TarFile):
+            self._tar_members = {info.name: info for info in self._handle.getmembers()}
+        return self._handle
+
+
+def _read_member_names(archive_path: Path) -> list[str]:
+    with _open_archive(archive_path) as handle:
+        if isinstance(handle, zipfile.ZipFile):
+            return [info.filename for info in handle.infolist() if not info.is_dir()]
+        return [info.name for info in handle.getmembers() if info.isfile()]
+
+
+def _open_archive(archive_path: Path) -> zipfile.ZipFile | tarfile.TarFile:
+    if archive_path.name.lower().endswith(".zip"):
+        return zipfile.ZipFile(archive_path)
+    return tarfile.open(archive_path, mode="r:*")
@@ -0,0 +1,19 @@
+"""Result type shared by the conversion entry point and the engines."""
+
+from __future__ import annotations
+
+from dataclasses import dataclass
+
+
+@dataclass(frozen=True)
+class ConversionResult:
+    """Conversion result including markdown and warnings.
+
+    engine names the engine that produced the markdown and fallbacks counts
+    the engines that failed before it.
+    """
+
+    markdown: str
+    warnings: list[str]
+    engine: str = ""
+    fallbacks: int = 0
@@ -0,0 +1,224 @@
+"""Conversion engines keyed by file extension, with a fallback chain.
+
+Engines are ``module:function`` references imported on first use, so a run
+only pays for the engines its files actually need. For each file the
+registry builds a chain from the engines registered for its extension
+whose selection rule accepts the file's pre-flight facts (size, sheet
+count, container format), in registration order, and ends it with the
+fallback engine (MarkItDown). An engine registered twice with different
+rules takes a file when either rule accepts it. When an engine raises, the next one in the
+chain converts the file; the result records which engine produced it and
+how many engines fell through before it.
+"""
+
+from __future__ import annotations
+
+import dataclasses
+import importlib
+import io
+import re
+import sys
+import zipfile
+from dataclasses import dataclass, field
+from functools import cached_property
+from pathlib import Path
+from typing import Callable, Iterable
+
+from .conversion_result import ConversionResult
+
+EngineFunction = Callable[[Path, "bytes | None"], ConversionResult]
+
+_OLE_SIGNATURE = b"\xd0\xcf\x11\xe0\xa1\xb1\x1a\xe1"
+_ZIP_SIGNATURE = b"PK\x03\x04"
+_XLSX_SHEET = re.compile(rb"<(?:\w+:)?sheet\b")
+
+
+@dataclass(frozen=True)
+class EngineSpec:
+    """A conversion engine and the rule deciding which files it takes.
+
+    target is ``module:function``; relative module names resolve against
+    app.core. Empty containers accept any container format, and files
+    whose sheet count cannot be determined fail min_sheets.
+    """
+
+    name: str
+    target: str
+    containers: frozenset[str] = frozenset()
+    min_size: int = 0
+    max_size: int | None = None
+    min_sheets: int = 0
+
+    def accepts(self, facts: FilePreflight) -> bool:
+        if self.containers and facts.container not in self.containers:
+            return False
+        if facts.size < self.min_size:
+            return False
+        if self.max_size is not None and facts.size > self.max_size:
+            return False
+        if self.min_sheets and (facts.sheet_count or 0) < self.min_sheets:
+            return False
+        return True
+
+
+class FilePreflight:
+    """Cheap facts about one input file, each computed on first use."""
+
+    def __init__(self, path: Path, data: bytes | None = None) -> None:
+        self.path = path
+        self.extension = path.suffix.lower()
+        self._data = data
+
+    @cached_property
+    def size(self) -> int:
+        if self._data is not None:
+            return len(self._data)
+        try:
+            return self.path.stat().st_size
+        except OSError:
+            return 0
+
+    @cached_property
+    def container(self) -> str:
+        """``ole2``, ``zip`` or ``other``, from the leading bytes."""
+        if self._data is not None:
+            head = self._data[:8]
+        else:
+            try:
+                with self.path.open("rb") as handle:
+                    head = handle.read(8)
+            except OSError:
+                head = b""
+        if head == _OLE_SIGNATURE:
+            return "ole2"
+        if head.startswith(_ZIP_SIGNATURE):
+            return "zip"
+        return "other"
+
+    @cached_property
+    def sheet_count(self) -> int | None:
+        """Sheets listed in an .xlsx workbook.xml; None for other files or on errors."""
+        if self.extension != ".xlsx" or self.container != "zip":
+            return None
+        source = self.path if self._data is None else io.BytesIO(self._data)
+        try:
+            with zipfile.ZipFile(source) as archive:
+                return len(_XLSX_SHEET.findall(archive.read("xl/workbook.xml")))
+        except (OSError, KeyError, zipfile.BadZipFile):
+            return None
+
+
+class EngineRegistry:
+    """Map extensions to engines and convert files through their chain."""
+
+    def __init__(self, fallback: EngineSpec) -> None:
+        self.fallback = fallback
+        self._engines: dict[str, list[EngineSpec]] = {}
+        self._loaded: dict[str, EngineFunction] = {}
+
+    def register(self, extensions: Iterable[str], spec: EngineSpec) -> None:
+        """Add an engine ahead of the fallback, after earlier registrations."""
+        for extension in extensions:
+            self._engines.setdefault(extension.lower(), []).append(spec)
+
+    def chain(self, facts: FilePreflight) -> list[EngineSpec]:
+        engines: list[EngineSpec] = []
+        for spec in self._engines.get(facts.extension, []):
+            if all(spec.target != chosen.target for chosen in engines) and spec.accepts(facts):
+                engines.append(spec)
+        return [*engines, self.fallback]
+
+    def load(self, spec: EngineSpec) -> EngineFunction:
+        function = self._loaded.get(spec.target)
+        if function is None:
+            module_name, _, attribute = spec.target.partition(":")
+            module = importlib.import_module(module_name, __package__)
+            function = getattr(module, attribute)
+            self._loaded[spec.target] = function
+        return function
+
+    def convert(self, input_path: Path, data: bytes | None = None) -> ConversionResult:
+        """Convert with the first engine of the chain that succeeds.
+
+        Errors of the fallback engine propagate; earlier failures become
+        warnings on the result.
+        """
+        *preferred, fallback = self.chain(FilePreflight(input_path, data))
+        skipped: list[str] = []
+        for spec in preferred:
+            try:
+                result = self.load(spec)(input_path, data)
+            except Exception as exc:
+                skipped.append(f"{spec.name}エンジンで変換できなかったため別のエンジンで変換しました: {exc}")
+                continue
+            return _with_engine(result, spec, skipped)
+        return _with_engine(self.load(fallback)(input_path, data), fallback, skipped)
+
+    def warm_up(self) -> None:
+        """Import every engine and run its module's warm_up(), if any."""
+        specs = [spec for engines in self._engines.values() for spec in engines]
+        for spec in [*specs, self.fallback]:
+            module = sys.modules[self.load(spec).__module__]
+            warm_up = getattr(module, "warm_up", None)
+            if callable(warm_up):
+                warm_up()
+
+
+@dataclass
+class EngineUsage:
+    """Files, conversion time and fallbacks per engine over a run."""
+
+    files: dict[str, int] = field(default_factory=dict)
+    seconds: dict[str, float] = field(default_factory=dict)
+    fallbacks: int = 0
+
+    def record(self, result: ConversionResult, seconds: float) -> None:
+        self.files[result.engine] = self.files.get(result.engine, 0) + 1
+        self.seconds[result.engine] = self.seconds.get(result.engine, 0.0) + seconds
+        self.fallbacks += result.fallbacks
+
+    def describe(self) -> str:
+        return " ".join(
+            f"{engine}={count}/{self.seconds[engine]:.2f}s"
+            for engine, count in sorted(self.files.items())
+        )
+
+
+MARKITDOWN_ENGINE = EngineSpec("markitdown", ".markitdown_engine:convert")
+XLS_STREAM_ENGINE = EngineSpec(
+    "xls-stream",
+    ".xls_converter:convert",
+    containers=frozenset({"ole2"}),
+)
+# Smaller workbooks stay on MarkItDown; above this size its several
+# openpyxl loads (one str object per shared string each) dominate memory.
+# Cell text is formatted per cell rather than per pandas column, so the
+# two engines differ in number and empty-cell formatting (see
+# workbook_markdown).
+XLSX_COMPACT_MIN_SIZE = 4 * 1024 * 1024
+XLSX_COMPACT_ENGINE = EngineSpec(
+    "xlsx-compact",
+    ".xlsx_converter:convert",
+    containers=frozenset({"zip"}),
+    min_size=XLSX_COMPACT_MIN_SIZE,
+)
+# MarkItDown builds a DataFrame and an HTML table per sheet (about 5 ms
+# each), so workbooks with many small sheets also go to the compact engine.
+XLSX_COMPACT_MIN_SHEETS = 50
+XLSX_MANY_SHEETS_ENGINE = dataclasses.replace(
+    XLSX_COMPACT_ENGINE, min_size=0, min_sheets=XLSX_COMPACT_MIN_SHEETS
+)
+
+default_registry = EngineRegistry(fallback=MARKITDOWN_ENGINE)
+default_registry.register([".xls"], XLS_STREAM_ENGINE)
+default_registry.register([".xlsx"], XLSX_COMPACT_ENGINE)
+default_registry.register([".xlsx"], XLSX_MANY_SHEETS_ENGINE)
+
+
+def _with_engine(result: ConversionResult, spec: EngineSpec, skipped: list[str]) -> ConversionResult:
+    return dataclasses.replace(
+        result,
+        warnings=[*skipped, *result.warnings],
+        engine=spec.name,
+        fallbacks=len(skipped),
+    )
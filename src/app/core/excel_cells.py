@@ -0,0 +1,56 @@
+"""Cell values shared by the streaming Excel readers (.xls and .xlsx)."""
+
+from __future__ import annotations
+
+import datetime as dt
+import re
+from typing import Union
+
+CellValue = Union[str, float, bool, dt.datetime, dt.time]
+
+# Built-in number formats that display dates/times, including the
+# Japanese-locale ids 27-36 and 50-58.
+_BUILTIN_DATE_FORMATS = frozenset(
+    [*range(14, 23), *range(27, 37), *range(45, 48), *range(50, 59)]
+)
+_FORMAT_LITERALS = re.compile(r'"[^"]*"|\\.|\[[^\]]*\]|_.|\*.')
+_DATE_TOKENS = re.compile(r"[ymdhs]", re.IGNORECASE)
+
+
+def is_date_format(format_id: int, format_text: str | None) -> bool:
+    """Return True if a number format displays a date or time."""
+    if format_id in _BUILTIN_DATE_FORMATS:
+        return True
+    if not format_text or format_text.lower() == "general":
+        return False
+    section = format_text.split(";", 1)[0]
+    return bool(_DATE_TOKENS.search(_FORMAT_LITERALS.sub("", section)))
+
+
+def excel_datetime(serial: float, datemode: int) -> CellValue:
+    """Convert a date serial (1900 or 1904 system) to datetime or time."""
+    if serial < 0:
+        return serial
+    if datemode == 1:
+        base = dt.datetime(1904, 1, 1)
+    elif serial < 60:
+        # Serial numbers before the fictitious 1900-02-29 are one day off.
+        base = dt.datetime(1899, 12, 31)
+    elif serial < 61:
+        return serial
+    else:
+        base = dt.datetime(1899, 12, 30)
+    value = base + dt.timedelta(seconds=round(serial * 86400))
+    if serial < 1 and datemode == 0:
+        return value.time()
+    return value
+
+
+def column_letter(col: int) -> str:
+    """Column letters for a 0-based column index (0 -> A)."""
+    letters = ""
+    col += 1
+    while col:
+        col, remainder = divmod(col - 1, 26)
+        letters = chr(ord("A") + remainder) + letters
+    return letters
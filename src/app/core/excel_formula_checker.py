@@ -0,0 +1,81 @@
+"""Detection of formula cells without a cached result."""
+
+from __future__ import annotations
+
+import io
+from pathlib import Path
+from typing import BinaryIO
+
+from openpyxl import load_workbook
+
+MAX_MISSING_FORMULAS = 50
+
+
+def detect_missing_formula_values(path: Path, data: bytes | None = None) -> list[str]:
+    """Return warnings for .xlsx formula cells whose value was never calculated."""
+    warnings: list[str] = []
+
+    try:
+        formula_book = load_workbook(
+            _workbook_source(path, data), data_only=False, read_only=True
+        )
+        value_book = load_workbook(
+            _workbook_source(path, data), data_only=True, read_only=True
+        )
+    except Exception as exc:  # pragma: no cover - defensive fallback
+        return [f"数式結果の検出に失敗しました: {exc}"]
+
+    missing_count = 0
+    samples: list[str] = []
+    truncated = False
+    max_samples = 5
+    max_missing = MAX_MISSING_FORMULAS
+
+    try:
+        for sheet_name in formula_book.sheetnames:
+            ws_formula = formula_book[sheet_name]
+            ws_values = value_book[sheet_name]
+            for row in ws_formula.iter_rows():
+                for cell in row:
+                    if cell.data_type != "f":
+                        continue
+                    value = ws_values[cell.coordinate].value
+                    if value is None:
+                        missing_count += 1
+                        if len(samples) < max_samples:
+                            samples.append(f"{sheet_name}!{cell.coordinate}")
+                        if missing_count >= max_missing:
+                            truncated = True
+                            break
+                if truncated:
+                    break
+            if truncated:
+                break
+    finally:
+        for book in (formula_book, value_book):
+            close = getattr(book, "close", None)
+            if callable(close):
+                close()
+
+    if missing_count > 0:
+        warnings.extend(missing_formula_warnings(samples, truncated))
+
+    return warnings
+
+
+def missing_formula_warnings(samples: list[str], truncated: bool) -> list[str]:
+    """Format the warning for missing formula results and their samples."""
+    sample_text = ", ".join(samples)
+    if truncated:
+        return [
+            "数式結果が取得できないセルが多数あります。"
+            f"（例: {sample_text} ほか）"
+        ]
+    return [
+        "数式結果が取得できないセルがあります。"
+        f"（例: {sample_text}）"
+    ]
+
+
+def _workbook_source(path: Path, data: bytes | None) -> Path | BinaryIO:
+    return path if data is None else io.BytesIO(data)
@@ -2,6 +2,7 @@
 
 from __future__ import annotations
 
+import io
 from dataclasses import dataclass
 from pathlib import Path
 from typing import Iterable
@@ -18,9 +19,10 @@ class ExcelImageDetectionResult:
     warnings: list[str]
 
 
-def detect_excel_images(path: Path) -> ExcelImageDetectionResult:
+def detect_excel_images(path: Path, data: bytes | None = None) -> ExcelImageDetectionResult:
     """Detect image-containing sheets for .xlsx files.
 
+    When data is given, the workbook is read from memory instead of path.
     Returns warnings when detection is skipped or fails.
     """
     extension = path.suffix.lower()
@@ -32,7 +34,7 @@ def detect_excel_images(path: Path) -> ExcelImageDetectionResult:
         )
 
     try:
-        workbook = load_workbook(path, data_only=True)
+        workbook = load_workbook(path if data is None else io.BytesIO(data), data_only=True)
     except Exception as exc:  # pragma: no cover - defensive fallback
         return ExcelImageDetectionResult(
             sheet_names=[],
@@ -3,15 +3,22 @@
 from __future__ import annotations
 
 import os
+import time
 from dataclasses import dataclass
 from pathlib import Path
+from typing import Callable
 
+from .archive_reader import ArchiveReadError, list_archive_members
 from .path_utils import (
     SUPPORTED_EXTENSIONS,
+    is_archive_file_name,
     is_excluded_output_dir_name,
     is_supported_extension,
     is_temp_office_file,
 )
+from .scan_index import ArchiveListing, DirectoryListing, ScanIndex
+
+OnArchiveError = Callable[[Path, ArchiveReadError], None]
 
 
 @dataclass(frozen=True)
@@ -25,13 +32,28 @@ class FileScanError(RuntimeError):
         return f"Failed to scan {self.path}: {self.original}"
 
 
-def scan_input_files(input_root: Path) -> list[Path]:
+def scan_input_files(
+    input_root: Path,
+    index: ScanIndex | None = None,
+    expand_archives: bool = False,
+    on_archive_error: OnArchiveError | None = None,
+) -> list[Path]:
     """Recursively scan for supported document files under input_root.
 
     Exclusions:
     - Temporary Office files that start with '~$'.
     - Directories whose names contain '_md' (case-insensitive).
 
+    When expand_archives is True, .zip/.tar archives are treated as virtual
+    directories and their supported members are returned as
+    ``<archive>/<member>`` paths, in the order they are stored in the
+    archive. Unreadable archives are reported to on_archive_error and
+    skipped; without a callback the error is raised.
+
+    When index is given, directories whose mtime matches the index reuse the
+    cached listing instead of being listed again, and the index is updated
+    with the result of this scan (the caller is responsible for saving it).
+
     Raises:
     - FileNotFoundError or NotADirectoryError when input_root is invalid.
     - FileScanError when access to a path is denied or another OS error occurs.
@@ -42,20 +64,116 @@ def scan_input_files(input_root: Path) -> list[Path]:
         raise NotADirectoryError(input_root)
 
     collected: list[Path] = []
-
-    def onerror(error: OSError) -> None:
-        raise FileScanError(Path(error.filename) if error.filename else input_root, error)
-
-    for dirpath, dirnames, filenames in os.walk(input_root, onerror=onerror):
-        dirnames[:] = [
-            name for name in dirnames if not is_excluded_output_dir_name(name)
-        ]
-
-        for filename in filenames:
-            path = Path(dirpath) / filename
-            if is_temp_office_file(path):
+    archive_members: dict[Path, list[Path]] = {}
+    observed: dict[str, DirectoryListing] = {}
+    observed_archives: dict[str, ArchiveListing] = {}
+    scan_started_ns = time.time_ns()
+    pending = [""]
+
+    while pending:
+        relative_dir = pending.pop()
+        dir_path = input_root.joinpath(*relative_dir.split("/")) if relative_dir else input_root
+
+        try:
+            stat_result = os.stat(dir_path)
+        except OSError as error:
+            raise FileScanError(dir_path, error)
+
+        listing = index.lookup(relative_dir, stat_result) if index is not None else None
+        if listing is None:
+            listing = _list_directory(dir_path, stat_result)
+        observed[relative_dir] = listing
+
+        for filename in listing.files:
+            collected.append(dir_path / filename)
+        for name in listing.subdirs:
+            pending.append(f"{relative_dir}/{name}" if relative_dir else name)
+
+        if not expand_archives:
+            continue
+        for name in listing.archives:
+            archive_path = dir_path / name
+            relative_path = f"{relative_dir}/{name}" if relative_dir else name
+            try:
+                archive_listing = _archive_listing(archive_path, relative_path, index)
+            except ArchiveReadError as error:
+                if on_archive_error is None:
+                    raise
+                on_archive_error(archive_path, error)
                 continue
-            if is_supported_extension(path, SUPPORTED_EXTENSIONS):
-                collected.append(path)
-
-    return sorted(collected)
+            observed_archives[relative_path] = archive_listing
+            archive_members[archive_path] = [
+                archive_path.joinpath(*member.split("/")) for member in archive_listing.members
+            ]
+
+    if index is not None:
+        index.replace(observed, scan_started_ns, observed_archives)
+
+    # Archives are sorted among the files; their members keep stored order.
+    ordered = sorted([*collected, *archive_members])
+    return [path for entry in ordered for path in archive_members.get(entry, [entry])]
+
+
+def _list_directory(dir_path: Path, stat_result: os.stat_result) -> DirectoryListing:
+    # The directory is stat'ed before listing so a concurrent change always
+    # leaves a newer mtime behind than the one recorded here.
+    subdirs: list[str] = []
+    files: list[str] = []
+    archives: list[str] = []
+
+    try:
+        with os.scandir(dir_path) as entries:
+            for entry in entries:
+                try:
+                    is_dir = entry.is_dir()
+                except OSError:
+                    is_dir = False
+
+                if is_dir:
+                    # Like os.walk(followlinks=False), do not descend into links.
+                    if entry.is_symlink() or is_excluded_output_dir_name(entry.name):
+                        continue
+                    subdirs.append(entry.name)
+                    continue
+
+                path = Path(entry.path)
+                if is_temp_office_file(path):
+                    continue
+                if is_archive_file_name(entry.name):
+                    if not is_excluded_output_dir_name(entry.name):
+                        archives.append(entry.name)
+                    continue
+                if is_supported_extension(path, SUPPORTED_EXTENSIONS):
+                    files.append(entry.name)
+    except OSError as error:
+        raise FileScanError(Path(error.filename) if error.filename else dir_path, error)
+
+    return DirectoryListing(
+        mtime_ns=stat_result.st_mtime_ns,
+        inode=stat_result.st_ino,
+        subdirs=tuple(sorted(subdirs)),
+        files=tuple(sorted(files)),
+        archives=tuple(sorted(archives)),
+    )
+
+
+def _archive_listing(
+    archive_path: Path,
+    relative_path: str,
+    index: ScanIndex | None,
+) -> ArchiveListing:
+    try:
+        stat_result = os.stat(archive_path)
+    except OSError as error:
+        raise FileScanError(archive_path, error)
+
+    if index is not None:
+        cached = index.lookup_archive(relative_path, stat_result)
+        if cached is not None:
+            return cached
+
+    return ArchiveListing(
+        mtime_ns=stat_result.st_mtime_ns,
+        size=stat_result.st_size,
+        members=tuple(list_archive_members(archive_path)),
+    )
@@ -0,0 +1,206 @@
+"""Change notification for input folders (inotify with a polling fallback)."""
+
+from __future__ import annotations
+
+import ctypes
+import ctypes.util
+import errno
+import os
+import select
+import struct
+import sys
+import time
+from dataclasses import dataclass, field
+from pathlib import Path
+
+from .path_utils import is_excluded_output_dir_name, is_supported_extension, is_temp_office_file
+
+_IN_MODIFY = 0x00000002
+_IN_CLOSE_WRITE = 0x00000008
+_IN_MOVED_FROM = 0x00000040
+_IN_MOVED_TO = 0x00000080
+_IN_CREATE = 0x00000100
+_IN_DELETE = 0x00000200
+_IN_Q_OVERFLOW = 0x00004000
+_IN_IGNORED = 0x00008000
+_IN_ISDIR = 0x40000000
+_IN_NONBLOCK = 0x00000800
+_IN_CLOEXEC = 0x00080000
+_WATCH_MASK = (
+    _IN_MODIFY | _IN_CLOSE_WRITE | _IN_MOVED_FROM | _IN_MOVED_TO | _IN_CREATE | _IN_DELETE
+)
+_EVENT_HEADER = struct.Struct("iIII")
+
+
+@dataclass
+class WatchEvents:
+    """Paths reported by a watcher since the previous poll.
+
+    rescan is set when events may have been lost (e.g. a queue overflow) and
+    the caller should compare the whole tree against its own state.
+    """
+
+    paths: set[Path] = field(default_factory=set)
+    rescan: bool = False
+
+
+def is_watched_file(path: Path) -> bool:
+    """Return True for files the watcher should report."""
+    return is_supported_extension(path) and not is_temp_office_file(path)
+
+
+def snapshot_files(root: Path) -> dict[Path, tuple[int, int]]:
+    """Return (mtime_ns, size) for every watched file under root."""
+    snapshot: dict[Path, tuple[int, int]] = {}
+    pending = [root]
+    while pending:
+        directory = pending.pop()
+        try:
+            entries = list(os.scandir(directory))
+        except OSError:
+            continue
+        for entry in entries:
+            try:
+                if entry.is_dir(follow_symlinks=False):
+                    if not is_excluded_output_dir_name(entry.name):
+                        pending.append(Path(entry.path))
+                    continue
+                path = Path(entry.path)
+                if is_watched_file(path):
+                    stat_result = entry.stat()
+                    snapshot[path] = (stat_result.st_mtime_ns, stat_result.st_size)
+            except OSError:
+                continue
+    return snapshot
+
+
+class PollingWatcher:
+    """Detect changes by comparing periodic snapshots of the tree."""
+
+    def __init__(self, root: Path, interval: float = 2.0) -> None:
+        self.root = root
+        self.interval = interval
+        self._snapshot = snapshot_files(root)
+        self._next_poll = time.monotonic() + interval
+
+    def poll(self, timeout: float) -> WatchEvents:
+        delay = self._next_poll - time.monotonic()
+        if delay > timeout:
+            time.sleep(max(timeout, 0.0))
+            return WatchEvents()
+        if delay > 0:
+            time.sleep(delay)
+        self._next_poll = time.monotonic() + self.interval
+
+        current = snapshot_files(self.root)
+        changed = {
+            path
+            for path in current.keys() | self._snapshot.keys()
+            if current.get(path) != self._snapshot.get(path)
+        }
+        self._snapshot = current
+        return WatchEvents(paths=changed)
+
+    def close(self) -> None:
+        return None
+
+
+class InotifyWatcher:
+    """Linux inotify watcher covering every non-excluded directory under root."""
+
+    def __init__(self, root: Path) -> None:
+        libc_name = ctypes.util.find_library("c")
+        if not libc_name:
+            raise OSError(errno.ENOSYS, "libc not found")
+        self._libc = ctypes.CDLL(libc_name, use_errno=True)
+        fd = self._libc.inotify_init1(_IN_NONBLOCK | _IN_CLOEXEC)
+        if fd < 0:
+            raise OSError(ctypes.get_errno(), "inotify_init1 failed")
+        self.root = root
+        self._fd = fd
+        self._watches: dict[int, Path] = {}
+        self._add_tree(root)
+
+    def poll(self, timeout: float) -> WatchEvents:
+        events = WatchEvents()
+        readable, _, _ = select.select([self._fd], [], [], max(timeout, 0.0))
+        if not readable:
+            return events
+
+        while True:
+            try:
+                buffer = os.read(self._fd, 64 * 1024)
+            except BlockingIOError:
+                break
+            if not buffer:
+                break
+            self._parse(buffer, events)
+        return events
+
+    def close(self) -> None:
+        if self._fd >= 0:
+            os.close(self._fd)
+            self._fd = -1
+
+    def _parse(self, buffer: bytes, events: WatchEvents) -> None:
+        offset = 0
+        while offset + _EVENT_HEADER.size <= len(buffer):
+            wd, mask, _cookie, length = _EVENT_HEADER.unpack_from(buffer, offset)
+            offset += _EVENT_HEADER.size
+            raw_name = buffer[offset : offset + length].rstrip(b"\0")
+            offset += length
+
+            if mask & _IN_Q_OVERFLOW:
+                events.rescan = True
+                continue
+            if mask & _IN_IGNORED:
+                self._watches.pop(wd, None)
+                continue
+
+            directory = self._watches.get(wd)
+            if directory is None or not raw_name:
+                continue
+            path = directory / os.fsdecode(raw_name)
+
+            if mask & _IN_ISDIR:
+                if mask & (_IN_CREATE | _IN_MOVED_TO) and not is_excluded_output_dir_name(path.name):
+                    # Files may land in a new directory before its watch exists.
+                    self._add_tree(path)
+                    events.paths.update(snapshot_files(path))
+                elif mask & _IN_MOVED_FROM:
+                    events.rescan = True
+                continue
+            if is_watched_file(path):
+                events.paths.add(path)
+
+    def _add_tree(self, root: Path) -> None:
+        pending = [root]
+        while pending:
+            directory = pending.pop()
+            wd = self._libc.inotify_add_watch(
+                self._fd, os.fsencode(str(directory)), _WATCH_MASK
+            )
+            if wd < 0:
+                continue
+            self._watches[wd] = directory
+            try:
+                entries = list(os.scandir(directory))
+            except OSError:
+                continue
+            for entry in entries:
+                if entry.is_dir(follow_symlinks=False) and not is_excluded_output_dir_name(entry.name):
+                    pending.append(Path(entry.path))
+
+
+def create_watcher(
+    root: Path,
+    poll_interval: float = 2.0,
+    force_polling: bool = False,
+) -> InotifyWatcher | PollingWatcher:
+    """Return an inotify watcher where available, otherwise a polling one."""
+    if not force_polling and sys.platform.startswith("linux"):
+        try:
+            return InotifyWatcher(root)
+        except (OSError, AttributeError):
+            pass
+    return PollingWatcher(root, poll_interval)
@@ -0,0 +1,52 @@
+"""Rolling latency percentiles and throughput for long-running modes."""
+
+from __future__ import annotations
+
+import threading
+import time
+from collections import deque
+
+
+class LatencyStats:
+    """Thread-safe rolling window of completion latencies (seconds)."""
+
+    def __init__(self, max_samples: int = 1000, window_seconds: float = 60.0) -> None:
+        self.window_seconds = window_seconds
+        self._samples: deque[float] = deque(maxlen=max_samples)
+        self._completions: deque[float] = deque()
+        self._lock = threading.Lock()
+
+    def record(self, seconds: float, now: float | None = None) -> None:
+        now = time.monotonic() if now is None else now
+        with self._lock:
+            self._samples.append(seconds)
+            self._completions.append(now)
+            self._trim(now)
+
+    def percentile(self, fraction: float) -> float | None:
+        with self._lock:
+            return percentile(sorted(self._samples), fraction)
+
+    def maximum(self) -> float | None:
+        with self._lock:
+            return max(self._samples) if self._samples else None
+
+    def throughput(self, now: float | None = None) -> float:
+        """Completions per second over the trailing window."""
+        now = time.monotonic() if now is None else now
+        with self._lock:
+            self._trim(now)
+            return len(self._completions) / self.window_seconds
+
+    def _trim(self, now: float) -> None:
+        cutoff = now - self.window_seconds
+        while self._completions and self._completions[0] < cutoff:
+            self._completions.popleft()
+
+
+def percentile(sorted_values: list[float], fraction: float) -> float | None:
+    """Nearest-rank percentile of an already sorted list."""
+    if not sorted_values:
+        return None
+    index = min(len(sorted_values) - 1, int(round(fraction * (len(sorted_values) - 1))))
+    return sorted_values[index]
@@ -2,16 +2,22 @@
 
 from __future__ import annotations
 
-from dataclasses import dataclass
+from dataclasses import dataclass, field
 from datetime import datetime
 from pathlib import Path
+from typing import Callable
 
 
 @dataclass(frozen=True)
 class ConversionLogger:
-    """Append-only logger writing to a conversion log file."""
+    """Append-only logger writing to a conversion log file.
+
+    throttle, when set, is called with the size of each line before it is
+    written (the resource governor's write budget).
+    """
 
     log_path: Path
+    throttle: Callable[[int], None] | None = field(default=None, compare=False, repr=False)
 
     def info(self, message: str) -> None:
         self._write("INFO", message)
@@ -22,8 +28,35 @@ class ConversionLogger:
     def error(self, message: str) -> None:
         self._write("ERROR", message)
 
-    def _write(self, level: str, message: str) -> None:
+    def write_lines(self, lines: list[str]) -> None:
+        """Append already formatted lines with a single open of the log."""
+        text = "".join(lines)
+        if self.throttle is not None:
+            self.throttle(len(text.encode("utf-8")))
         self.log_path.parent.mkdir(parents=True, exist_ok=True)
-        timestamp = datetime.now().strftime("%Y-%m-%d %H:%M:%S")
         with self.log_path.open("a", encoding="utf-8") as handle:
-            handle.write(f"[{timestamp}] {level}: {message}\n")
+            handle.write(text)
+
+    def _write(self, level: str, message: str) -> None:
+        self.write_lines([_format_line(level, message)])
+
+
+@dataclass(frozen=True)
+class MemoryConversionLogger(ConversionLogger):
+    """Logger keeping lines in memory, for logs stored inside output bundles.
+
+    log_path is the virtual location the log will have once bundled.
+    """
+
+    lines: list[str] = field(default_factory=list, compare=False, repr=False)
+
+    def getvalue(self) -> str:
+        return "".join(self.lines)
+
+    def write_lines(self, lines: list[str]) -> None:
+        self.lines.extend(lines)
+
+
+def _format_line(level: str, message: str) -> str:
+    timestamp = datetime.now().strftime("%Y-%m-%d %H:%M:%S")
+    return f"[{timestamp}] {level}: {message}\n"
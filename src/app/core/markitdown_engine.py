@@ -0,0 +1,82 @@
+"""Conversion engine backed by MarkItDown; handles every supported format."""
+
+from __future__ import annotations
+
+import io
+import threading
+from pathlib import Path
+
+from markitdown import MarkItDown
+
+from .conversion_result import ConversionResult
+from .excel_formula_checker import detect_missing_formula_values
+from .excel_image_detector import ExcelImageDetectionResult, detect_excel_images
+from .markdown_postprocessor import (
+    MarkdownPostprocessResult,
+    normalize_excel_markdown,
+    remove_image_markdown,
+)
+
+_thread_state = threading.local()
+
+
+def convert(input_path: Path, data: bytes | None = None) -> ConversionResult:
+    """Convert a document with MarkItDown and apply Excel post-processing."""
+    extension = input_path.suffix.lower()
+    converter = _markitdown()
+    if data is None:
+        result = converter.convert(str(input_path))
+    else:
+        result = converter.convert_stream(io.BytesIO(data), file_extension=extension)
+    markdown = _extract_markdown(result)
+    warnings: list[str] = []
+
+    markdown = remove_image_markdown(markdown)
+
+    if extension in {".xlsx", ".xls"}:
+        image_result = detect_excel_images(input_path, data)
+        warnings.extend(image_result.warnings)
+
+        post_result = _postprocess_excel_markdown(
+            markdown,
+            image_result,
+        )
+        markdown = post_result.markdown
+        warnings.extend(post_result.warnings)
+
+        if extension == ".xlsx":
+            warnings.extend(detect_missing_formula_values(input_path, data))
+
+    return ConversionResult(markdown=markdown, warnings=warnings)
+
+
+def warm_up() -> None:
+    """Create the calling thread's converter ahead of the first document."""
+    _markitdown()
+
+
+def _markitdown() -> MarkItDown:
+    # Reused per thread so long-running workers keep converter state warm.
+    converter = getattr(_thread_state, "markitdown", None)
+    if converter is None:
+        converter = MarkItDown(enable_plugins=False)
+        _thread_state.markitdown = converter
+    return converter
+
+
+def _extract_markdown(result: object) -> str:
+    text = getattr(result, "text_content", None)
+    if text is None:
+        return str(result)
+    return str(text)
+
+
+def _postprocess_excel_markdown(
+    markdown: str,
+    image_result: ExcelImageDetectionResult,
+) -> MarkdownPostprocessResult:
+    return normalize_excel_markdown(
+        markdown,
+        getattr(image_result, "sheet_names", []),
+        getattr(image_result, "image_sheet_names", []),
+    )
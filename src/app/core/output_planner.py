@@ -4,6 +4,7 @@ from __future__ import annotations
 
 import itertools
 from pathlib import Path
+from typing import Callable
 
 from .path_utils import relative_to_root
 
@@ -23,27 +24,49 @@ def plan_output_dir(input_dir: Path) -> Path:
     raise RuntimeError("Failed to plan output directory.")
 
 
+def stable_output_dir(input_dir: Path) -> Path:
+    """Return <input>_md without numbering, for outputs updated in place."""
+    return input_dir.parent / f"{input_dir.name}_md"
+
+
+def plan_output_bundle(input_dir: Path, suffix: str) -> Path:
+    """Return a non-existing output bundle path next to the input directory.
+
+    Naming rule: <input>_md<suffix>, <input>_md_2<suffix>, ...
+    """
+    base_name = f"{input_dir.name}_md"
+    parent = input_dir.parent
+    for index in itertools.count(1):
+        name = base_name if index == 1 else f"{base_name}_{index}"
+        candidate = parent / f"{name}{suffix}"
+        if not candidate.exists():
+            return candidate
+    raise RuntimeError("Failed to plan output bundle.")
+
+
 def plan_output_file(
     input_file: Path,
     input_root: Path,
     output_root: Path,
+    exists: Callable[[Path], bool] | None = None,
 ) -> Path:
     """Return a non-conflicting output file path under output_root.
 
     Relative path under input_root is preserved, and the extension is .md.
     Naming rule for collisions: a.md, a_2.md, a_3.md, ...
+    exists decides whether a candidate is taken (default: on disk).
     """
     relative_path = relative_to_root(input_file, input_root)
     candidate = (output_root / relative_path).with_suffix(".md")
-    return _resolve_file_collision(candidate)
+    return _resolve_file_collision(candidate, exists or Path.exists)
 
 
-def _resolve_file_collision(path: Path) -> Path:
-    if not path.exists():
+def _resolve_file_collision(path: Path, exists: Callable[[Path], bool]) -> Path:
+    if not exists(path):
         return path
     stem = path.stem
     for index in itertools.count(2):
         candidate = path.with_name(f"{stem}_{index}{path.suffix}")
-        if not candidate.exists():
+        if not exists(candidate):
             return candidate
     raise RuntimeError("Failed to plan output file path.")
@@ -0,0 +1,189 @@
+"""Output destinations for converted Markdown.
+
+A sink decides where each Markdown file goes and how it is written:
+- ``directory``: one .md file per input under ``<input>_md`` (default).
+- ``zip`` / ``tar``: all Markdown and the log in a single archive bundle.
+- ``jsonl``: one JSON record per document plus a final log record.
+
+Bundle sinks write through a single sequential stream, and keep the same
+relative layout that plan_output_file produces for directory output.
+"""
+
+from __future__ import annotations
+
+import abc
+import io
+import json
+import tarfile
+import time
+import zipfile
+from pathlib import Path
+from typing import BinaryIO
+
+from app.config import LOG_FILE_NAME, PROFILE_DIR_NAME
+
+from .logger import ConversionLogger, MemoryConversionLogger
+from .output_planner import plan_output_bundle, plan_output_dir, plan_output_file
+
+OUTPUT_MODES = ("directory", "zip", "tar", "jsonl")
+
+_BUNDLE_SUFFIXES = {"zip": ".zip", "tar": ".tar", "jsonl": ".jsonl"}
+_STREAM_BUFFER_SIZE = 1024 * 1024
+
+
+class OutputSink:
+    """Directory output (one .md per input); bundle sinks override it."""
+
+    def __init__(self, location: Path) -> None:
+        self.location = location
+        self.log_path = location / LOG_FILE_NAME
+        # Directories already created by write(); saves a mkdir per file.
+        self._created_dirs: set[Path] = set()
+        # Paths handed out by plan(); writes run later on the writer thread,
+        # so the disk alone does not show which names are already taken.
+        self._taken: set[Path] = set()
+
+    @property
+    def artifact_dir(self) -> Path:
+        """Folder for diagnostic files that are not part of the output."""
+        return self.location / PROFILE_DIR_NAME
+
+    def open(self) -> ConversionLogger:
+        """Create the destination and return the logger for this run."""
+        self.location.mkdir(parents=True, exist_ok=False)
+        self._created_dirs.add(self.location)
+        return ConversionLogger(self.log_path)
+
+    def plan(self, input_file: Path, input_root: Path) -> Path:
+        output_file = plan_output_file(input_file, input_root, self.location, exists=self._is_taken)
+        self._taken.add(output_file)
+        return output_file
+
+    def _is_taken(self, path: Path) -> bool:
+        return path in self._taken or path.exists()
+
+    def write(self, output_file: Path, markdown: str, source: Path, warnings: list[str]) -> None:
+        parent = output_file.parent
+        if parent not in self._created_dirs:
+            parent.mkdir(parents=True, exist_ok=True)
+            self._created_dirs.update(parent.parents)
+            self._created_dirs.add(parent)
+        output_file.write_text(markdown, encoding="utf-8")
+
+    def close(self, logger: ConversionLogger) -> None:
+        return None
+
+
+class _BundleSink(OutputSink, abc.ABC):
+    """Base class for sinks writing everything into one file."""
+
+    def __init__(self, location: Path) -> None:
+        super().__init__(location)
+        self._taken.add(self.log_path)
+        self._stream: BinaryIO | None = None
+
+    @property
+    def artifact_dir(self) -> Path:
+        return self.location.with_name(f"{self.location.stem}_{PROFILE_DIR_NAME}")
+
+    def open(self) -> ConversionLogger:
+        self._stream = open(self.location, "xb", buffering=_STREAM_BUFFER_SIZE)
+        return MemoryConversionLogger(self.log_path)
+
+    def _is_taken(self, path: Path) -> bool:
+        return path in self._taken
+
+    def close(self, logger: ConversionLogger) -> None:
+        if self._stream is None:
+            return
+        try:
+            log_text = logger.getvalue() if isinstance(logger, MemoryConversionLogger) else ""
+            self._finish(log_text)
+        finally:
+            self._stream.close()
+            self._stream = None
+
+    def _member_name(self, output_file: Path) -> str:
+        return output_file.relative_to(self.location).as_posix()
+
+    @abc.abstractmethod
+    def _finish(self, log_text: str) -> None:
+        """Add the log as the last entry and complete the bundle format."""
+
+
+class ZipBundleSink(_BundleSink):
+    """Write Markdown and the log into a single .zip bundle."""
+
+    def open(self) -> ConversionLogger:
+        logger = super().open()
+        assert self._stream is not None
+        self._zip = zipfile.ZipFile(self._stream, "w", compression=zipfile.ZIP_DEFLATED)
+        return logger
+
+    def write(self, output_file: Path, markdown: str, source: Path, warnings: list[str]) -> None:
+        self._zip.writestr(self._member_name(output_file), markdown.encode("utf-8"))
+
+    def _finish(self, log_text: str) -> None:
+        self._zip.writestr(LOG_FILE_NAME, log_text.encode("utf-8"))
+        self._zip.close()
+
+
+class TarBundleSink(_BundleSink):
+    """Write Markdown and the log into a single uncompressed .tar bundle."""
+
+    def open(self) -> ConversionLogger:
+        logger = super().open()
+        assert self._stream is not None
+        self._tar = tarfile.open(fileobj=self._stream, mode="w|", format=tarfile.PAX_FORMAT)
+        return logger
+
+    def write(self, output_file: Path, markdown: str, source: Path, warnings: list[str]) -> None:
+        self._add(self._member_name(output_file), markdown.encode("utf-8"))
+
+    def _finish(self, log_text: str) -> None:
+        self._add(LOG_FILE_NAME, log_text.encode("utf-8"))
+        self._tar.close()
+
+    def _add(self, name: str, payload: bytes) -> None:
+        info = tarfile.TarInfo(name)
+        info.size = len(payload)
+        info.mtime = int(time.time())
+        self._tar.addfile(info, io.BytesIO(payload))
+
+
+class JsonlCorpusSink(_BundleSink):
+    """Write one JSON object per converted document to a .jsonl corpus."""
+
+    def write(self, output_file: Path, markdown: str, source: Path, warnings: list[str]) -> None:
+        self._write_record(
+            {
+                "path": self._member_name(output_file),
+                "source": str(source),
+                "markdown": markdown,
+                "warnings": warnings,
+            }
+        )
+
+    def _finish(self, log_text: str) -> None:
+        self._write_record({"path": LOG_FILE_NAME, "log": log_text})
+
+    def _write_record(self, record: dict[str, object]) -> None:
+        assert self._stream is not None
+        line = json.dumps(record, ensure_ascii=False) + "\n"
+        self._stream.write(line.encode("utf-8"))
+
+
+def create_output_sink(input_dir: Path, mode: str = "directory") -> OutputSink:
+    """Plan the output location next to input_dir and return its sink."""
+    if mode == "directory":
+        return OutputSink(plan_output_dir(input_dir))
+
+    suffix = _BUNDLE_SUFFIXES.get(mode)
+    if suffix is None:
+        raise ValueError(f"Unsupported output mode: {mode}")
+    location = plan_output_bundle(input_dir, suffix)
+    if mode == "zip":
+        return ZipBundleSink(location)
+    if mode == "tar":
+        return TarBundleSink(location)
+    return JsonlCorpusSink(location)
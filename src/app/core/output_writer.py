@@ -0,0 +1,193 @@
+"""Write-behind stage between conversion and the output sink.
+
+Converted Markdown is handed to a single writer thread through a bounded
+queue, so conversion of the next file overlaps with writing the previous
+one (which matters on high-latency network shares). Each wake-up drains
+the queued documents (up to 4 MB) but still writes them with one sink
+call each; documents are not merged. Each outcome is reported back with
+its source path so failures stay attributed to the right file.
+
+Log lines can go through the same thread (deferred_logger()); the lines
+queued since the last wake-up are appended with one open of the log.
+"""
+
+from __future__ import annotations
+
+import threading
+from collections import deque
+from dataclasses import dataclass, field
+from pathlib import Path
+from typing import Callable
+
+from .logger import ConversionLogger
+from .output_sink import OutputSink
+
+DEFAULT_MAX_PENDING = 64
+DEFAULT_MAX_PENDING_BYTES = 64 * 1024 * 1024
+_DRAIN_BYTES = 4 * 1024 * 1024
+
+
+@dataclass(frozen=True)
+class WriteJob:
+    """One converted document waiting to be written."""
+
+    source: Path
+    output_file: Path
+    markdown: str
+    warnings: list[str] = field(default_factory=list)
+
+
+@dataclass(frozen=True)
+class _DeferredLogger(ConversionLogger):
+    """Logger handing its lines to the writer thread."""
+
+    writer: WriteBehindWriter | None = field(default=None, compare=False, repr=False)
+
+    def write_lines(self, lines: list[str]) -> None:
+        assert self.writer is not None
+        self.writer._queue_log_lines(lines)
+
+
+@dataclass(frozen=True)
+class WriteOutcome:
+    """Result of writing a job; error is None on success."""
+
+    job: WriteJob
+    error: Exception | None = None
+
+
+class WriteBehindWriter:
+    """Feed an OutputSink from a background thread.
+
+    submit() blocks while max_pending documents or max_pending_bytes of
+    Markdown are waiting. throttle, when given, is called with the encoded
+    size of each document before it is written. Outcomes are collected
+    with completed() while the run goes on, and close() returns the rest
+    once everything is written.
+    """
+
+    def __init__(
+        self,
+        sink: OutputSink,
+        max_pending: int = DEFAULT_MAX_PENDING,
+        max_pending_bytes: int = DEFAULT_MAX_PENDING_BYTES,
+        throttle: Callable[[int], None] | None = None,
+    ) -> None:
+        self._sink = sink
+        self._throttle = throttle
+        self._max_pending = max_pending
+        self._max_pending_bytes = max_pending_bytes
+        self._condition = threading.Condition()
+        self._pending: deque[WriteJob] = deque()
+        self._pending_bytes = 0
+        self._outcomes: list[WriteOutcome] = []
+        self._log: ConversionLogger | None = None
+        self._log_lines: list[str] = []
+        self._log_error: Exception | None = None
+        self._closing = False
+        self._closed = False
+        self._thread = threading.Thread(target=self._run, name="output-writer", daemon=True)
+        self._thread.start()
+
+    def __enter__(self) -> "WriteBehindWriter":
+        return self
+
+    def __exit__(self, *exc_info: object) -> None:
+        self.close()
+
+    def submit(self, job: WriteJob) -> None:
+        size = len(job.markdown)
+        with self._condition:
+            # A single document larger than the byte budget is still accepted
+            # once the queue is empty.
+            while self._pending and (
+                len(self._pending) >= self._max_pending
+                or self._pending_bytes + size > self._max_pending_bytes
+            ):
+                self._condition.wait()
+            self._pending.append(job)
+            self._pending_bytes += size
+            self._condition.notify_all()
+
+    def deferred_logger(self, logger: ConversionLogger) -> ConversionLogger:
+        """Return a logger whose lines logger writes on the writer thread.
+
+        Lines logged after close() are written directly.
+        """
+        self._log = logger
+        return _DeferredLogger(logger.log_path, writer=self)
+
+    def completed(self) -> list[WriteOutcome]:
+        """Return outcomes finished since the last call, without waiting."""
+        with self._condition:
+            outcomes, self._outcomes = self._outcomes, []
+        return outcomes
+
+    def close(self) -> list[WriteOutcome]:
+        """Wait for every submitted job and return the remaining outcomes.
+
+        Raises the first error of writing the log, if any.
+        """
+        with self._condition:
+            self._closing = True
+            self._condition.notify_all()
+        self._thread.join()
+        with self._condition:
+            self._closed = True
+        if self._log_error is not None:
+            error, self._log_error = self._log_error, None
+            raise error
+        return self.completed()
+
+    def _queue_log_lines(self, lines: list[str]) -> None:
+        assert self._log is not None
+        with self._condition:
+            if not self._closed:
+                self._log_lines.extend(lines)
+                self._condition.notify_all()
+                return
+        self._log.write_lines(lines)
+
+    def _run(self) -> None:
+        while True:
+            jobs, log_lines = self._take_pending()
+            if not jobs and not log_lines:
+                return
+            if log_lines:
+                self._write_log(log_lines)
+            outcomes = []
+            for job in jobs:
+                try:
+                    if self._throttle is not None:
+                        self._throttle(len(job.markdown.encode("utf-8")))
+                    self._sink.write(job.output_file, job.markdown, job.source, job.warnings)
+                except Exception as exc:
+                    outcomes.append(WriteOutcome(job, exc))
+                else:
+                    outcomes.append(WriteOutcome(job))
+            with self._condition:
+                self._outcomes.extend(outcomes)
+
+    def _write_log(self, lines: list[str]) -> None:
+        assert self._log is not None
+        try:
+            self._log.write_lines(lines)
+        except Exception as exc:
+            # Reported by close(); the documents are still written.
+            if self._log_error is None:
+                self._log_error = exc
+
+    def _take_pending(self) -> tuple[list[WriteJob], list[str]]:
+        with self._condition:
+            while not self._pending and not self._log_lines and not self._closing:
+                self._condition.wait()
+            log_lines, self._log_lines = self._log_lines, []
+            jobs: list[WriteJob] = []
+            taken_bytes = 0
+            while self._pending and (not jobs or taken_bytes < _DRAIN_BYTES):
+                job = self._pending.popleft()
+                jobs.append(job)
+                taken_bytes += len(job.markdown)
+            self._pending_bytes -= taken_bytes
+            self._condition.notify_all()
+            return jobs, log_lines
@@ -6,6 +6,7 @@ from pathlib import Path
 from typing import Iterable
 
 SUPPORTED_EXTENSIONS = frozenset({".docx", ".xls", ".xlsx"})
+ARCHIVE_EXTENSIONS = (".zip", ".tar", ".tar.gz", ".tgz")
 
 
 def is_supported_extension(path: Path, extensions: Iterable[str] | None = None) -> bool:
@@ -22,6 +23,11 @@ def is_temp_office_file(path: Path) -> bool:
     return path.name.startswith("~$")
 
 
+def is_archive_file_name(name: str) -> bool:
+    """Return True if a file name looks like a supported input archive."""
+    return name.lower().endswith(ARCHIVE_EXTENSIONS)
+
+
 def is_excluded_output_dir_name(name: str) -> bool:
     """Return True if a directory name should be excluded from scanning."""
     return "_md" in name.lower()
@@ -0,0 +1,197 @@
+"""Profiling capture for outlier files (slow or memory-hungry conversions).
+
+The controller only creates an OutlierProfiler when a threshold is
+configured, so a normal run never imports cProfile or tracemalloc and pays
+nothing. When a file crosses a threshold it is converted once more under
+cProfile and tracemalloc, and both reports are written to the profile
+folder next to conversion.log.
+"""
+
+from __future__ import annotations
+
+import re
+import sys
+import time
+from dataclasses import dataclass
+from pathlib import Path
+from typing import Callable
+
+_TOP_ALLOCATIONS = 30
+_TOP_FUNCTIONS = 30
+_UNSAFE_NAME_CHARS = re.compile(r"[^\w.\-]+")
+_PROC_STATUS = Path("/proc/self/status")
+_PROC_CLEAR_REFS = Path("/proc/self/clear_refs")
+
+
+def peak_rss_bytes() -> int:
+    """Return the peak resident set size of the current process."""
+    if sys.platform.startswith("win"):
+        import ctypes
+        from ctypes import wintypes
+
+        class _Counters(ctypes.Structure):
+            _fields_ = [
+                ("cb", wintypes.DWORD),
+                ("PageFaultCount", wintypes.DWORD),
+                ("PeakWorkingSetSize", ctypes.c_size_t),
+                ("WorkingSetSize", ctypes.c_size_t),
+                ("QuotaPeakPagedPoolUsage", ctypes.c_size_t),
+                ("QuotaPagedPoolUsage", ctypes.c_size_t),
+                ("QuotaPeakNonPagedPoolUsage", ctypes.c_size_t),
+                ("QuotaNonPagedPoolUsage", ctypes.c_size_t),
+                ("PagefileUsage", ctypes.c_size_t),
+                ("PeakPagefileUsage", ctypes.c_size_t),
+            ]
+
+        counters = _Counters()
+        counters.cb = ctypes.sizeof(counters)
+        ctypes.windll.psapi.GetProcessMemoryInfo(
+            ctypes.windll.kernel32.GetCurrentProcess(),
+            ctypes.byref(counters),
+            counters.cb,
+        )
+        return int(counters.PeakWorkingSetSize)
+
+    import resource
+
+    peak = resource.getrusage(resource.RUSAGE_SELF).ru_maxrss
+    return peak if sys.platform == "darwin" else peak * 1024
+
+
+@dataclass(frozen=True)
+class Probe:
+    """Measurements taken when a file starts converting."""
+
+    started: float
+    peak_rss: int
+
+
+@dataclass(frozen=True)
+class Outlier:
+    """A file that crossed a threshold, with what was measured."""
+
+    seconds: float
+    memory_mb: float
+
+
+@dataclass(frozen=True)
+class ProfileCapture:
+    """Artifacts written for one profiled file."""
+
+    profile_path: Path
+    allocations_path: Path
+
+
+class OutlierProfiler:
+    """Detect outlier files and capture a profile of a second attempt.
+
+    memory_mb is compared with the growth of the peak RSS while the file
+    converts. On Linux the peak is reset before each file; elsewhere only
+    files that raise the process-wide peak are detected.
+    """
+
+    def __init__(
+        self,
+        directory: Path,
+        seconds: float | None = None,
+        memory_mb: float | None = None,
+        limit: int = 5,
+    ) -> None:
+        self.directory = directory
+        self.seconds = seconds
+        self.memory_mb = memory_mb
+        self.limit = limit
+        self.captured = 0
+
+    def start(self) -> Probe:
+        if self.memory_mb is not None:
+            _reset_peak_rss()
+        return Probe(started=time.perf_counter(), peak_rss=_current_peak_rss())
+
+    def check(self, probe: Probe) -> Outlier | None:
+        """Return the measurements if the file crossed a threshold."""
+        seconds = time.perf_counter() - probe.started
+        memory_mb = 0.0
+        if self.memory_mb is not None:
+            memory_mb = max(0, _current_peak_rss() - probe.peak_rss) / (1024 * 1024)
+        slow = self.seconds is not None and seconds >= self.seconds
+        hungry = self.memory_mb is not None and memory_mb >= self.memory_mb
+        if not (slow or hungry):
+            return None
+        return Outlier(seconds=seconds, memory_mb=memory_mb)
+
+    def capture(self, index: int, path: Path, rerun: Callable[[], object]) -> ProfileCapture | None:
+        """Run rerun under cProfile and tracemalloc and store both reports.
+
+        Returns None once limit files have been captured. Errors raised by
+        rerun are recorded in the allocation report, not propagated.
+        """
+        if self.captured >= self.limit:
+            return None
+        self.captured += 1
+
+        import cProfile
+        import pstats
+        import tracemalloc
+
+        self.directory.mkdir(parents=True, exist_ok=True)
+        stem = f"{index:05d}_{_UNSAFE_NAME_CHARS.sub('_', path.name)}"
+        profile_path = self.directory / f"{stem}.prof"
+        allocations_path = self.directory / f"{stem}.alloc.txt"
+
+        profiler = cProfile.Profile()
+        result: object = None
+        error: Exception | None = None
+        tracemalloc.start(25)
+        started = time.perf_counter()
+        try:
+            profiler.enable()
+            try:
+                # Kept alive until the snapshot so its allocations are listed.
+                result = rerun()
+            finally:
+                profiler.disable()
+        except Exception as exc:
+            error = exc
+        finally:
+            elapsed = time.perf_counter() - started
+            snapshot = tracemalloc.take_snapshot()
+            _current, traced_peak = tracemalloc.get_traced_memory()
+            tracemalloc.stop()
+            del result
+
+        profiler.dump_stats(str(profile_path))
+        with allocations_path.open("w", encoding="utf-8") as handle:
+            handle.write(f"source: {path}\n")
+            handle.write(f"profiled seconds: {elapsed:.3f}\n")
+            handle.write(f"traced peak: {traced_peak / (1024 * 1024):.1f} MB\n")
+            if error is not None:
+                handle.write(f"error: {type(error).__name__}: {error}\n")
+            handle.write(
+                f"\nTop {_TOP_ALLOCATIONS} allocation sites (still referenced by the result):\n"
+            )
+            for stat in snapshot.statistics("lineno")[:_TOP_ALLOCATIONS]:
+                handle.write(f"{stat}\n")
+            handle.write(f"\nTop {_TOP_FUNCTIONS} functions by cumulative time:\n")
+            stats = pstats.Stats(profiler, stream=handle)
+            stats.sort_stats("cumulative").print_stats(_TOP_FUNCTIONS)
+
+        return ProfileCapture(profile_path=profile_path, allocations_path=allocations_path)
+
+
+def _reset_peak_rss() -> None:
+    # "5" resets VmHWM (peak RSS) to the current RSS; Linux only.
+    try:
+        _PROC_CLEAR_REFS.write_text("5")
+    except OSError:
+        pass
+
+
+def _current_peak_rss() -> int:
+    try:
+        for line in _PROC_STATUS.read_text(encoding="ascii").splitlines():
+            if line.startswith("VmHWM:"):
+                return int(line.split()[1]) * 1024
+    except (OSError, ValueError, IndexError):
+        pass
+    return peak_rss_bytes()
@@ -0,0 +1,308 @@
+"""Run-level I/O budgets so batch runs do not saturate a shared file server.
+
+A ResourceGovernor owns one token bucket per budget: bytes read from source
+files, bytes written (Markdown output and the log) and files started. Each
+bucket refills at its configured rate and holds at most one second of
+budget; a request larger than that overdraws the bucket and the debt delays
+the next caller, so the average rate holds for any request size. Limits can
+be replaced while a run is going on, and waiting callers pick up the new
+rate immediately. Amounts are counted even without limits so the achieved
+rates can always be reported, per period of unchanged limits.
+
+The read budget meters input: the bytes of each source file (or archive
+member) handed to conversion, once. Without a read limit the engines open
+files themselves and may read them more than once, so this is the input
+size rather than the bytes read from disk.
+"""
+
+from __future__ import annotations
+
+import os
+import re
+import sys
+import threading
+import time
+from dataclasses import dataclass
+from pathlib import Path
+from typing import Callable
+
+_READ_CHUNK_SIZE = 256 * 1024
+_RATE_PATTERN = re.compile(r"^\s*(\d+(?:\.\d+)?)\s*([kmg]?)i?b?\s*(?:/s)?\s*$", re.IGNORECASE)
+_RATE_UNITS = {"": 1, "k": 1024, "m": 1024**2, "g": 1024**3}
+
+
+@dataclass(frozen=True)
+class ResourceLimits:
+    """I/O budgets per second; None means unlimited."""
+
+    read_bytes_per_second: float | None = None
+    write_bytes_per_second: float | None = None
+    files_per_second: float | None = None
+
+    def describe(self) -> str:
+        return (
+            f"read={_format_limit(self.read_bytes_per_second, format_byte_rate)} "
+            f"write={_format_limit(self.write_bytes_per_second, format_byte_rate)} "
+            f"files={_format_limit(self.files_per_second, _format_file_rate)}"
+        )
+
+
+@dataclass(frozen=True)
+class RateReport:
+    """Amount used over a run, its average rate and the limit in effect."""
+
+    amount: float
+    achieved: float
+    configured: float | None
+
+
+@dataclass(frozen=True)
+class LimitPeriod:
+    """Rates over a stretch of the run with one set of limits."""
+
+    started: float
+    seconds: float
+    input: RateReport
+    write: RateReport
+    files: RateReport
+
+    def describe(self) -> str:
+        return (
+            f"input={format_byte_rate(self.input.achieved)} "
+            f"(read limit {_format_limit(self.input.configured, format_byte_rate)}) "
+            f"write={format_byte_rate(self.write.achieved)} "
+            f"(limit {_format_limit(self.write.configured, format_byte_rate)}) "
+            f"files={_format_file_rate(self.files.achieved)} "
+            f"(limit {_format_limit(self.files.configured, _format_file_rate)})"
+        )
+
+
+@dataclass(frozen=True)
+class ResourceReport:
+    """Achieved versus configured rates of a run.
+
+    input, write and files cover the whole run, with the limits in effect
+    at its end; periods has one entry per limit change.
+    """
+
+    seconds: float
+    input: RateReport
+    write: RateReport
+    files: RateReport
+    waited_seconds: float
+    periods: tuple[LimitPeriod, ...] = ()
+
+    def describe(self) -> str:
+        waited = f"waited={self.waited_seconds:.1f}s"
+        if len(self.periods) <= 1:
+            whole = LimitPeriod(0.0, self.seconds, self.input, self.write, self.files)
+            return f"{whole.describe()} {waited}"
+        spans = "; ".join(
+            f"{period.started:.1f}-{period.started + period.seconds:.1f}s {period.describe()}"
+            for period in self.periods
+        )
+        return (
+            f"input={format_byte_rate(self.input.achieved)} "
+            f"write={format_byte_rate(self.write.achieved)} "
+            f"files={_format_file_rate(self.files.achieved)} {waited} [{spans}]"
+        )
+
+
+class TokenBucket:
+    """Allow rate units per second, in bursts of up to one second of budget.
+
+    A rate of None (or not above zero) is unlimited.
+    """
+
+    def __init__(self, rate: float | None = None) -> None:
+        self._condition = threading.Condition()
+        self._rate = _positive(rate)
+        self._tokens = self._burst()
+        self._updated = time.monotonic()
+
+    @property
+    def rate(self) -> float | None:
+        return self._rate
+
+    def set_rate(self, rate: float | None) -> None:
+        with self._condition:
+            self._refill()
+            was_unlimited = self._rate is None
+            self._rate = _positive(rate)
+            burst = self._burst()
+            self._tokens = burst if was_unlimited else min(self._tokens, burst)
+            self._condition.notify_all()
+
+    def take(self, amount: float) -> float:
+        """Wait until amount may be used; returns the seconds waited."""
+        started = time.monotonic()
+        with self._condition:
+            while self._rate is not None:
+                self._refill()
+                needed = min(amount, self._burst())
+                if self._tokens >= needed:
+                    self._tokens -= amount
+                    break
+                self._condition.wait((needed - self._tokens) / self._rate)
+        return time.monotonic() - started
+
+    def _burst(self) -> float:
+        return 0.0 if self._rate is None else max(self._rate, 1.0)
+
+    def _refill(self) -> None:
+        now = time.monotonic()
+        if self._rate is not None:
+            self._tokens = min(self._burst(), self._tokens + (now - self._updated) * self._rate)
+        self._updated = now
+
+
+class ResourceGovernor:
+    """Meter and throttle the reads, writes and file starts of one run."""
+
+    def __init__(self, limits: ResourceLimits | None = None) -> None:
+        self._limits = limits or ResourceLimits()
+        self._read = TokenBucket(self._limits.read_bytes_per_second)
+        self._write = TokenBucket(self._limits.write_bytes_per_second)
+        self._files = TokenBucket(self._limits.files_per_second)
+        self._lock = threading.Lock()
+        self._amounts = {"read": 0, "write": 0, "files": 0}
+        self._waited = 0.0
+        self._started = time.monotonic()
+        # (start, limits, amounts at start) for each set of limits applied.
+        self._periods: list[tuple[float, ResourceLimits, dict[str, int]]] = [
+            (self._started, self._limits, dict(self._amounts))
+        ]
+        self.revision = 0
+
+    @property
+    def limits(self) -> ResourceLimits:
+        return self._limits
+
+    @property
+    def read_limited(self) -> bool:
+        return self._read.rate is not None
+
+    def update(self, limits: ResourceLimits) -> None:
+        """Apply new limits, including to callers already waiting."""
+        with self._lock:
+            self._limits = limits
+            self._periods.append((time.monotonic(), limits, dict(self._amounts)))
+            self.revision += 1
+        self._read.set_rate(limits.read_bytes_per_second)
+        self._write.set_rate(limits.write_bytes_per_second)
+        self._files.set_rate(limits.files_per_second)
+
+    def file(self) -> None:
+        """Account for one file about to be converted."""
+        self._account("files", self._files, 1)
+
+    def read(self, size: int) -> None:
+        self._account("read", self._read, size)
+
+    def write(self, size: int) -> None:
+        self._account("write", self._write, size)
+
+    def read_file(self, path: Path) -> bytes:
+        """Read a whole file in chunks paced by the read budget."""
+        chunks: list[bytes] = []
+        with path.open("rb") as handle:
+            while True:
+                chunk = handle.read(_READ_CHUNK_SIZE)
+                if not chunk:
+                    break
+                self.read(len(chunk))
+                chunks.append(chunk)
+        return b"".join(chunks)
+
+    def report(self) -> ResourceReport:
+        now = time.monotonic()
+        with self._lock:
+            amounts = dict(self._amounts)
+            waited = self._waited
+            periods = list(self._periods)
+        ends = [start for start, _limits, _amounts in periods[1:]] + [now]
+        next_amounts = [counted for _start, _limits, counted in periods[1:]] + [amounts]
+        reports = [
+            _period(start - self._started, end - start, limits, counted, ending)
+            for (start, limits, counted), end, ending in zip(periods, ends, next_amounts)
+        ]
+        whole = _period(0.0, now - self._started, periods[-1][1], {}, amounts)
+        return ResourceReport(
+            seconds=whole.seconds,
+            input=whole.input,
+            write=whole.write,
+            files=whole.files,
+            waited_seconds=waited,
+            periods=tuple(reports),
+        )
+
+    def _account(self, name: str, bucket: TokenBucket, amount: int) -> None:
+        waited = bucket.take(amount)
+        with self._lock:
+            self._amounts[name] += amount
+            self._waited += waited
+
+
+def _period(
+    started: float,
+    seconds: float,
+    limits: ResourceLimits,
+    start_amounts: dict[str, int],
+    end_amounts: dict[str, int],
+) -> LimitPeriod:
+    seconds = max(seconds, 1e-9)
+
+    def rate(name: str, configured: float | None) -> RateReport:
+        amount = end_amounts[name] - start_amounts.get(name, 0)
+        return RateReport(amount, amount / seconds, configured)
+
+    return LimitPeriod(
+        started=started,
+        seconds=seconds,
+        input=rate("read", limits.read_bytes_per_second),
+        write=rate("write", limits.write_bytes_per_second),
+        files=rate("files", limits.files_per_second),
+    )
+
+
+def lower_thread_priority(increment: int) -> bool:
+    """Raise the niceness of the calling thread; False when unsupported.
+
+    On Linux niceness is per thread and inherited by threads started
+    afterwards; on other POSIX systems the whole process is lowered.
+    """
+    if sys.platform.startswith("linux"):
+        thread_id = threading.get_native_id()
+        current = os.getpriority(os.PRIO_PROCESS, thread_id)
+        os.setpriority(os.PRIO_PROCESS, thread_id, min(19, current + increment))
+        return True
+    if hasattr(os, "nice"):
+        os.nice(increment)
+        return True
+    return False
+
+
+def parse_byte_rate(text: str) -> float | None:
+    """Parse ``20M``, ``512k``, ``1.5GB/s`` or a plain byte count; ``0``/``off`` is unlimited."""
+    if text.strip().lower() in {"", "0", "off", "none", "unlimited"}:
+        return None
+    match = _RATE_PATTERN.match(text)
+    if match is None:
+        raise ValueError(f"Invalid rate: {text}")
+    return float(match.group(1)) * _RATE_UNITS[match.group(2).lower()]
+
+
+def format_byte_rate(value: float) -> str:
+    return f"{value / (1024 * 1024):.1f}MB/s"
+
+
+def _format_file_rate(value: float) -> str:
+    return f"{value:.1f}/s"
+
+
+def _format_limit(value: float | None, formatter: Callable[[float], str]) -> str:
+    return "none" if value is None else formatter(value)
+
+
+def _positive(rate: float | None) -> float | None:
+    return rate if rate is not None and rate > 0 else None
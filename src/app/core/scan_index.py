@@ -0,0 +1,199 @@
+"""Persistent directory-level index for incremental input scans."""
+
+from __future__ import annotations
+
+import hashlib
+import json
+import os
+import sys
+from dataclasses import dataclass
+from pathlib import Path
+
+from app.config import CACHE_DIR_NAME, SCAN_INDEX_DIR_NAME
+
+from .path_utils import ARCHIVE_EXTENSIONS, SUPPORTED_EXTENSIONS
+
+SCAN_INDEX_VERSION = 2
+
+# Directories modified this close to the start of a scan may change again
+# without their mtime moving (coarse timestamps on FAT/SMB), so they are
+# never reused from the index.
+RACY_WINDOW_NS = 2_000_000_000
+
+
+@dataclass(frozen=True)
+class DirectoryListing:
+    """Cached listing of a single directory."""
+
+    mtime_ns: int
+    inode: int
+    subdirs: tuple[str, ...]
+    files: tuple[str, ...]
+    archives: tuple[str, ...] = ()
+
+    def matches(self, stat_result: os.stat_result) -> bool:
+        return self.mtime_ns == stat_result.st_mtime_ns and self.inode == stat_result.st_ino
+
+
+@dataclass(frozen=True)
+class ArchiveListing:
+    """Cached supported members of a single archive file."""
+
+    mtime_ns: int
+    size: int
+    members: tuple[str, ...]
+
+    def matches(self, stat_result: os.stat_result) -> bool:
+        return self.mtime_ns == stat_result.st_mtime_ns and self.size == stat_result.st_size
+
+
+class ScanIndex:
+    """Directory mtimes and supported-file entries from a previous scan.
+
+    Keys are directory (or archive) paths relative to the input root, using
+    '/' separators ('' for the root itself).
+    """
+
+    def __init__(
+        self,
+        root: Path,
+        entries: dict[str, DirectoryListing] | None = None,
+        archives: dict[str, ArchiveListing] | None = None,
+    ) -> None:
+        self.root = root
+        self._entries: dict[str, DirectoryListing] = dict(entries or {})
+        self._archives: dict[str, ArchiveListing] = dict(archives or {})
+        self.hits = 0
+        self.misses = 0
+
+    def __len__(self) -> int:
+        return len(self._entries)
+
+    @classmethod
+    def load(cls, index_path: Path, root: Path) -> "ScanIndex":
+        """Load an index, returning an empty one when missing or stale."""
+        try:
+            with index_path.open("r", encoding="utf-8") as handle:
+                data = json.load(handle)
+        except (OSError, ValueError):
+            return cls(root)
+
+        if not isinstance(data, dict) or data.get("header") != _index_header(root):
+            return cls(root)
+
+        entries: dict[str, DirectoryListing] = {}
+        archives: dict[str, ArchiveListing] = {}
+        try:
+            for relative_dir, raw in data.get("directories", {}).items():
+                entries[relative_dir] = DirectoryListing(
+                    mtime_ns=int(raw["mtime_ns"]),
+                    inode=int(raw["inode"]),
+                    subdirs=tuple(raw["subdirs"]),
+                    files=tuple(raw["files"]),
+                    archives=tuple(raw["archives"]),
+                )
+            for relative_path, raw in data.get("archives", {}).items():
+                archives[relative_path] = ArchiveListing(
+                    mtime_ns=int(raw["mtime_ns"]),
+                    size=int(raw["size"]),
+                    members=tuple(raw["members"]),
+                )
+        except (KeyError, TypeError, ValueError, AttributeError):
+            return cls(root)
+        return cls(root, entries, archives)
+
+    def lookup(
+        self,
+        relative_dir: str,
+        stat_result: os.stat_result,
+    ) -> DirectoryListing | None:
+        """Return the cached listing if the directory is unchanged."""
+        entry = self._entries.get(relative_dir)
+        if entry is not None and entry.matches(stat_result):
+            self.hits += 1
+            return entry
+        self.misses += 1
+        return None
+
+    def lookup_archive(
+        self,
+        relative_path: str,
+        stat_result: os.stat_result,
+    ) -> ArchiveListing | None:
+        """Return the cached member list if the archive file is unchanged."""
+        entry = self._archives.get(relative_path)
+        if entry is not None and entry.matches(stat_result):
+            return entry
+        return None
+
+    def replace(
+        self,
+        entries: dict[str, DirectoryListing],
+        scan_started_ns: int,
+        archives: dict[str, ArchiveListing] | None = None,
+    ) -> None:
+        """Replace contents with the listings observed by a completed scan."""
+        cutoff_ns = scan_started_ns - RACY_WINDOW_NS
+        self._entries = {
+            relative_dir: entry
+            for relative_dir, entry in entries.items()
+            if entry.mtime_ns < cutoff_ns
+        }
+        self._archives = {
+            relative_path: entry
+            for relative_path, entry in (archives or {}).items()
+            if entry.mtime_ns < cutoff_ns
+        }
+
+    def save(self, index_path: Path) -> None:
+        """Atomically write the index to index_path."""
+        payload = {
+            "header": _index_header(self.root),
+            "directories": {
+                relative_dir: {
+                    "mtime_ns": entry.mtime_ns,
+                    "inode": entry.inode,
+                    "subdirs": list(entry.subdirs),
+                    "files": list(entry.files),
+                    "archives": list(entry.archives),
+                }
+                for relative_dir, entry in self._entries.items()
+            },
+            "archives": {
+                relative_path: {
+                    "mtime_ns": entry.mtime_ns,
+                    "size": entry.size,
+                    "members": list(entry.members),
+                }
+                for relative_path, entry in self._archives.items()
+            },
+        }
+        index_path.parent.mkdir(parents=True, exist_ok=True)
+        temp_path = index_path.with_name(f"{index_path.name}.{os.getpid()}.tmp")
+        try:
+            with temp_path.open("w", encoding="utf-8") as handle:
+                json.dump(payload, handle, ensure_ascii=False, separators=(",", ":"))
+            os.replace(temp_path, index_path)
+        finally:
+            if temp_path.exists():
+                temp_path.unlink()
+
+
+def default_scan_index_path(input_root: Path) -> Path:
+    """Return the per-user cache location of the index for input_root."""
+    if sys.platform.startswith("win"):
+        base = os.environ.get("LOCALAPPDATA") or str(Path.home() / "AppData" / "Local")
+    else:
+        base = os.environ.get("XDG_CACHE_HOME") or str(Path.home() / ".cache")
+    digest = hashlib.sha1(str(input_root.resolve()).encode("utf-8")).hexdigest()
+    return Path(base) / CACHE_DIR_NAME / SCAN_INDEX_DIR_NAME / f"{digest}.json"
+
+
+def _index_header(root: Path) -> dict[str, object]:
+    # Any change to the scan rules must invalidate previously cached listings.
+    return {
+        "version": SCAN_INDEX_VERSION,
+        "root": str(root.resolve()),
+        "extensions": sorted(SUPPORTED_EXTENSIONS),
+        "archive_extensions": list(ARCHIVE_EXTENSIONS),
+    }
@@ -0,0 +1,350 @@
+"""Lease-based work queue kept in a SQLite journal on a shared filesystem.
+
+Several converter processes (on one or more hosts) cooperate on one input
+tree through this file; no external service is involved.
+
+- The first node to initialize the queue plans every output path inside a
+  single write transaction, so outputs never collide across nodes.
+- Jobs are leased for a limited time and leases are renewed while a node
+  is working on them, up to a time limit per job. Leases of dead or hung
+  nodes expire and are handed to other nodes.
+- The rollback journal is used instead of WAL, which needs shared memory
+  and does not work across hosts on network filesystems.
+"""
+
+from __future__ import annotations
+
+import json
+import socket
+import sqlite3
+import time
+from dataclasses import dataclass
+from pathlib import Path
+from typing import Iterable, Iterator
+
+from .output_planner import plan_output_file
+
+SCHEMA_VERSION = 1
+DEFAULT_LEASE_SECONDS = 300.0
+DEFAULT_MAX_ATTEMPTS = 3
+DEFAULT_MAX_JOB_SECONDS = 3600.0
+
+_SCHEMA = """
+CREATE TABLE IF NOT EXISTS meta (
+    key TEXT PRIMARY KEY,
+    value TEXT NOT NULL
+);
+CREATE TABLE IF NOT EXISTS jobs (
+    id INTEGER PRIMARY KEY,
+    source TEXT NOT NULL UNIQUE,
+    output TEXT NOT NULL UNIQUE,
+    state TEXT NOT NULL DEFAULT 'pending',
+    lease_owner TEXT,
+    lease_expires REAL,
+    attempts INTEGER NOT NULL DEFAULT 0,
+    node TEXT,
+    warnings TEXT,
+    error TEXT,
+    seconds REAL,
+    finished_at REAL
+);
+CREATE INDEX IF NOT EXISTS jobs_state ON jobs (state, lease_expires);
+CREATE TABLE IF NOT EXISTS nodes (
+    node_id TEXT PRIMARY KEY,
+    host TEXT NOT NULL,
+    joined_at REAL NOT NULL,
+    last_seen REAL NOT NULL
+);
+"""
+
+
+@dataclass(frozen=True)
+class Job:
+    """A leased unit of work (paths relative to the queue roots)."""
+
+    id: int
+    source: str
+    output: str
+    attempts: int
+
+
+@dataclass(frozen=True)
+class JobRecord:
+    """Final state of a job, used to build the merged log and summary."""
+
+    source: str
+    output: str
+    state: str
+    node: str | None
+    attempts: int
+    warnings: list[str]
+    error: str | None
+    seconds: float | None
+
+
+@dataclass(frozen=True)
+class QueueCounts:
+    pending: int
+    leased: int
+    done: int
+    failed: int
+
+    @property
+    def total(self) -> int:
+        return self.pending + self.leased + self.done + self.failed
+
+    @property
+    def finished(self) -> bool:
+        return self.pending == 0 and self.leased == 0
+
+
+class WorkQueue:
+    """Connection to a shared queue file for one node.
+
+    A connection must only be used from the thread that opened it; a lease
+    heartbeat thread opens its own WorkQueue with the same node_id.
+    """
+
+    def __init__(self, path: Path, node_id: str, busy_timeout: float = 60.0) -> None:
+        self.path = path
+        self.node_id = node_id
+        path.parent.mkdir(parents=True, exist_ok=True)
+        self._connection = sqlite3.connect(
+            str(path),
+            timeout=busy_timeout,
+            isolation_level=None,
+        )
+        self._connection.execute("PRAGMA journal_mode=DELETE")
+        self._connection.execute("PRAGMA synchronous=FULL")
+        with self._transaction():
+            for statement in _SCHEMA.split(";"):
+                if statement.strip():
+                    self._connection.execute(statement)
+            now = time.time()
+            self._connection.execute(
+                "INSERT INTO nodes (node_id, host, joined_at, last_seen) VALUES (?, ?, ?, ?) "
+                "ON CONFLICT(node_id) DO UPDATE SET last_seen = excluded.last_seen",
+                (node_id, socket.gethostname(), now, now),
+            )
+
+    def close(self) -> None:
+        self._connection.close()
+
+    def __enter__(self) -> "WorkQueue":
+        return self
+
+    def __exit__(self, *exc_info: object) -> None:
+        self.close()
+
+    def meta(self, key: str) -> str | None:
+        row = self._connection.execute("SELECT value FROM meta WHERE key = ?", (key,)).fetchone()
+        return None if row is None else str(row[0])
+
+    def is_initialized(self) -> bool:
+        return self.meta("schema_version") is not None
+
+    def initialize(self, input_root: Path, output_dir: Path, files: Iterable[Path]) -> bool:
+        """Enqueue files once. Returns False if another node already did.
+
+        Output paths are planned here, against both the files already on
+        disk and every path planned in this transaction.
+        """
+        with self._transaction():
+            if self.is_initialized():
+                return False
+            planned: set[Path] = set()
+
+            def taken(candidate: Path) -> bool:
+                return candidate in planned or candidate.exists()
+
+            rows = []
+            for path in files:
+                output_file = plan_output_file(path, input_root, output_dir, exists=taken)
+                planned.add(output_file)
+                rows.append(
+                    (
+                        path.relative_to(input_root).as_posix(),
+                        output_file.relative_to(output_dir).as_posix(),
+                    )
+                )
+            self._connection.executemany("INSERT INTO jobs (source, output) VALUES (?, ?)", rows)
+            self._connection.executemany(
+                "INSERT INTO meta (key, value) VALUES (?, ?)",
+                [
+                    ("schema_version", str(SCHEMA_VERSION)),
+                    ("input_root", str(input_root.resolve())),
+                    ("output_dir", str(output_dir.resolve())),
+                    ("initialized_by", self.node_id),
+                    ("initialized_at", str(time.time())),
+                ],
+            )
+        return True
+
+    def lease(
+        self,
+        count: int = 1,
+        lease_seconds: float = DEFAULT_LEASE_SECONDS,
+        max_attempts: int = DEFAULT_MAX_ATTEMPTS,
+    ) -> tuple[list[Job], int]:
+        """Lease up to count jobs. Returns (jobs, number of reclaimed leases).
+
+        Expired leases are reclaimed; a job whose lease has expired
+        max_attempts times is marked failed instead of being retried.
+        """
+        now = time.time()
+        with self._transaction():
+            self._connection.execute(
+                "UPDATE jobs SET state = 'failed', node = lease_owner, finished_at = ?, "
+                "error = 'lease expired ' || attempts || ' times (node crashed or hung)' "
+                "WHERE state = 'leased' AND lease_expires < ? AND attempts >= ?",
+                (now, now, max_attempts),
+            )
+            rows = self._connection.execute(
+                "SELECT id, source, output, attempts, state FROM jobs "
+                "WHERE state = 'pending' OR (state = 'leased' AND lease_expires < ?) "
+                "ORDER BY id LIMIT ?",
+                (now, count),
+            ).fetchall()
+            reclaimed = sum(1 for row in rows if row[4] == "leased")
+            self._connection.executemany(
+                "UPDATE jobs SET state = 'leased', lease_owner = ?, lease_expires = ?, "
+                "attempts = attempts + 1 WHERE id = ?",
+                [(self.node_id, now + lease_seconds, row[0]) for row in rows],
+            )
+            self._touch_node(now)
+        jobs = [Job(id=row[0], source=row[1], output=row[2], attempts=row[3] + 1) for row in rows]
+        return jobs, reclaimed
+
+    def renew(
+        self,
+        lease_seconds: float = DEFAULT_LEASE_SECONDS,
+        job_ids: Iterable[int] | None = None,
+    ) -> int:
+        """Extend leases held by this node. Returns the number renewed.
+
+        With job_ids, only those jobs are renewed; the others run out.
+        """
+        now = time.time()
+        expires = now + lease_seconds
+        with self._transaction():
+            if job_ids is None:
+                cursor = self._connection.execute(
+                    "UPDATE jobs SET lease_expires = ? WHERE state = 'leased' AND lease_owner = ?",
+                    (expires, self.node_id),
+                )
+                renewed = cursor.rowcount
+            else:
+                renewed = 0
+                for job_id in job_ids:
+                    cursor = self._connection.execute(
+                        "UPDATE jobs SET lease_expires = ? "
+                        "WHERE id = ? AND state = 'leased' AND lease_owner = ?",
+                        (expires, job_id, self.node_id),
+                    )
+                    renewed += cursor.rowcount
+            self._touch_node(now)
+        return renewed
+
+    def complete(self, job: Job, warnings: list[str], seconds: float) -> bool:
+        """Mark a job done. Returns False if the lease was lost meanwhile."""
+        return self._finish(job, "done", warnings, None, seconds)
+
+    def fail(self, job: Job, error: str, seconds: float) -> bool:
+        """Mark a job failed. Returns False if the lease was lost meanwhile."""
+        return self._finish(job, "failed", [], error, seconds)
+
+    def counts(self) -> QueueCounts:
+        values = dict(
+            self._connection.execute("SELECT state, COUNT(*) FROM jobs GROUP BY state").fetchall()
+        )
+        return QueueCounts(
+            pending=values.get("pending", 0),
+            leased=values.get("leased", 0),
+            done=values.get("done", 0),
+            failed=values.get("failed", 0),
+        )
+
+    def records(self) -> Iterator[JobRecord]:
+        cursor = self._connection.execute(
+            "SELECT source, output, state, node, attempts, warnings, error, seconds "
+            "FROM jobs ORDER BY source"
+        )
+        for source, output, state, node, attempts, warnings, error, seconds in cursor:
+            yield JobRecord(
+                source=source,
+                output=output,
+                state=state,
+                node=node,
+                attempts=attempts,
+                warnings=json.loads(warnings) if warnings else [],
+                error=error,
+                seconds=seconds,
+            )
+
+    def claim_finalization(self) -> bool:
+        """Return True for exactly one node once every job is finished."""
+        with self._transaction():
+            if not self.counts().finished or self.meta("finalized_by") is not None:
+                return False
+            self._connection.execute(
+                "INSERT INTO meta (key, value) VALUES ('finalized_by', ?)",
+                (self.node_id,),
+            )
+        return True
+
+    def _finish(
+        self,
+        job: Job,
+        state: str,
+        warnings: list[str],
+        error: str | None,
+        seconds: float,
+    ) -> bool:
+        now = time.time()
+        with self._transaction():
+            cursor = self._connection.execute(
+                "UPDATE jobs SET state = ?, node = ?, warnings = ?, error = ?, seconds = ?, "
+                "finished_at = ?, lease_owner = NULL, lease_expires = NULL "
+                "WHERE id = ? AND state = 'leased' AND lease_owner = ?",
+                (
+                    state,
+                    self.node_id,
+                    json.dumps(warnings, ensure_ascii=False),
+                    error,
+                    seconds,
+                    now,
+                    job.id,
+                    self.node_id,
+                ),
+            )
+            self._touch_node(now)
+        return cursor.rowcount == 1
+
+    def _touch_node(self, now: float) -> None:
+        self._connection.execute(
+            "UPDATE nodes SET last_seen = ? WHERE node_id = ?",
+            (now, self.node_id),
+        )
+
+    def _transaction(self) -> "_Transaction":
+        return _Transaction(self._connection)
+
+
+class _Transaction:
+    """BEGIN IMMEDIATE ... COMMIT, rolled back on error.
+
+    IMMEDIATE takes the write lock up front so that read-then-update
+    sequences (leasing, initialization) are atomic across processes.
+    """
+
+    def __init__(self, connection: sqlite3.Connection) -> None:
+        self._connection = connection
+
+    def __enter__(self) -> None:
+        self._connection.execute("BEGIN IMMEDIATE")
+
+    def __exit__(self, exc_type: object, *exc_info: object) -> None:
+        if exc_type is None:
+            self._connection.execute("COMMIT")
+        else:
+            self._connection.execute("ROLLBACK")
@@ -0,0 +1,177 @@
+"""Markdown rendering for the streaming Excel engines (.xls and .xlsx).
+
+Rows are rendered as they are read, one sheet after another, without
+building a DataFrame; each table is as wide as the widest row of its
+sheet, whatever the file declares. The table layout follows the
+MarkItDown output for .xlsx: a ``## Sheet`` heading, the first row as the
+header and ``Unnamed: N`` for blank header cells.
+
+Cell text does not: MarkItDown prints pandas column dtypes, which needs
+the whole column before the first row. Here each cell is formatted on
+its own: empty cells are blank instead of ``NaN``/``NaT``, whole numbers
+have no ``.0``, booleans are ``TRUE``/``FALSE`` instead of ``True`` or
+``1.0``, midnight datetimes are dates, and ``|`` is escaped.
+"""
+
+from __future__ import annotations
+
+import datetime as dt
+import io
+from array import array
+from dataclasses import dataclass
+from typing import Iterable, Iterator, Mapping, Protocol
+
+from .conversion_result import ConversionResult
+from .excel_cells import CellValue
+from .excel_formula_checker import MAX_MISSING_FORMULAS, missing_formula_warnings
+from .markdown_postprocessor import normalize_excel_markdown
+
+
+class StreamedSheet(Protocol):
+    """A worksheet read row by row; findings are complete after rows()."""
+
+    name: str
+    has_pictures: bool
+    missing_formulas: list[str]
+    missing_formula_count: int
+    dropped_cells: int
+
+    def rows(self) -> Iterator[tuple[int, Mapping[int, CellValue]]]: ...
+
+
+class StreamedWorkbook(Protocol):
+    @property
+    def sheet_names(self) -> list[str]: ...
+
+    def sheets(self) -> Iterable[StreamedSheet]: ...
+
+
+@dataclass(frozen=True)
+class WorkbookMarkdown:
+    """Markdown and findings of one workbook."""
+
+    markdown: str
+    sheet_names: list[str]
+    image_sheet_names: list[str]
+    formula_samples: list[str]
+    missing_formula_count: int
+    warnings: list[str]
+
+
+def render_workbook(workbook: StreamedWorkbook, max_formula_samples: int = 5) -> WorkbookMarkdown:
+    """Render every worksheet as a ``## Sheet`` heading and a table."""
+    output = io.StringIO()
+    image_sheet_names: list[str] = []
+    formula_samples: list[str] = []
+    missing_formula_count = 0
+    warnings: list[str] = []
+
+    sheet_names = workbook.sheet_names
+    for sheet in workbook.sheets():
+        if output.tell():
+            output.write("\n\n")
+        output.write(f"## {sheet.name}")
+        _write_table(output, sheet)
+        dropped = sheet.dropped_cells
+
+        if sheet.has_pictures:
+            image_sheet_names.append(sheet.name)
+        missing_formula_count += sheet.missing_formula_count
+        for coordinate in sheet.missing_formulas:
+            if len(formula_samples) < max_formula_samples:
+                formula_samples.append(f"{sheet.name}!{coordinate}")
+        if dropped:
+            warnings.append(f"{sheet.name}: 出力できなかったセルがあります（{dropped}件）。")
+
+    return WorkbookMarkdown(
+        markdown=output.getvalue(),
+        sheet_names=sheet_names,
+        image_sheet_names=image_sheet_names,
+        formula_samples=formula_samples,
+        missing_formula_count=missing_formula_count,
+        warnings=warnings,
+    )
+
+
+def workbook_result(rendered: WorkbookMarkdown) -> ConversionResult:
+    """Apply the Excel post-processing and formula warnings."""
+    post_result = normalize_excel_markdown(
+        rendered.markdown,
+        rendered.sheet_names,
+        rendered.image_sheet_names,
+    )
+    warnings = [*rendered.warnings, *post_result.warnings]
+    if rendered.missing_formula_count > 0:
+        truncated = rendered.missing_formula_count >= MAX_MISSING_FORMULAS
+        warnings.extend(missing_formula_warnings(rendered.formula_samples, truncated))
+    return ConversionResult(markdown=post_result.markdown, warnings=warnings)
+
+
+def _write_table(output: io.StringIO, sheet: StreamedSheet) -> None:
+    """Write the sheet's rows as a Markdown table as wide as its widest row.
+
+    The width is only known once every row has been read, so body rows are
+    buffered without their trailing empty cells and padded when the table
+    is written out.
+    """
+    header: list[str] = []
+    body = io.StringIO()
+    # Cells written per body row; 0 marks a blank row.
+    counts = array("L")
+    width = 0
+
+    for row_index, cells in sheet.rows():
+        values = [_format_cell(cells.get(col)) for col in range(max(cells) + 1)]
+        width = max(width, len(values))
+        if row_index == 0:
+            header = values
+            continue
+        counts.extend([0] * (row_index - len(counts) - 1))
+        counts.append(len(values))
+        body.write("| " + " | ".join(values) + "\n")
+
+    if not width:
+        return
+    output.write("\n" + _table_row(_header_names(header, width)))
+    output.write("\n" + _table_row(["---"] * width))
+    blank_row = _table_row([""] * width)
+    body.seek(0)
+    for count in counts:
+        if not count:
+            output.write("\n" + blank_row)
+            continue
+        output.write("\n" + body.readline()[:-1] + " | " * (width - count) + " |")
+
+
+def _header_names(header: list[str], width: int) -> list[str]:
+    names: list[str] = []
+    seen: dict[str, int] = {}
+    for col in range(width):
+        name = (header[col] if col < len(header) else "") or f"Unnamed: {col}"
+        count = seen.get(name, 0)
+        seen[name] = count + 1
+        names.append(f"{name}.{count}" if count else name)
+    return names
+
+
+def _table_row(values: list[str]) -> str:
+    return "| " + " | ".join(values) + " |"
+
+
+def _format_cell(value: CellValue | None) -> str:
+    if value is None:
+        return ""
+    if isinstance(value, bool):
+        return "TRUE" if value else "FALSE"
+    if isinstance(value, float):
+        if value.is_integer() and abs(value) < 1e15:
+            return str(int(value))
+        return repr(value)
+    if isinstance(value, dt.datetime):
+        if value.time() == dt.time(0):
+            return value.date().isoformat()
+        return value.isoformat(sep=" ")
+    if isinstance(value, dt.time):
+        return value.isoformat()
+    text = value.replace("\r\n", "\n").replace("\r", "\n")
+    return text.replace("|", "\\|").replace("\n", "<br>")
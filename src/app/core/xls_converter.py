@@ -0,0 +1,27 @@
+"""Markdown conversion for legacy .xls workbooks.
+
+Rows come from the streaming BIFF reader and are rendered by
+workbook_markdown as they are read.
+"""
+
+from __future__ import annotations
+
+from pathlib import Path
+
+from .conversion_result import ConversionResult
+from .workbook_markdown import WorkbookMarkdown, render_workbook, workbook_result
+from .xls_reader import XlsWorkbook
+
+
+def convert(input_path: Path, data: bytes | None = None) -> ConversionResult:
+    """Engine entry point: convert_xls plus the shared Excel post-processing."""
+    return workbook_result(convert_xls(input_path, data))
+
+
+def convert_xls(path: Path, data: bytes | None = None, max_formula_samples: int = 5) -> WorkbookMarkdown:
+    """Convert a .xls workbook to Markdown, one table per worksheet.
+
+    Raises XlsFormatError for workbooks the streaming reader cannot handle.
+    """
+    with XlsWorkbook(path if data is None else data, max_formula_samples) as workbook:
+        return render_workbook(workbook, max_formula_samples)
@@ -0,0 +1,644 @@
+"""Streaming reader for legacy Excel (.xls, BIFF8) workbooks.
+
+The workbook stream is read sector by sector from the OLE2 container and
+parsed record by record. Only workbook-level tables (shared strings,
+number formats, sheet list) are kept in memory; cells are handed out one
+row at a time, so memory stays flat however large a sheet is.
+
+BIFF5 and older workbooks and encrypted workbooks raise XlsFormatError so
+that the caller can fall back to another converter.
+"""
+
+from __future__ import annotations
+
+import io
+import struct
+import sys
+from array import array
+from dataclasses import dataclass, field
+from pathlib import Path
+from typing import BinaryIO, Iterator
+
+from .excel_cells import CellValue, column_letter, excel_datetime, is_date_format
+
+
+_OLE_SIGNATURE = b"\xd0\xcf\x11\xe0\xa1\xb1\x1a\xe1"
+_MAX_REGULAR_SECTOR = 0xFFFFFFFA
+_FREE_SECTOR = 0xFFFFFFFF
+_RUN_SECTORS = 256
+
+_BOF = 0x0809
+_EOF = 0x000A
+_FILEPASS = 0x002F
+_DATEMODE = 0x0022
+_FORMAT = 0x041E
+_XF = 0x00E0
+_BOUNDSHEET = 0x0085
+_SST = 0x00FC
+_CONTINUE = 0x003C
+_LABELSST = 0x00FD
+_LABEL = 0x0204
+_RSTRING = 0x00D6
+_NUMBER = 0x0203
+_RK = 0x027E
+_MULRK = 0x00BD
+_BOOLERR = 0x0205
+_FORMULA = 0x0006
+_STRING = 0x0207
+_SHRFMLA = 0x04BC
+_ARRAY = 0x0221
+_TABLE = 0x0236
+_OBJ = 0x005D
+_IMDATA = 0x007F
+
+_BIFF8 = 0x0600
+_SUBSTREAM_GLOBALS = 0x0005
+_SUBSTREAM_WORKSHEET = 0x0010
+_SHEET_TYPE_WORKSHEET = 0x00
+_OBJECT_PICTURE = 0x08
+_FT_CMO = 0x15
+
+_ERROR_CODES = {
+    0x00: "#NULL!",
+    0x07: "#DIV/0!",
+    0x0F: "#VALUE!",
+    0x17: "#REF!",
+    0x1D: "#NAME?",
+    0x24: "#NUM!",
+    0x2A: "#N/A",
+}
+
+
+class XlsFormatError(ValueError):
+    """The file is not a BIFF8 workbook this reader can stream."""
+
+
+@dataclass(frozen=True)
+class SheetInfo:
+    """A worksheet listed in the workbook globals."""
+
+    name: str
+    offset: int
+
+
+@dataclass
+class XlsSheet:
+    """Cells of one worksheet, read row by row.
+
+    The findings are complete once rows() is exhausted.
+    """
+
+    name: str
+    has_pictures: bool = False
+    missing_formulas: list[str] = field(default_factory=list)
+    missing_formula_count: int = 0
+    dropped_cells: int = 0
+    _rows: Iterator[tuple[int, dict[int, CellValue]]] | None = field(default=None, repr=False)
+
+    def rows(self) -> Iterator[tuple[int, dict[int, CellValue]]]:
+        """Yield (row index, {column index: value}) in ascending row order."""
+        if self._rows is not None:
+            yield from self._rows
+
+
+class XlsWorkbook:
+    """Open a .xls workbook for a single sequential pass over its sheets.
+
+    Sheets must be consumed in order: iterate sheets() and exhaust each
+    sheet's rows() before moving to the next one.
+    """
+
+    def __init__(
+        self,
+        source: Path | bytes,
+        max_formula_samples: int = 5,
+    ) -> None:
+        self._handle: BinaryIO = (
+            io.BytesIO(source) if isinstance(source, bytes) else open(source, "rb")
+        )
+        self._max_formula_samples = max_formula_samples
+        try:
+            self._records = _iter_records(_open_workbook_stream(self._handle))
+            self._read_globals()
+        except Exception:
+            self.close()
+            raise
+
+    def close(self) -> None:
+        self._handle.close()
+
+    def __enter__(self) -> "XlsWorkbook":
+        return self
+
+    def __exit__(self, *exc_info: object) -> None:
+        self.close()
+
+    @property
+    def sheet_names(self) -> list[str]:
+        return [sheet.name for sheet in self._sheets]
+
+    def sheets(self) -> Iterator[XlsSheet]:
+        pending = list(self._sheets)
+        by_offset = {sheet.offset: sheet for sheet in pending}
+        for offset, record_type, payload in self._records:
+            if record_type != _BOF:
+                continue
+            substream = _u16(payload, 2) if len(payload) >= 4 else 0
+            info = by_offset.get(offset)
+            if substream != _SUBSTREAM_WORKSHEET or (info is None and not pending):
+                _skip_substream(self._records)
+                continue
+            if info is None or info not in pending:
+                info = pending[0]
+            pending.remove(info)
+            sheet = XlsSheet(name=info.name)
+            sheet._rows = self._sheet_rows(sheet)
+            yield sheet
+            for _ in sheet._rows:
+                pass
+
+    def _read_globals(self) -> None:
+        _offset, record_type, payload = next(self._records, (0, -1, b""))
+        if record_type != _BOF or _u16(payload, 0) != _BIFF8:
+            raise XlsFormatError("BIFF8 (Excel 97以降) 形式ではありません。")
+        if _u16(payload, 2) != _SUBSTREAM_GLOBALS:
+            raise XlsFormatError("ブックのグローバル情報が見つかりません。")
+
+        self._sheets: list[SheetInfo] = []
+        self._strings: list[str] = []
+        self._formats: dict[int, str] = {}
+        self._xf_formats = array("H")
+        self._datemode = 0
+        sst_segments: list[bytes] = []
+        in_sst = False
+
+        for _offset, record_type, payload in self._records:
+            if in_sst and record_type == _CONTINUE:
+                sst_segments.append(payload)
+                continue
+            in_sst = False
+            if record_type == _EOF:
+                break
+            if record_type == _FILEPASS:
+                raise XlsFormatError("暗号化されたブックは読み込めません。")
+            if record_type == _DATEMODE:
+                self._datemode = _u16(payload, 0)
+            elif record_type == _FORMAT:
+                text, _ = _unicode_string(payload, 2, 2)
+                self._formats[_u16(payload, 0)] = text
+            elif record_type == _XF:
+                self._xf_formats.append(_u16(payload, 2))
+            elif record_type == _BOUNDSHEET:
+                if payload[5] == _SHEET_TYPE_WORKSHEET:
+                    name, _ = _unicode_string(payload, 6, 1)
+                    self._sheets.append(SheetInfo(name=name, offset=_u32(payload, 0)))
+            elif record_type == _SST:
+                sst_segments = [payload]
+                in_sst = True
+
+        if sst_segments:
+            self._strings = _parse_sst(sst_segments)
+        self._date_xfs = frozenset(
+            index
+            for index, format_id in enumerate(self._xf_formats)
+            if is_date_format(format_id, self._formats.get(format_id))
+        )
+
+    def _sheet_rows(self, sheet: XlsSheet) -> Iterator[tuple[int, dict[int, CellValue]]]:
+        current_row = -1
+        cells: dict[int, CellValue] = {}
+        pending_formula: tuple[int, int] | None = None
+        last_flushed = -1
+
+        for _offset, record_type, payload in self._records:
+            if pending_formula is not None and record_type not in _FORMULA_TRAILERS:
+                # A string result is always stored in the STRING record that
+                # follows; without one the formula has no cached value.
+                self._record_missing_formula(sheet, *pending_formula)
+                pending_formula = None
+            if record_type == _EOF:
+                break
+            if record_type == _BOF:
+                # Embedded chart or other nested substream.
+                _skip_substream(self._records)
+                continue
+            if record_type == _OBJ:
+                if _is_picture_object(payload):
+                    sheet.has_pictures = True
+                continue
+            if record_type == _IMDATA:
+                # Bitmap embedded the pre-Office-Art way (e.g. by xlwt).
+                sheet.has_pictures = True
+                continue
+
+            placed: list[tuple[int, int, CellValue]] = []
+            if record_type == _STRING and pending_formula is not None:
+                text, _ = _unicode_string(payload, 0, 2)
+                placed.append((*pending_formula, text))
+                pending_formula = None
+            elif record_type == _LABELSST:
+                index = _u32(payload, 6)
+                text = self._strings[index] if index < len(self._strings) else ""
+                placed.append((_u16(payload, 0), _u16(payload, 2), text))
+            elif record_type in (_LABEL, _RSTRING):
+                text, _ = _unicode_string(payload, 6, 2)
+                placed.append((_u16(payload, 0), _u16(payload, 2), text))
+            elif record_type == _NUMBER:
+                value = struct.unpack_from("<d", payload, 6)[0]
+                placed.append((*_row_col(payload), self._number(_u16(payload, 4), value)))
+            elif record_type == _RK:
+                value = _decode_rk(_u32(payload, 6))
+                placed.append((*_row_col(payload), self._number(_u16(payload, 4), value)))
+            elif record_type == _MULRK:
+                row, first_col = _row_col(payload)
+                for index in range((len(payload) - 6) // 6):
+                    base = 4 + index * 6
+                    value = _decode_rk(_u32(payload, base + 2))
+                    placed.append(
+                        (row, first_col + index, self._number(_u16(payload, base), value))
+                    )
+            elif record_type == _BOOLERR:
+                placed.append((*_row_col(payload), _bool_or_error(payload[6], payload[7])))
+            elif record_type == _FORMULA:
+                row, col = _row_col(payload)
+                result = self._formula_result(payload)
+                if result is _STRING_FOLLOWS:
+                    pending_formula = (row, col)
+                else:
+                    placed.append((row, col, result))
+
+            for row, col, value in placed:
+                if row < current_row or row <= last_flushed:
+                    # Cells are stored in row order; a late cell cannot be
+                    # placed any more once its row has been emitted.
+                    sheet.dropped_cells += 1
+                    continue
+                if row != current_row:
+                    if cells:
+                        yield current_row, cells
+                        last_flushed = current_row
+                    current_row = row
+                    cells = {}
+                cells[col] = value
+
+        if cells:
+            yield current_row, cells
+
+    def _number(self, xf_index: int, value: float) -> CellValue:
+        if xf_index not in self._date_xfs:
+            return value
+        return excel_datetime(value, self._datemode)
+
+    def _formula_result(self, payload: bytes) -> CellValue | object:
+        if payload[12:14] != b"\xff\xff":
+            return self._number(_u16(payload, 4), struct.unpack_from("<d", payload, 6)[0])
+        kind = payload[6]
+        if kind == 0:
+            return _STRING_FOLLOWS
+        if kind in (1, 2):
+            return _bool_or_error(payload[8], kind - 1)
+        # kind 3: the cached result is an empty string.
+        return ""
+
+    def _record_missing_formula(self, sheet: XlsSheet, row: int, col: int) -> None:
+        sheet.missing_formula_count += 1
+        if len(sheet.missing_formulas) < self._max_formula_samples:
+            sheet.missing_formulas.append(f"{column_letter(col)}{row + 1}")
+
+
+_STRING_FOLLOWS = object()
+# Records that may sit between a FORMULA and the STRING holding its result.
+_FORMULA_TRAILERS = frozenset({_STRING, _SHRFMLA, _ARRAY, _TABLE})
+
+
+class _CompoundFile:
+    """Minimal OLE2 (Compound File Binary) reader for one stream."""
+
+    def __init__(self, handle: BinaryIO) -> None:
+        self._handle = handle
+        handle.seek(0)
+        header = handle.read(512)
+        if len(header) < 512 or header[:8] != _OLE_SIGNATURE:
+            raise XlsFormatError("OLE2形式のファイルではありません。")
+        self._shift = _u16(header, 0x1E)
+        self._mini_shift = _u16(header, 0x20)
+        if self._shift not in (9, 12) or self._mini_shift != 6:
+            raise XlsFormatError("OLE2ヘッダーが不正です。")
+        fat_count = _u32(header, 0x2C)
+        first_directory = _u32(header, 0x30)
+        self._mini_cutoff = _u32(header, 0x38)
+        self._first_mini_fat = _u32(header, 0x3C)
+        difat_sector = _u32(header, 0x44)
+        difat_count = _u32(header, 0x48)
+
+        difat = list(struct.unpack_from("<109I", header, 0x4C))
+        per_sector = (1 << self._shift) // 4
+        for _ in range(difat_count):
+            if difat_sector > _MAX_REGULAR_SECTOR:
+                break
+            entries = struct.unpack(f"<{per_sector}I", self._read_sector(difat_sector))
+            difat.extend(entries[:-1])
+            difat_sector = entries[-1]
+
+        self._fat = array("I")
+        for sector in difat[:fat_count]:
+            if sector <= _MAX_REGULAR_SECTOR:
+                self._fat.frombytes(self._read_sector(sector))
+        if sys.byteorder == "big":
+            self._fat.byteswap()
+
+        self._entries = self._read_directory(first_directory)
+
+    def open_stream(self, *names: str) -> "_ChainReader | _BytesReader":
+        for name in names:
+            entry = self._entries.get(name.lower())
+            if entry is None:
+                continue
+            start, size = entry
+            if size < self._mini_cutoff:
+                return _BytesReader(self._read_mini_stream(start, size))
+            return _ChainReader(self._handle, self._fat, start, size, self._shift)
+        raise XlsFormatError("Workbookストリームが見つかりません。")
+
+    def _read_sector(self, sector: int) -> bytes:
+        self._handle.seek((sector + 1) << self._shift)
+        data = self._handle.read(1 << self._shift)
+        if len(data) < (1 << self._shift):
+            raise XlsFormatError("OLE2ファイルが途中で切れています。")
+        return data
+
+    def _read_directory(self, first_sector: int) -> dict[str, tuple[int, int]]:
+        entries: dict[str, tuple[int, int]] = {}
+        reader = _ChainReader(self._handle, self._fat, first_sector, None, self._shift)
+        self._root: tuple[int, int] | None = None
+        while True:
+            entry = reader.read(128)
+            if len(entry) < 128:
+                break
+            name_length = _u16(entry, 0x40)
+            kind = entry[0x42]
+            start = _u32(entry, 0x74)
+            size = struct.unpack_from("<Q", entry, 0x78)[0]
+            if self._shift == 9:
+                size &= 0xFFFFFFFF
+            name = entry[: max(0, name_length - 2)].decode("utf-16-le", "replace")
+            if kind == 5:
+                self._root = (start, size)
+            elif kind == 2:
+                entries.setdefault(name.lower(), (start, size))
+        return entries
+
+    def _read_mini_stream(self, start: int, size: int) -> bytes:
+        if self._root is None:
+            raise XlsFormatError("OLE2ルートエントリが見つかりません。")
+        mini_fat = array("I")
+        reader = _ChainReader(self._handle, self._fat, self._first_mini_fat, None, self._shift)
+        while True:
+            chunk = reader.read(1 << self._shift)
+            if not chunk:
+                break
+            mini_fat.frombytes(chunk[: len(chunk) // 4 * 4])
+        if sys.byteorder == "big":
+            mini_fat.byteswap()
+        container = _ChainReader(
+            self._handle, self._fat, self._root[0], self._root[1], self._shift
+        ).read(self._root[1])
+
+        parts: list[bytes] = []
+        sector = start
+        mini_size = 1 << self._mini_shift
+        remaining = size
+        while remaining > 0:
+            if sector > _MAX_REGULAR_SECTOR or sector >= len(mini_fat) or len(parts) > len(mini_fat):
+                raise XlsFormatError("OLE2ミニストリームが不正です。")
+            chunk = container[sector * mini_size : (sector + 1) * mini_size][:remaining]
+            parts.append(chunk)
+            remaining -= len(chunk)
+            sector = mini_fat[sector]
+        return b"".join(parts)
+
+
+class _ChainReader:
+    """Sequential reader over a FAT sector chain, reading contiguous runs."""
+
+    def __init__(
+        self,
+        handle: BinaryIO,
+        fat: array,
+        start: int,
+        size: int | None,
+        shift: int,
+    ) -> None:
+        self._handle = handle
+        self._fat = fat
+        self._next = start
+        self._remaining = size
+        self._shift = shift
+        self._buffer = b""
+        self._position = 0
+        self._visited = 0
+        self.offset = 0
+
+    def read(self, count: int) -> bytes:
+        while len(self._buffer) - self._position < count and self._fill():
+            pass
+        chunk = self._buffer[self._position : self._position + count]
+        self._position += len(chunk)
+        self.offset += len(chunk)
+        return chunk
+
+    def _fill(self) -> bool:
+        if self._remaining == 0 or self._next > _MAX_REGULAR_SECTOR:
+            if self._remaining:
+                raise XlsFormatError("OLE2ストリームが途中で切れています。")
+            return False
+        first = self._next
+        length = 0
+        sector = first
+        while sector == first + length and length < _RUN_SECTORS:
+            if sector >= len(self._fat) or self._visited >= len(self._fat):
+                raise XlsFormatError("OLE2セクタチェーンが不正です。")
+            self._visited += 1
+            length += 1
+            sector = self._fat[sector]
+            if sector == _FREE_SECTOR:
+                raise XlsFormatError("OLE2セクタチェーンが不正です。")
+        self._next = sector
+
+        self._handle.seek((first + 1) << self._shift)
+        data = self._handle.read(length << self._shift)
+        if self._remaining is not None:
+            data = data[: self._remaining]
+            self._remaining -= len(data)
+        if not data:
+            raise XlsFormatError("OLE2ファイルが途中で切れています。")
+        self._buffer = self._buffer[self._position :] + data
+        self._position = 0
+        return True
+
+
+class _BytesReader:
+    """In-memory stream with the same interface as _ChainReader."""
+
+    def __init__(self, data: bytes) -> None:
+        self._data = data
+        self.offset = 0
+
+    def read(self, count: int) -> bytes:
+        chunk = self._data[self.offset : self.offset + count]
+        self.offset += len(chunk)
+        return chunk
+
+
+def _open_workbook_stream(handle: BinaryIO) -> _ChainReader | _BytesReader:
+    compound = _CompoundFile(handle)
+    try:
+        return compound.open_stream("Workbook")
+    except XlsFormatError:
+        compound.open_stream("Book")
+        raise XlsFormatError("BIFF5以前 (Excel 95以前) の形式には対応していません。") from None
+
+
+def _iter_records(stream: _ChainReader | _BytesReader) -> Iterator[tuple[int, int, bytes]]:
+    """Yield (stream offset, record type, payload) for each BIFF record."""
+    while True:
+        offset = stream.offset
+        header = stream.read(4)
+        if len(header) < 4:
+            return
+        record_type, length = struct.unpack("<HH", header)
+        payload = stream.read(length)
+        if len(payload) < length:
+            raise XlsFormatError("BIFFレコードが途中で切れています。")
+        yield offset, record_type, payload
+
+
+def _skip_substream(records: Iterator[tuple[int, int, bytes]]) -> None:
+    depth = 1
+    for _offset, record_type, _payload in records:
+        if record_type == _BOF:
+            depth += 1
+        elif record_type == _EOF:
+            depth -= 1
+            if depth == 0:
+                return
+
+
+def _parse_sst(segments: list[bytes]) -> list[str]:
+    """Decode the shared string table spread over SST and CONTINUE records."""
+    strings: list[str] = []
+    unique = _u32(segments[0], 4)
+    segment = 0
+    data = segments[0]
+    position = 8
+
+    for _ in range(unique):
+        if position >= len(data):
+            segment += 1
+            if segment >= len(segments):
+                break
+            data = segments[segment]
+            position = 0
+        remaining = _u16(data, position)
+        flags = data[position + 2]
+        position += 3
+        extra = 0
+        if flags & 0x08:
+            extra += 4 * _u16(data, position)
+            position += 2
+        if flags & 0x04:
+            extra += _u32(data, position)
+            position += 4
+
+        parts: list[str] = []
+        wide = flags & 0x01
+        while True:
+            width = 2 if wide else 1
+            take = min(remaining, (len(data) - position) // width)
+            raw = data[position : position + take * width]
+            parts.append(raw.decode("utf-16-le" if wide else "latin-1", "replace"))
+            position += take * width
+            remaining -= take
+            if remaining == 0:
+                break
+            # Character data continues in the next record, which starts with
+            # its own option byte.
+            segment += 1
+            if segment >= len(segments):
+                raise XlsFormatError("共有文字列テーブルが途中で切れています。")
+            data = segments[segment]
+            wide = data[0] & 0x01
+            position = 1
+
+        while extra:
+            available = len(data) - position
+            if extra <= available:
+                position += extra
+                break
+            extra -= available
+            segment += 1
+            if segment >= len(segments):
+                break
+            data = segments[segment]
+            position = 0
+        strings.append("".join(parts))
+    return strings
+
+
+def _unicode_string(data: bytes, position: int, length_size: int) -> tuple[str, int]:
+    """Decode an XLUnicodeString; returns (text, position after it)."""
+    if length_size == 1:
+        length = data[position]
+    else:
+        length = _u16(data, position)
+    position += length_size
+    flags = data[position]
+    position += 1
+    extra = 0
+    if flags & 0x08:
+        extra += 4 * _u16(data, position)
+        position += 2
+    if flags & 0x04:
+        extra += _u32(data, position)
+        position += 4
+    if flags & 0x01:
+        text = data[position : position + length * 2].decode("utf-16-le", "replace")
+        position += length * 2
+    else:
+        text = data[position : position + length].decode("latin-1")
+        position += length
+    return text, position + extra
+
+
+def _decode_rk(rk: int) -> float:
+    if rk & 0x02:
+        integer = rk >> 2
+        if rk & 0x80000000:
+            integer -= 1 << 30
+        value = float(integer)
+    else:
+        value = struct.unpack("<d", struct.pack("<Q", (rk & 0xFFFFFFFC) << 32))[0]
+    return value / 100 if rk & 0x01 else value
+
+
+def _bool_or_error(value: int, is_error: int) -> CellValue:
+    if is_error:
+        return _ERROR_CODES.get(value, "#ERR!")
+    return bool(value)
+
+
+def _is_picture_object(payload: bytes) -> bool:
+    # OBJ starts with the ftCmo subrecord: ft, cb, ot (object type), ...
+    return len(payload) >= 6 and _u16(payload, 0) == _FT_CMO and _u16(payload, 4) == _OBJECT_PICTURE
+
+
+def _row_col(payload: bytes) -> tuple[int, int]:
+    return _u16(payload, 0), _u16(payload, 2)
+
+
+def _u16(data: bytes, position: int) -> int:
+    return int.from_bytes(data[position : position + 2], "little")
+
+
+def _u32(data: bytes, position: int) -> int:
+    return int.from_bytes(data[position : position + 4], "little")
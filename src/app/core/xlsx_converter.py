@@ -0,0 +1,29 @@
+"""Markdown conversion for large .xlsx workbooks.
+
+Rows come from the streaming reader with its compact shared-string store
+and are rendered by workbook_markdown as they are read; one pass also
+collects pictures and formulas without a cached value, instead of the
+separate openpyxl loads of the MarkItDown path.
+"""
+
+from __future__ import annotations
+
+from pathlib import Path
+
+from .conversion_result import ConversionResult
+from .workbook_markdown import WorkbookMarkdown, render_workbook, workbook_result
+from .xlsx_reader import XlsxWorkbook
+
+
+def convert(input_path: Path, data: bytes | None = None) -> ConversionResult:
+    """Engine entry point: convert_xlsx plus the shared Excel post-processing."""
+    return workbook_result(convert_xlsx(input_path, data))
+
+
+def convert_xlsx(path: Path, data: bytes | None = None, max_formula_samples: int = 5) -> WorkbookMarkdown:
+    """Convert an .xlsx workbook to Markdown, one table per worksheet.
+
+    Raises XlsxFormatError for files the streaming reader cannot handle.
+    """
+    with XlsxWorkbook(path if data is None else data, max_formula_samples) as workbook:
+        return render_workbook(workbook, max_formula_samples)
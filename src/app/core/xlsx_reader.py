@@ -0,0 +1,467 @@
+"""Streaming reader for .xlsx workbooks with compact shared strings.
+
+openpyxl keeps every shared string as its own Python str, once per load of
+the workbook, so ``sharedStrings.xml`` tables with millions of entries cost
+gigabytes. This reader keeps the table as a single UTF-8 buffer indexed by
+an offset array (moved to a memory-mapped temporary file when it grows
+large) and parses each worksheet with expat one row at a time. Rows hold
+the raw cell text; shared strings, numbers and dates are resolved only
+when a cell is read, i.e. when the row is rendered.
+
+Pictures (drawing parts with ``pic`` shapes) and formula cells without a
+cached value are found in the same pass, so a workbook is read once.
+"""
+
+from __future__ import annotations
+
+import datetime as dt
+import io
+import mmap
+import posixpath
+import re
+import tempfile
+import zipfile
+from array import array
+from dataclasses import dataclass, field
+from pathlib import Path
+from typing import IO, Callable, Iterator, Mapping
+from xml.etree import ElementTree
+from xml.parsers import expat
+
+from .excel_cells import CellValue, column_letter, excel_datetime, is_date_format
+
+DEFAULT_SPILL_BYTES = 64 * 1024 * 1024
+_PARSE_CHUNK_SIZE = 1024 * 1024
+_REL_WORKSHEET = "/worksheet"
+_REL_SHARED_STRINGS = "/sharedStrings"
+_REL_STYLES = "/styles"
+_REL_DRAWING = "/drawing"
+_REL_OFFICE_DOCUMENT = "/officeDocument"
+_PICTURE_SHAPE = re.compile(rb"<(?:\w+:)?pic\b")
+_ESCAPED_CHAR = re.compile(r"_x([0-9A-Fa-f]{4})_")
+
+
+class XlsxFormatError(ValueError):
+    """The file is not an .xlsx workbook this reader can stream."""
+
+
+class SharedStringStore:
+    """Shared strings as one UTF-8 buffer plus an offset index.
+
+    Once the buffer grows beyond spill_bytes it moves to an anonymous
+    temporary file that is memory-mapped when loading finishes, so large
+    tables are paged in by the OS instead of being held on the heap.
+    """
+
+    def __init__(self, spill_bytes: int | None = DEFAULT_SPILL_BYTES) -> None:
+        self._spill_bytes = spill_bytes
+        self._offsets = array("q", [0])
+        self._buffer = bytearray()
+        self._file: IO[bytes] | None = None
+        self._view: bytes | bytearray | mmap.mmap = self._buffer
+
+    def __len__(self) -> int:
+        return len(self._offsets) - 1
+
+    def __getitem__(self, index: int) -> str:
+        start = self._offsets[index]
+        return self._view[start : self._offsets[index + 1]].decode("utf-8", "surrogatepass")
+
+    @property
+    def spilled(self) -> bool:
+        return self._file is not None
+
+    @property
+    def nbytes(self) -> int:
+        """Bytes used by the strings and the offset index."""
+        return self._offsets[-1] + self._offsets.itemsize * len(self._offsets)
+
+    def append(self, text: str) -> None:
+        encoded = text.encode("utf-8", "surrogatepass")
+        self._offsets.append(self._offsets[-1] + len(encoded))
+        if self._file is not None:
+            self._file.write(encoded)
+            return
+        self._buffer += encoded
+        if self._spill_bytes is not None and len(self._buffer) > self._spill_bytes:
+            self._file = tempfile.TemporaryFile()
+            self._file.write(self._buffer)
+            self._buffer = bytearray()
+            self._view = self._buffer
+
+    def finish(self) -> None:
+        """Make the strings readable; call once after the last append()."""
+        if self._file is not None and self._offsets[-1]:
+            self._file.flush()
+            self._view = mmap.mmap(self._file.fileno(), 0, access=mmap.ACCESS_READ)
+
+    def close(self) -> None:
+        if isinstance(self._view, mmap.mmap):
+            self._view.close()
+        if self._file is not None:
+            self._file.close()
+        self._view = self._buffer = bytearray()
+
+
+@dataclass(frozen=True)
+class _SheetPart:
+    name: str
+    part: str
+    has_pictures: bool
+
+
+@dataclass
+class XlsxSheet:
+    """Cells of one worksheet, read row by row.
+
+    Formula findings are complete once rows() is exhausted.
+    """
+
+    name: str
+    has_pictures: bool = False
+    missing_formulas: list[str] = field(default_factory=list)
+    missing_formula_count: int = 0
+    dropped_cells: int = 0
+    _rows: Iterator[tuple[int, XlsxRow]] | None = field(default=None, repr=False)
+
+    def rows(self) -> Iterator[tuple[int, XlsxRow]]:
+        """Yield (row index, {column index: value}) in ascending row order."""
+        if self._rows is not None:
+            yield from self._rows
+
+
+class XlsxRow(Mapping[int, CellValue]):
+    """Raw cells of one row; values are resolved when they are read."""
+
+    __slots__ = ("_cells", "_resolve")
+
+    def __init__(
+        self,
+        cells: dict[int, tuple[str, str, int]],
+        resolve: Callable[[str, str, int], CellValue],
+    ) -> None:
+        self._cells = cells
+        self._resolve = resolve
+
+    def __getitem__(self, col: int) -> CellValue:
+        kind, raw, style = self._cells[col]
+        return self._resolve(kind, raw, style)
+
+    def __iter__(self) -> Iterator[int]:
+        return iter(self._cells)
+
+    def __len__(self) -> int:
+        return len(self._cells)
+
+
+class XlsxWorkbook:
+    """Open an .xlsx workbook for a single pass over its worksheets."""
+
+    def __init__(
+        self,
+        source: Path | bytes,
+        max_formula_samples: int = 5,
+        spill_bytes: int | None = DEFAULT_SPILL_BYTES,
+    ) -> None:
+        self._max_formula_samples = max_formula_samples
+        self.strings = SharedStringStore(spill_bytes)
+        try:
+            self._archive = zipfile.ZipFile(io.BytesIO(source) if isinstance(source, bytes) else source)
+        except zipfile.BadZipFile as exc:
+            raise XlsxFormatError(f"xlsx (ZIP) 形式ではありません: {exc}") from None
+        try:
+            self._read_workbook()
+        except Exception:
+            self.close()
+            raise
+
+    def close(self) -> None:
+        self.strings.close()
+        self._archive.close()
+
+    def __enter__(self) -> "XlsxWorkbook":
+        return self
+
+    def __exit__(self, *exc_info: object) -> None:
+        self.close()
+
+    @property
+    def sheet_names(self) -> list[str]:
+        return [sheet.name for sheet in self._sheets]
+
+    def sheets(self) -> Iterator[XlsxSheet]:
+        for part in self._sheets:
+            sheet = XlsxSheet(name=part.name, has_pictures=part.has_pictures)
+            sheet._rows = self._sheet_rows(sheet, part.part)
+            yield sheet
+            for _ in sheet._rows:
+                pass
+
+    def _read_workbook(self) -> None:
+        package_rels = self._relationships("_rels/.rels", "")
+        workbook_part = next(
+            (target for kind, target in package_rels.values() if kind.endswith(_REL_OFFICE_DOCUMENT)),
+            "xl/workbook.xml",
+        )
+        workbook = self._xml(workbook_part)
+        if workbook is None:
+            raise XlsxFormatError("ブック (workbook.xml) が見つかりません。")
+        rels = self._relationships(_rels_part(workbook_part), workbook_part)
+
+        self._datemode = 0
+        properties = workbook.find("{*}workbookPr")
+        if properties is not None and properties.get("date1904", "").lower() in {"1", "true"}:
+            self._datemode = 1
+
+        self._sheets: list[_SheetPart] = []
+        for element in workbook.iterfind("{*}sheets/{*}sheet"):
+            rel_id = next((value for key, value in element.attrib.items() if key.endswith("}id")), None)
+            kind, target = rels.get(rel_id or "", ("", ""))
+            if not kind.endswith(_REL_WORKSHEET):
+                continue
+            self._sheets.append(
+                _SheetPart(name=element.get("name", ""), part=target, has_pictures=self._has_pictures(target))
+            )
+
+        self._date_styles: frozenset[int] = frozenset()
+        for kind, target in rels.values():
+            if kind.endswith(_REL_STYLES):
+                self._date_styles = self._read_date_styles(target)
+            elif kind.endswith(_REL_SHARED_STRINGS) and target in self._archive.NameToInfo:
+                with self._archive.open(target) as stream:
+                    _SharedStringsParser(self.strings).parse(stream)
+        self.strings.finish()
+
+    def _relationships(self, rels_part: str, source_part: str) -> dict[str, tuple[str, str]]:
+        root = self._xml(rels_part)
+        if root is None:
+            return {}
+        base = posixpath.dirname(source_part)
+        rels: dict[str, tuple[str, str]] = {}
+        for element in root.iterfind("{*}Relationship"):
+            target = element.get("Target", "")
+            if element.get("TargetMode") == "External":
+                continue
+            if target.startswith("/"):
+                resolved = target.lstrip("/")
+            else:
+                resolved = posixpath.normpath(posixpath.join(base, target))
+            rels[element.get("Id", "")] = (element.get("Type", ""), resolved)
+        return rels
+
+    def _has_pictures(self, sheet_part: str) -> bool:
+        for kind, target in self._relationships(_rels_part(sheet_part), sheet_part).values():
+            if kind.endswith(_REL_DRAWING) and target in self._archive.NameToInfo:
+                if _PICTURE_SHAPE.search(self._archive.read(target)):
+                    return True
+        return False
+
+    def _read_date_styles(self, styles_part: str) -> frozenset[int]:
+        styles = self._xml(styles_part)
+        if styles is None:
+            return frozenset()
+        formats = {
+            int(element.get("numFmtId", "0")): element.get("formatCode", "")
+            for element in styles.iterfind("{*}numFmts/{*}numFmt")
+        }
+        date_styles = set()
+        for index, element in enumerate(styles.iterfind("{*}cellXfs/{*}xf")):
+            format_id = int(element.get("numFmtId", "0"))
+            if is_date_format(format_id, formats.get(format_id)):
+                date_styles.add(index)
+        return frozenset(date_styles)
+
+    def _xml(self, part: str) -> ElementTree.Element | None:
+        if part not in self._archive.NameToInfo:
+            return None
+        return ElementTree.fromstring(self._archive.read(part))
+
+    def _sheet_rows(self, sheet: XlsxSheet, part: str) -> Iterator[tuple[int, XlsxRow]]:
+        if part not in self._archive.NameToInfo:
+            return
+        parser = _SheetParser(sheet, self._value, self._max_formula_samples)
+        with self._archive.open(part) as stream:
+            while True:
+                chunk = stream.read(_PARSE_CHUNK_SIZE)
+                parser.feed(chunk, final=not chunk)
+                yield from parser.take_rows()
+                if not chunk:
+                    return
+
+    def _value(self, kind: str, raw: str, style: int) -> CellValue:
+        if kind == "s":
+            return self.strings[int(raw)]
+        if kind == "n":
+            try:
+                number = float(raw)
+            except ValueError:
+                return raw
+            if style in self._date_styles:
+                return excel_datetime(number, self._datemode)
+            return number
+        if kind == "b":
+            return raw in {"1", "true"}
+        if kind == "d":
+            try:
+                return dt.datetime.fromisoformat(raw.rstrip("Z"))
+            except ValueError:
+                return raw
+        # str (formula result), inlineStr and e (error) keep their text.
+        return raw
+
+
+class _SharedStringsParser:
+    """expat handlers collecting <si> texts, without phonetic runs."""
+
+    def __init__(self, store: SharedStringStore) -> None:
+        self._store = store
+        self._parts: list[str] = []
+        self._capturing = False
+        self._in_phonetic = False
+        self._names: dict[str, str] = {}
+
+    def parse(self, stream: IO[bytes]) -> None:
+        parser = expat.ParserCreate()
+        parser.buffer_text = True
+        parser.StartElementHandler = self._start
+        parser.EndElementHandler = self._end
+        parser.CharacterDataHandler = self._text
+        try:
+            parser.ParseFile(stream)
+        except expat.ExpatError as exc:
+            raise XlsxFormatError(f"共有文字列を読み込めません: {exc}") from None
+
+    def _start(self, tag: str, attrs: dict[str, str]) -> None:
+        name = self._names.get(tag) or self._names.setdefault(tag, tag.rpartition(":")[2])
+        if name == "t":
+            self._capturing = not self._in_phonetic
+        elif name == "si":
+            self._parts = []
+        elif name == "rPh":
+            self._in_phonetic = True
+
+    def _end(self, tag: str) -> None:
+        name = self._names[tag]
+        if name == "t":
+            self._capturing = False
+        elif name == "si":
+            self._store.append(_unescape("".join(self._parts)))
+        elif name == "rPh":
+            self._in_phonetic = False
+
+    def _text(self, data: str) -> None:
+        if self._capturing:
+            self._parts.append(data)
+
+
+class _SheetParser:
+    """expat handlers turning <row>/<c> elements into XlsxRow objects."""
+
+    def __init__(
+        self,
+        sheet: XlsxSheet,
+        resolve: Callable[[str, str, int], CellValue],
+        max_formula_samples: int,
+    ) -> None:
+        self._sheet = sheet
+        self._resolve = resolve
+        self._max_formula_samples = max_formula_samples
+        self._names: dict[str, str] = {}
+        self._rows: list[tuple[int, XlsxRow]] = []
+        self._row = -1
+        self._col = -1
+        self._cells: dict[int, tuple[str, str, int]] = {}
+        self._kind = "n"
+        self._style = 0
+        self._formula = False
+        self._parts: list[str] = []
+        self._capturing = False
+        self._in_phonetic = False
+        self._parser = expat.ParserCreate()
+        self._parser.buffer_text = True
+        self._parser.StartElementHandler = self._start
+        self._parser.EndElementHandler = self._end
+        self._parser.CharacterDataHandler = self._text
+
+    def feed(self, chunk: bytes, final: bool) -> None:
+        try:
+            self._parser.Parse(chunk, final)
+        except expat.ExpatError as exc:
+            raise XlsxFormatError(f"{self._sheet.name}: シートを読み込めません: {exc}") from None
+
+    def take_rows(self) -> list[tuple[int, XlsxRow]]:
+        rows, self._rows = self._rows, []
+        return rows
+
+    def _start(self, tag: str, attrs: dict[str, str]) -> None:
+        name = self._names.get(tag) or self._names.setdefault(tag, tag.rpartition(":")[2])
+        if name == "c":
+            reference = attrs.get("r")
+            self._col = _column_index(reference) if reference else self._col + 1
+            self._kind = attrs.get("t", "n")
+            self._style = int(attrs.get("s", "0"))
+            self._formula = False
+            self._parts = []
+        elif name == "v":
+            self._capturing = True
+        elif name == "t":
+            self._capturing = not self._in_phonetic
+        elif name == "f":
+            self._formula = True
+        elif name == "row":
+            reference = attrs.get("r")
+            self._row = int(reference) - 1 if reference else self._row + 1
+            self._col = -1
+            self._cells = {}
+        elif name == "rPh":
+            self._in_phonetic = True
+
+    def _end(self, tag: str) -> None:
+        name = self._names[tag]
+        if name == "c":
+            raw = "".join(self._parts)
+            if raw:
+                self._cells[self._col] = (self._kind, raw, self._style)
+            elif self._formula:
+                self._record_missing_formula()
+        elif name in {"v", "t"}:
+            self._capturing = False
+        elif name == "row":
+            if self._cells:
+                self._rows.append((self._row, XlsxRow(self._cells, self._resolve)))
+        elif name == "rPh":
+            self._in_phonetic = False
+
+    def _text(self, data: str) -> None:
+        if self._capturing:
+            self._parts.append(data)
+
+    def _record_missing_formula(self) -> None:
+        sheet = self._sheet
+        sheet.missing_formula_count += 1
+        if len(sheet.missing_formulas) < self._max_formula_samples:
+            sheet.missing_formulas.append(f"{column_letter(self._col)}{self._row + 1}")
+
+
+def _rels_part(part: str) -> str:
+    directory, name = posixpath.split(part)
+    return posixpath.join(directory, "_rels", f"{name}.rels")
+
+
+def _column_index(reference: str) -> int:
+    index = 0
+    for char in reference:
+        if "A" <= char <= "Z":
+            index = index * 26 + ord(char) - 64
+        elif "a" <= char <= "z":
+            index = index * 26 + ord(char) - 96
+        elif char != "$":
+            break
+    return index - 1
+
+
+def _unescape(text: str) -> str:
+    # OOXML escapes characters XML cannot carry as _xHHHH_.
+    if "_x" not in text:
+        return text
+    return _ESCAPED_CHAR.sub(lambda match: chr(int(match.group(1), 16)), text)
@@ -1,5 +1,6 @@
 """Model definitions for the application."""
 
+from .conversion_options import ConversionOptions
 from .progress_event import ProgressEvent
 
-__all__ = ["ProgressEvent"]
+__all__ = ["ConversionOptions", "ProgressEvent"]
@@ -0,0 +1,30 @@
+"""Run options for the conversion controller."""
+
+from __future__ import annotations
+
+from dataclasses import dataclass
+from pathlib import Path
+
+
+@dataclass(frozen=True)
+class ConversionOptions:
+    """Options controlling a single conversion run."""
+
+    # The scan index is written to the per-user cache, so only runs that
+    # ask for it (the CLI does by default) use it; the GUI leaves it off.
+    use_scan_index: bool = False
+    force_rescan: bool = False
+    scan_index_path: Path | None = None
+    expand_archives: bool = False
+    output_mode: str = "directory"
+    # Outlier profiling is off unless a threshold is set.
+    profile_seconds: float | None = None
+    profile_memory_mb: float | None = None
+    profile_limit: int = 5
+    # I/O budgets (bytes or files per second); None is unlimited. They can
+    # be changed during a run with ConversionController.update_limits().
+    read_bytes_per_second: float | None = None
+    write_bytes_per_second: float | None = None
+    files_per_second: float | None = None
+    # Niceness added to the conversion worker thread(s); None keeps it.
+    worker_nice: int | None = None
@@ -0,0 +1,380 @@
+"""Local HTTP conversion service (``python -m app.server``).
+
+Endpoints:
+- ``POST /convert?filename=<name>``: convert the uploaded request body.
+- ``POST /convert?path=<path>``: convert a file below ``path_root``
+  (disabled unless the server was started with ``--path-root``).
+- ``GET /health``: liveness and pool size.
+- ``GET /metrics``: queue depth, latency percentiles and throughput.
+
+Conversions run on a warm worker pool. At most ``workers`` conversions run
+at a time and at most ``max_queue`` more may wait or upload; further
+requests are rejected with 503 right after their headers, before their
+body is read, so the queue limit also bounds the memory held by uploads.
+"""
+
+from __future__ import annotations
+
+import argparse
+import asyncio
+import json
+import signal
+import sys
+import time
+from concurrent.futures import Executor, ProcessPoolExecutor, ThreadPoolExecutor
+from dataclasses import dataclass, field
+from pathlib import Path
+from typing import Callable, Sequence
+from urllib.parse import parse_qs, urlsplit
+
+from app.config import APP_NAME, APP_VERSION
+from app.core.document_converter import ConversionResult, convert_document, warm_up_converter
+from app.core.latency_stats import LatencyStats
+from app.core.path_utils import is_supported_extension
+
+Converter = Callable[..., ConversionResult]
+
+DEFAULT_HOST = "127.0.0.1"
+DEFAULT_PORT = 8765
+_HEADER_LIMIT = 64 * 1024
+_HEADER_TIMEOUT = 30.0
+_STREAM_CHUNK_SIZE = 64 * 1024
+_REASONS = {
+    200: "OK",
+    400: "Bad Request",
+    403: "Forbidden",
+    404: "Not Found",
+    405: "Method Not Allowed",
+    411: "Length Required",
+    413: "Payload Too Large",
+    415: "Unsupported Media Type",
+    422: "Unprocessable Entity",
+    503: "Service Unavailable",
+}
+
+
+class HttpError(Exception):
+    """Error answered with a JSON body and the given status code."""
+
+    def __init__(self, status: int, message: str, headers: dict[str, str] | None = None) -> None:
+        super().__init__(message)
+        self.status = status
+        self.headers = headers or {}
+
+
+@dataclass
+class _Request:
+    method: str
+    target: str
+    headers: dict[str, str]
+    content_length: int = 0
+    query: dict[str, list[str]] = field(default_factory=dict)
+
+    @property
+    def path(self) -> str:
+        return urlsplit(self.target).path
+
+
+class ConversionServer:
+    """Serve conversions from an executor with bounded concurrency and queue."""
+
+    def __init__(
+        self,
+        executor: Executor,
+        workers: int,
+        max_queue: int = 16,
+        max_upload_bytes: int = 200 * 1024 * 1024,
+        path_root: Path | None = None,
+        convert: Converter = convert_document,
+    ) -> None:
+        self.executor = executor
+        self.workers = workers
+        self.max_queue = max_queue
+        self.max_upload_bytes = max_upload_bytes
+        self.path_root = path_root.resolve() if path_root is not None else None
+        self._convert = convert
+        self._slots = asyncio.Semaphore(workers)
+        self._receiving = 0
+        self._waiting = 0
+        self._running = 0
+        self._completed = 0
+        self._failed = 0
+        self._rejected = 0
+        self._latencies = LatencyStats()
+        self._started = time.monotonic()
+
+    async def start(self, host: str = DEFAULT_HOST, port: int = DEFAULT_PORT) -> asyncio.AbstractServer:
+        return await asyncio.start_server(self.handle, host, port, limit=_HEADER_LIMIT)
+
+    def metrics(self) -> dict[str, object]:
+        return {
+            "queue_depth": self._waiting,
+            "receiving": self._receiving,
+            "running": self._running,
+            "workers": self.workers,
+            "max_queue": self.max_queue,
+            "completed": self._completed,
+            "failed": self._failed,
+            "rejected": self._rejected,
+            "latency_p50": self._latencies.percentile(0.50),
+            "latency_p95": self._latencies.percentile(0.95),
+            "throughput_per_second": self._latencies.throughput(),
+            "uptime_seconds": time.monotonic() - self._started,
+        }
+
+    async def handle(self, reader: asyncio.StreamReader, writer: asyncio.StreamWriter) -> None:
+        try:
+            request = await self._read_request(reader)
+            await self._route(request, reader, writer)
+        except HttpError as exc:
+            await _write_json(writer, exc.status, {"error": str(exc)}, exc.headers)
+        except (asyncio.IncompleteReadError, asyncio.TimeoutError, ConnectionError):
+            pass
+        finally:
+            writer.close()
+            try:
+                await writer.wait_closed()
+            except ConnectionError:
+                pass
+
+    async def _route(
+        self,
+        request: _Request,
+        reader: asyncio.StreamReader,
+        writer: asyncio.StreamWriter,
+    ) -> None:
+        if request.path == "/health":
+            _require_method(request, "GET")
+            await _write_json(writer, 200, {"status": "ok", "workers": self.workers})
+        elif request.path == "/metrics":
+            _require_method(request, "GET")
+            await _write_json(writer, 200, self.metrics())
+        elif request.path == "/convert":
+            _require_method(request, "POST")
+            result = await self._submit(request, reader)
+            await _stream_markdown(writer, result)
+        else:
+            raise HttpError(404, f"Unknown endpoint: {request.path}")
+
+    async def _submit(self, request: _Request, reader: asyncio.StreamReader) -> ConversionResult:
+        path, upload = self._conversion_args(request)
+        if self._receiving + self._waiting + self._running >= self.workers + self.max_queue:
+            self._rejected += 1
+            raise HttpError(503, "Conversion queue is full.", {"Retry-After": "1"})
+
+        accepted = time.monotonic()
+        args: tuple[object, ...] = (path,)
+        if upload:
+            # Uploads hold a queue place while their body arrives.
+            self._receiving += 1
+            try:
+                args = (path, await reader.readexactly(request.content_length))
+            finally:
+                self._receiving -= 1
+        self._waiting += 1
+        try:
+            await self._slots.acquire()
+        finally:
+            self._waiting -= 1
+
+        self._running += 1
+        try:
+            loop = asyncio.get_running_loop()
+            result = await loop.run_in_executor(self.executor, self._convert, *args)
+        except Exception as exc:
+            self._failed += 1
+            raise HttpError(422, f"Conversion failed: {exc}") from exc
+        finally:
+            self._running -= 1
+            self._slots.release()
+
+        self._completed += 1
+        self._latencies.record(time.monotonic() - accepted)
+        return result
+
+    def _conversion_args(self, request: _Request) -> tuple[Path, bool]:
+        """Validate the query; returns the path and whether the body is the file."""
+        paths = request.query.get("path")
+        if paths:
+            if self.path_root is None:
+                raise HttpError(
+                    403,
+                    "Path conversions are disabled; start the server with --path-root.",
+                )
+            path = Path(paths[0])
+            try:
+                path.resolve().relative_to(self.path_root)
+            except ValueError:
+                raise HttpError(403, "Path is outside the allowed root.") from None
+            _require_supported(path)
+            if not path.is_file():
+                raise HttpError(404, f"File not found: {path}")
+            return path, False
+
+        filenames = request.query.get("filename")
+        if not filenames:
+            raise HttpError(400, "Either 'filename' (upload) or 'path' is required.")
+        name = Path(filenames[0]).name
+        _require_supported(Path(name))
+        if not request.content_length:
+            raise HttpError(400, "Upload body is empty.")
+        return Path(name), True
+
+    async def _read_request(self, reader: asyncio.StreamReader) -> _Request:
+        """Read the request line and headers; the body is left on the stream."""
+        try:
+            head = await asyncio.wait_for(reader.readuntil(b"\r\n\r\n"), _HEADER_TIMEOUT)
+        except asyncio.LimitOverrunError:
+            raise HttpError(400, "Request header too large.") from None
+
+        lines = head.decode("latin-1").split("\r\n")
+        try:
+            method, target, _version = lines[0].split(" ", 2)
+        except ValueError:
+            raise HttpError(400, "Malformed request line.") from None
+        headers: dict[str, str] = {}
+        for line in lines[1:]:
+            if not line:
+                continue
+            name, _, value = line.partition(":")
+            headers[name.strip().lower()] = value.strip()
+
+        request = _Request(
+            method=method.upper(),
+            target=target,
+            headers=headers,
+            query=parse_qs(urlsplit(target).query),
+        )
+        if "chunked" in headers.get("transfer-encoding", "").lower():
+            raise HttpError(411, "Chunked uploads are not supported; send Content-Length.")
+        length_text = headers.get("content-length", "0")
+        try:
+            length = int(length_text)
+        except ValueError:
+            raise HttpError(400, "Invalid Content-Length.") from None
+        if length < 0:
+            raise HttpError(400, "Invalid Content-Length.")
+        if length > self.max_upload_bytes:
+            raise HttpError(413, "Upload exceeds the configured limit.")
+        request.content_length = length
+        return request
+
+
+def _require_method(request: _Request, method: str) -> None:
+    if request.method != method:
+        raise HttpError(405, f"{request.path} only accepts {method}.", {"Allow": method})
+
+
+def _require_supported(path: Path) -> None:
+    if not is_supported_extension(path):
+        raise HttpError(415, f"Unsupported file type: {path.suffix or '(none)'}")
+
+
+async def _write_json(
+    writer: asyncio.StreamWriter,
+    status: int,
+    payload: object,
+    extra_headers: dict[str, str] | None = None,
+) -> None:
+    body = json.dumps(payload, ensure_ascii=False).encode("utf-8")
+    headers = {"Content-Type": "application/json; charset=utf-8", "Content-Length": str(len(body))}
+    headers.update(extra_headers or {})
+    writer.write(_status_head(status, headers) + body)
+    await writer.drain()
+
+
+async def _stream_markdown(writer: asyncio.StreamWriter, result: ConversionResult) -> None:
+    headers = {
+        "Content-Type": "text/markdown; charset=utf-8",
+        "Transfer-Encoding": "chunked",
+        "X-Conversion-Warnings": json.dumps(result.warnings, ensure_ascii=True),
+        "X-Conversion-Engine": result.engine,
+        "X-Conversion-Fallbacks": str(result.fallbacks),
+    }
+    writer.write(_status_head(200, headers))
+    payload = result.markdown.encode("utf-8")
+    for start in range(0, len(payload), _STREAM_CHUNK_SIZE):
+        chunk = payload[start : start + _STREAM_CHUNK_SIZE]
+        writer.write(f"{len(chunk):X}\r\n".encode("ascii") + chunk + b"\r\n")
+        await writer.drain()
+    writer.write(b"0\r\n\r\n")
+    await writer.drain()
+
+
+def _status_head(status: int, headers: dict[str, str]) -> bytes:
+    lines = [f"HTTP/1.1 {status} {_REASONS.get(status, '')}", "Connection: close"]
+    lines.extend(f"{name}: {value}" for name, value in headers.items())
+    return ("\r\n".join(lines) + "\r\n\r\n").encode("latin-1")
+
+
+def build_parser() -> argparse.ArgumentParser:
+    parser = argparse.ArgumentParser(
+        prog="python -m app.server",
+        description=f"{APP_NAME} v{APP_VERSION} (local conversion service)",
+    )
+    parser.add_argument("--host", default=DEFAULT_HOST, help="Bind address (default: localhost).")
+    parser.add_argument("--port", type=int, default=DEFAULT_PORT)
+    parser.add_argument("--workers", type=int, default=2, help="Concurrent conversions.")
+    parser.add_argument("--max-queue", type=int, default=16, help="Requests allowed to wait.")
+    parser.add_argument(
+        "--max-upload-mb",
+        type=int,
+        default=200,
+        help="Reject uploads larger than this.",
+    )
+    parser.add_argument(
+        "--path-root",
+        type=Path,
+        default=None,
+        help="Enable ?path= conversions for files below this folder (disabled by default).",
+    )
+    parser.add_argument(
+        "--threads",
+        action="store_true",
+        help="Use worker threads instead of worker processes.",
+    )
+    return parser
+
+
+async def serve(args: argparse.Namespace) -> None:
+    if args.threads:
+        executor: Executor = ThreadPoolExecutor(
+            max_workers=args.workers,
+            thread_name_prefix="convert-worker",
+            initializer=warm_up_converter,
+        )
+    else:
+        executor = ProcessPoolExecutor(max_workers=args.workers, initializer=warm_up_converter)
+
+    server = ConversionServer(
+        executor,
+        workers=args.workers,
+        max_queue=args.max_queue,
+        max_upload_bytes=args.max_upload_mb * 1024 * 1024,
+        path_root=args.path_root,
+    )
+    listener = await server.start(args.host, args.port)
+    stop = asyncio.Event()
+    loop = asyncio.get_running_loop()
+    for signum in (signal.SIGINT, signal.SIGTERM):
+        try:
+            loop.add_signal_handler(signum, stop.set)
+        except (NotImplementedError, RuntimeError):
+            signal.signal(signum, lambda *_: loop.call_soon_threadsafe(stop.set))
+
+    print(f"Listening on http://{args.host}:{args.port}", file=sys.stderr)
+    try:
+        async with listener:
+            await stop.wait()
+    finally:
+        executor.shutdown(wait=True, cancel_futures=True)
+
+
+def main(argv: Sequence[str] | None = None) -> int:
+    args = build_parser().parse_args(argv)
+    asyncio.run(serve(args))
+    return 0
+
+
+if __name__ == "__main__":
+    sys.exit(main())
@@ -0,0 +1,81 @@
+"""Command-line entry point for sharded (multi-node) conversion."""
+
+from __future__ import annotations
+
+import argparse
+import sys
+from pathlib import Path
+from typing import Sequence
+
+from app.config import APP_NAME, APP_VERSION
+from app.controllers.shard_runner import ShardedConversionRunner
+from app.core.work_queue import DEFAULT_LEASE_SECONDS, DEFAULT_MAX_JOB_SECONDS
+
+
+def build_parser() -> argparse.ArgumentParser:
+    parser = argparse.ArgumentParser(
+        prog="python -m app.shard",
+        description=(
+            f"{APP_NAME} v{APP_VERSION} (sharded mode). Start this on every "
+            "node with the same input folder and queue file."
+        ),
+    )
+    parser.add_argument("input_dir", type=Path, help="Shared input folder.")
+    parser.add_argument(
+        "--queue",
+        type=Path,
+        default=None,
+        help="Shared queue file (default: <input>_md.queue.sqlite next to the input).",
+    )
+    parser.add_argument("--node-id", default=None, help="Unique node name (default: host-pid).")
+    parser.add_argument(
+        "--output",
+        type=Path,
+        default=None,
+        help="Output folder, used only by the node that creates the queue.",
+    )
+    parser.add_argument(
+        "--lease-seconds",
+        type=float,
+        default=DEFAULT_LEASE_SECONDS,
+        help="How long a job stays assigned to a node without a heartbeat.",
+    )
+    parser.add_argument(
+        "--max-job-seconds",
+        type=float,
+        default=DEFAULT_MAX_JOB_SECONDS,
+        help="Stop renewing a job's lease after its conversion ran this long.",
+    )
+    parser.add_argument("--batch", type=int, default=1, help="Jobs leased per round trip.")
+    return parser
+
+
+def main(argv: Sequence[str] | None = None) -> int:
+    args = build_parser().parse_args(argv)
+    runner = ShardedConversionRunner(
+        args.input_dir,
+        queue_path=args.queue,
+        node_id=args.node_id,
+        output_dir=args.output,
+        lease_seconds=args.lease_seconds,
+        max_job_seconds=args.max_job_seconds,
+        batch_size=args.batch,
+    )
+    try:
+        summary = runner.run()
+    except Exception as exc:
+        print(f"変換に失敗しました: {exc}", file=sys.stderr)
+        return 2
+
+    print(
+        f"ノード {runner.node_id}: 処理 {runner.processed} 件 (回収 {runner.reclaimed} 件)\n"
+        f"全体 成功: {summary.success_count} 失敗: {summary.failure_count} "
+        f"警告: {summary.warning_count}\n"
+        f"出力先: {summary.output_dir}\n"
+        f"ログ: {summary.log_path}"
+    )
+    return 1 if summary.failure_count else 0
+
+
+if __name__ == "__main__":
+    sys.exit(main())
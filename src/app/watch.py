@@ -0,0 +1,84 @@
+"""Command-line entry point for watch-folder mode."""
+
+from __future__ import annotations
+
+import argparse
+import signal
+import sys
+import threading
+from pathlib import Path
+from typing import Sequence
+
+from app.config import APP_NAME, APP_VERSION
+from app.controllers.watch_controller import WatchController
+
+
+def build_parser() -> argparse.ArgumentParser:
+    parser = argparse.ArgumentParser(
+        prog="python -m app.watch",
+        description=f"{APP_NAME} v{APP_VERSION} (watch mode)",
+    )
+    parser.add_argument("input_dir", type=Path, help="Intake folder to watch.")
+    parser.add_argument(
+        "--output",
+        type=Path,
+        default=None,
+        help="Output folder updated in place (default: <input>_md).",
+    )
+    parser.add_argument(
+        "--debounce",
+        type=float,
+        default=2.0,
+        help="Seconds a file must stay unchanged before it is converted.",
+    )
+    parser.add_argument("--workers", type=int, default=2, help="Conversion worker threads.")
+    parser.add_argument(
+        "--poll",
+        action="store_true",
+        help="Use polling instead of inotify.",
+    )
+    parser.add_argument(
+        "--poll-interval",
+        type=float,
+        default=2.0,
+        help="Seconds between scans when polling.",
+    )
+    return parser
+
+
+def main(argv: Sequence[str] | None = None) -> int:
+    args = build_parser().parse_args(argv)
+    controller = WatchController(
+        args.input_dir,
+        output_dir=args.output,
+        debounce_seconds=args.debounce,
+        workers=args.workers,
+        poll_interval=args.poll_interval,
+        force_polling=args.poll,
+    )
+
+    stop = threading.Event()
+    signal.signal(signal.SIGINT, lambda *_: stop.set())
+    signal.signal(signal.SIGTERM, lambda *_: stop.set())
+    print(f"Watching {args.input_dir} -> {controller.output_dir} (Ctrl+C to stop)", file=sys.stderr)
+
+    try:
+        controller.run(stop)
+    except Exception as exc:
+        print(f"監視を開始できませんでした: {exc}", file=sys.stderr)
+        return 2
+
+    metrics = controller.metrics()
+    print(
+        f"変換: {metrics.converted} 失敗: {metrics.failed} 削除: {metrics.removed} "
+        f"遅延 p50={_seconds(metrics.latency_p50)} p95={_seconds(metrics.latency_p95)}"
+    )
+    return 0
+
+
+def _seconds(value: float | None) -> str:
+    return "-" if value is None else f"{value:.2f}s"
+
+
+if __name__ == "__main__":
+    sys.exit(main())
@@ -0,0 +1,12 @@
+"""Shared pytest configuration."""
+
+from __future__ import annotations
+
+from pathlib import Path
+import sys
+
+_REPO_ROOT = Path(__file__).resolve().parents[1]
+# src for the application, the repository root for benchmarks helpers.
+for _path in (str(_REPO_ROOT / "src"), str(_REPO_ROOT)):
+    if _path not in sys.path:
+        sys.path.insert(0, _path)
@@ -0,0 +1,50 @@
+"""Regenerate xlwt_legacy.xls (needs xlwt): python tests/fixtures/make_xlwt_legacy.py
+
+The fixture is written by xlwt rather than by benchmarks.legacy_xls so the
+.xls reader is checked against a writer it shares no code with.
+"""
+
+from __future__ import annotations
+
+import datetime
+import struct
+import tempfile
+from pathlib import Path
+
+import xlwt
+
+FIXTURE = Path(__file__).with_name("xlwt_legacy.xls")
+
+
+def _write_bitmap(path: Path) -> None:
+    """2x2 24-bit BMP for insert_bitmap."""
+    pixels = (b"\x00\x00\xff" * 2 + b"\x00\x00") * 2
+    header = b"BM" + struct.pack("<IHHI", 54 + len(pixels), 0, 0, 54)
+    info = struct.pack("<IiiHHIIiiII", 40, 2, 2, 1, 24, 0, len(pixels), 2835, 2835, 0, 0)
+    path.write_bytes(header + info + pixels)
+
+
+def main() -> None:
+    book = xlwt.Workbook(encoding="utf-8")
+    sheet = book.add_sheet("売上")
+    for col, text in enumerate(["name", None, "amount", "name", "date"]):
+        if text is not None:
+            sheet.write(0, col, text)
+    sheet.write(1, 0, "a|b")
+    sheet.write(1, 1, 1.5)
+    sheet.write(1, 2, 3)
+    sheet.write(1, 3, True)
+    sheet.write(1, 4, datetime.date(2024, 1, 31), xlwt.easyxf(num_format_str="yyyy/mm/dd"))
+    sheet.write(3, 0, "x\ny")
+    # xlwt does not calculate formulas and stores an empty-string result.
+    sheet.write(3, 2, xlwt.Formula("C2*2"))
+    with tempfile.TemporaryDirectory() as temp:
+        bitmap = Path(temp) / "picture.bmp"
+        _write_bitmap(bitmap)
+        sheet.insert_bitmap(str(bitmap), 5, 5)
+    book.add_sheet("Empty")
+    book.save(str(FIXTURE))
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,86 @@
+"""Tests for the benchmark runner's baseline handling (no stages are run)."""
+
+from __future__ import annotations
+
+import json
+import zipfile
+from pathlib import Path, PurePosixPath
+
+import pytest
+from openpyxl import load_workbook
+
+from benchmarks import run
+from benchmarks.corpus import MANIFEST_NAME, PROFILES, generate_corpus
+from benchmarks.run import compare_with_baseline, main
+
+
+def _stage(files_per_second: float, peak_rss_mb: float) -> dict[str, object]:
+    return {"files_per_second": files_per_second, "mb_per_second": 1.0, "peak_rss_mb": peak_rss_mb}
+
+
+def test_only_changes_beyond_the_tolerance_are_regressions() -> None:
+    baseline = {"convert": _stage(100.0, 200.0), "scan": _stage(1000.0, 50.0)}
+    results = {
+        "convert": _stage(70.0, 260.0),
+        "scan": _stage(800.0, 60.0),
+        "pipeline": _stage(1.0, 999.0),
+    }
+
+    regressions = compare_with_baseline(results, baseline, tolerance=0.25)
+
+    assert regressions == [
+        "convert.files_per_second: 70.00 < baseline 100.00 (-30%)",
+        "convert.peak_rss_mb: 260.0 > baseline 200.0 (+30%)",
+    ]
+
+
+def test_missing_baseline_fails_before_running_stages(tmp_path: Path) -> None:
+    missing = tmp_path / "baseline.json"
+    assert main(["--profile", "smoke", "--baseline", str(missing)]) == 2
+    assert not missing.exists()
+
+
+def test_default_run_without_a_baseline_only_reports(
+    tmp_path: Path, monkeypatch: pytest.MonkeyPatch
+) -> None:
+    monkeypatch.setattr(run, "DEFAULT_BASELINE", tmp_path / "baseline.json")
+    monkeypatch.setattr(run, "generate_corpus", lambda root, profile, seed: root)
+    measured = {**_stage(1.0, 1.0), "files": 1, "bytes": 1024, "seconds": 1.0}
+    monkeypatch.setattr(run, "_run_stage_median", lambda stage, corpus, repeat: measured)
+
+    assert run.main(["--profile", "smoke", "--corpus", str(tmp_path)]) == 0
+    assert not (tmp_path / "baseline.json").exists()
+
+
+def test_corpus_is_reproducible_per_seed_and_has_the_requested_mix(tmp_path: Path) -> None:
+    first = generate_corpus(tmp_path / "first", "smoke", seed=1)
+    again = generate_corpus(tmp_path / "again", "smoke", seed=1)
+    other = generate_corpus(tmp_path / "other", "smoke", seed=2)
+
+    files = json.loads((first / MANIFEST_NAME).read_text(encoding="utf-8"))["files"]
+    assert files == json.loads((again / MANIFEST_NAME).read_text(encoding="utf-8"))["files"]
+    assert files != json.loads((other / MANIFEST_NAME).read_text(encoding="utf-8"))["files"]
+
+    spec = PROFILES["smoke"]
+    leaves = spec.deep_fanout**spec.deep_depth
+    assert sorted(name for name in files if not name.startswith("deep/")) == [
+        "docx/large_table.docx",
+        "xls/export.xls",
+        "xls/report.xls",
+        "xlsx/formulas.xlsx",
+        "xlsx/images.xlsx",
+        "xlsx/many_sheets.xlsx",
+        "xlsx/tall.xlsx",
+        "xlsx/wide.xlsx",
+    ]
+    deep = [PurePosixPath(name) for name in files if name.startswith("deep/")]
+    assert len(deep) == 2 * leaves
+    assert {len(path.parts) for path in deep} == {spec.deep_depth + 2}
+
+    many = load_workbook(first / "xlsx" / "many_sheets.xlsx", read_only=True)
+    assert len(many.sheetnames) == spec.many_sheets
+    formulas = load_workbook(first / "xlsx" / "formulas.xlsx", read_only=True)["Formulas"]
+    assert [cell.value for cell in next(formulas.iter_rows(min_row=2, max_row=2))][2] == "=A2+B2"
+    with zipfile.ZipFile(first / "xlsx" / "images.xlsx") as archive:
+        drawings = [name for name in archive.namelist() if name.startswith("xl/drawings/drawing")]
+    assert len(drawings) == len(range(1, spec.image_sheets + 1, 2))
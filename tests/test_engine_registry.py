@@ -0,0 +1,71 @@
+"""Tests for engine selection and the fallback chain."""
+
+from __future__ import annotations
+
+from pathlib import Path
+
+from openpyxl import Workbook
+
+from app.core.document_converter import ConversionResult
+from app.core.engine_registry import (
+    XLSX_COMPACT_MIN_SHEETS,
+    EngineRegistry,
+    EngineSpec,
+    FilePreflight,
+    default_registry,
+)
+
+
+def _failing(input_path: Path, data: bytes | None = None) -> ConversionResult:
+    raise ValueError("unsupported")
+
+
+def _plain(input_path: Path, data: bytes | None = None) -> ConversionResult:
+    return ConversionResult(markdown="plain", warnings=["note"])
+
+
+def test_failing_engine_falls_back_and_is_recorded(tmp_path: Path) -> None:
+    registry = EngineRegistry(fallback=EngineSpec("plain", f"{__name__}:_plain"))
+    registry.register([".xls"], EngineSpec("broken", f"{__name__}:_failing"))
+    registry.register([".xls"], EngineSpec("big-only", f"{__name__}:_failing", min_size=1024))
+
+    result = registry.convert(tmp_path / "book.xls", b"tiny")
+
+    assert (result.markdown, result.engine, result.fallbacks) == ("plain", "plain", 1)
+    assert result.warnings == [
+        "brokenエンジンで変換できなかったため別のエンジンで変換しました: unsupported",
+        "note",
+    ]
+
+
+def test_preflight_routes_by_container() -> None:
+    xls = (Path(__file__).parent / "fixtures" / "xlwt_legacy.xls").read_bytes()
+    facts = FilePreflight(Path("legacy.xls"), xls)
+    assert facts.container == "ole2"
+    assert [spec.name for spec in default_registry.chain(facts)] == ["xls-stream", "markitdown"]
+
+    # HTML saved with an .xls extension goes straight to MarkItDown.
+    html = FilePreflight(Path("export.xls"), b"<html><table></table></html>")
+    assert [spec.name for spec in default_registry.chain(html)] == ["markitdown"]
+
+
+def test_workbooks_with_many_sheets_use_the_compact_engine(tmp_path: Path) -> None:
+    workbook = Workbook()
+    for index in range(1, XLSX_COMPACT_MIN_SHEETS):
+        workbook.create_sheet(f"s{index}")
+    path = tmp_path / "many.xlsx"
+    workbook.save(path)
+    workbook.remove(workbook["s1"])
+    workbook.save(tmp_path / "fewer.xlsx")
+
+    many = FilePreflight(path)
+    assert many.sheet_count == XLSX_COMPACT_MIN_SHEETS
+    assert [spec.name for spec in default_registry.chain(many)] == ["xlsx-compact", "markitdown"]
+    fewer = FilePreflight(tmp_path / "fewer.xlsx", (tmp_path / "fewer.xlsx").read_bytes())
+    assert [spec.name for spec in default_registry.chain(fewer)] == ["markitdown"]
+
+    # Both rules accept a large workbook with many sheets; it is tried once.
+    registry = EngineRegistry(fallback=EngineSpec("plain", f"{__name__}:_plain"))
+    registry.register([".xlsx"], EngineSpec("compact", f"{__name__}:_failing", min_size=1))
+    registry.register([".xlsx"], EngineSpec("compact", f"{__name__}:_failing", min_sheets=2))
+    assert [spec.name for spec in registry.chain(many)] == ["compact", "plain"]
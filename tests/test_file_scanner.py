@@ -0,0 +1,177 @@
+"""Tests for input scanning and the persistent scan index."""
+
+from __future__ import annotations
+
+import os
+from pathlib import Path
+
+from app.cli import build_parser, options_from_args
+from app.core.file_scanner import scan_input_files
+from app.core.scan_index import ScanIndex
+from app.models.conversion_options import ConversionOptions
+
+_PAST_NS = 1_600_000_000 * 1_000_000_000
+
+
+def _age(*paths: Path) -> None:
+    for path in paths:
+        os.utime(path, ns=(_PAST_NS, _PAST_NS))
+
+
+def _make_tree(root: Path) -> None:
+    (root / "a" / "b").mkdir(parents=True)
+    (root / "out_md").mkdir()
+    (root / "top.docx").write_bytes(b"")
+    (root / "~$top.docx").write_bytes(b"")
+    (root / "notes.txt").write_bytes(b"")
+    (root / "a" / "one.xlsx").write_bytes(b"")
+    (root / "a" / "b" / "two.XLS").write_bytes(b"")
+    (root / "out_md" / "skip.docx").write_bytes(b"")
+    _age(root, root / "a", root / "a" / "b", root / "out_md")
+
+
+def test_scan_filters_and_excludes(tmp_path: Path) -> None:
+    _make_tree(tmp_path)
+    found = scan_input_files(tmp_path)
+    assert found == sorted(
+        [
+            tmp_path / "top.docx",
+            tmp_path / "a" / "one.xlsx",
+            tmp_path / "a" / "b" / "two.XLS",
+        ]
+    )
+
+
+def test_index_reuses_unchanged_directories(tmp_path: Path) -> None:
+    _make_tree(tmp_path)
+    index_path = tmp_path.parent / f"{tmp_path.name}.index.json"
+
+    index = ScanIndex(tmp_path)
+    first = scan_input_files(tmp_path, index=index)
+    index.save(index_path)
+    assert index.hits == 0
+
+    reloaded = ScanIndex.load(index_path, tmp_path)
+    assert scan_input_files(tmp_path, index=reloaded) == first
+    assert reloaded.hits == 3
+    assert reloaded.misses == 0
+
+
+def test_index_detects_changed_directory(tmp_path: Path) -> None:
+    _make_tree(tmp_path)
+    index = ScanIndex(tmp_path)
+    scan_input_files(tmp_path, index=index)
+
+    misses_before = index.misses
+    (tmp_path / "a" / "b" / "three.docx").write_bytes(b"")
+    os.utime(tmp_path / "a" / "b", ns=(_PAST_NS + 1, _PAST_NS + 1))
+    found = scan_input_files(tmp_path, index=index)
+
+    assert tmp_path / "a" / "b" / "three.docx" in found
+    assert index.misses - misses_before == 1
+
+
+def test_recently_modified_directories_are_not_cached(tmp_path: Path) -> None:
+    _make_tree(tmp_path)
+    os.utime(tmp_path / "a")
+    index = ScanIndex(tmp_path)
+    scan_input_files(tmp_path, index=index)
+
+    assert len(index) == 2
+
+
+def test_index_for_other_root_is_ignored(tmp_path: Path) -> None:
+    root = tmp_path / "root"
+    root.mkdir()
+    _make_tree(root)
+    index_path = tmp_path / "index.json"
+    index = ScanIndex(root)
+    scan_input_files(root, index=index)
+    index.save(index_path)
+
+    assert len(ScanIndex.load(index_path, tmp_path)) == 0
+    assert len(ScanIndex.load(tmp_path / "missing.json", root)) == 0
+
+
+def test_archives_are_scanned_as_virtual_directories(tmp_path: Path) -> None:
+    import zipfile
+
+    from app.core.archive_reader import ArchiveReader
+
+    archive_path = tmp_path / "pack.zip"
+    with zipfile.ZipFile(archive_path, "w") as archive:
+        archive.writestr("docs/a.docx", b"payload")
+        archive.writestr("docs/~$a.docx", b"")
+        archive.writestr("old_md/b.docx", b"")
+        archive.writestr("readme.txt", b"")
+
+    assert scan_input_files(tmp_path) == []
+    found = scan_input_files(tmp_path, expand_archives=True)
+    assert found == [archive_path / "docs" / "a.docx"]
+
+    with ArchiveReader() as reader:
+        assert reader.read(found[0]) == b"payload"
+        assert reader.read(archive_path) is None
+
+
+def test_tar_members_keep_their_stored_order(tmp_path: Path) -> None:
+    import io
+    import tarfile
+
+    from app.core.archive_reader import ArchiveReader
+
+    archive_path = tmp_path / "pack.tgz"
+    with tarfile.open(archive_path, "w:gz") as archive:
+        for name in ("z.docx", "a.docx", "m/b.docx"):
+            info = tarfile.TarInfo(name)
+            info.size = len(name)
+            archive.addfile(info, io.BytesIO(name.encode()))
+    (tmp_path / "b.docx").write_bytes(b"")
+    (tmp_path / "z.docx").write_bytes(b"")
+
+    found = scan_input_files(tmp_path, expand_archives=True)
+
+    assert found == [
+        tmp_path / "b.docx",
+        archive_path / "z.docx",
+        archive_path / "a.docx",
+        archive_path / "m" / "b.docx",
+        tmp_path / "z.docx",
+    ]
+    with ArchiveReader() as reader:
+        assert [reader.read(path) for path in found[1:4]] == [b"z.docx", b"a.docx", b"m/b.docx"]
+
+
+def test_archive_members_convert_from_memory_like_files(tmp_path: Path) -> None:
+    import zipfile
+
+    import openpyxl
+
+    from app.core.archive_reader import ArchiveReader
+    from app.core.document_converter import convert_document
+
+    workbook = openpyxl.Workbook()
+    workbook.active.append(["name", "count"])
+    workbook.active.append(["a", 1])
+    workbook.save(tmp_path / "book.xlsx")
+    legacy = Path(__file__).parent / "fixtures" / "xlwt_legacy.xls"
+    inputs = tmp_path / "inputs"
+    inputs.mkdir()
+    with zipfile.ZipFile(inputs / "pack.zip", "w") as archive:
+        archive.write(tmp_path / "book.xlsx", "sheets/book.xlsx")
+        archive.write(legacy, "legacy.xls")
+
+    found = scan_input_files(inputs, expand_archives=True)
+
+    assert [path.name for path in found] == ["book.xlsx", "legacy.xls"]
+    with ArchiveReader() as reader:
+        for path, original in zip(found, (tmp_path / "book.xlsx", legacy)):
+            assert convert_document(path, reader.read(path)) == convert_document(original)
+
+
+def test_only_the_cli_uses_the_scan_index_by_default(tmp_path: Path) -> None:
+    parser = build_parser()
+
+    assert not ConversionOptions().use_scan_index
+    assert options_from_args(parser.parse_args([str(tmp_path)])).use_scan_index
+    assert not options_from_args(parser.parse_args([str(tmp_path), "--no-scan-index"])).use_scan_index
@@ -0,0 +1,56 @@
+"""Tests for the bundle output sinks."""
+
+from __future__ import annotations
+
+import json
+import tarfile
+import zipfile
+from pathlib import Path
+
+import pytest
+
+from app.config import LOG_FILE_NAME
+from app.core.output_sink import create_output_sink
+
+
+def _write_bundle(input_dir: Path, mode: str) -> Path:
+    sink = create_output_sink(input_dir, mode)
+    logger = sink.open()
+    for name in ("a.docx", "sub/b.xlsx", "a.pdf"):
+        output_file = sink.plan(input_dir / name, input_dir)
+        sink.write(output_file, f"# {name}\n", input_dir / name, ["注意"] if name == "a.pdf" else [])
+    logger.info("Completed.")
+    sink.close(logger)
+    return sink.location
+
+
+def _read_bundle(location: Path, mode: str) -> dict[str, str]:
+    if mode == "zip":
+        with zipfile.ZipFile(location) as archive:
+            return {name: archive.read(name).decode("utf-8") for name in archive.namelist()}
+    if mode == "tar":
+        with tarfile.open(location) as archive:
+            return {
+                info.name: archive.extractfile(info).read().decode("utf-8")  # type: ignore[union-attr]
+                for info in archive.getmembers()
+            }
+    records = [json.loads(line) for line in location.read_text(encoding="utf-8").splitlines()]
+    return {record["path"]: record.get("markdown", record.get("log")) for record in records}
+
+
+@pytest.mark.parametrize("mode", ["zip", "tar", "jsonl"])
+def test_bundles_round_trip_members_and_log(tmp_path: Path, mode: str) -> None:
+    input_dir = tmp_path / "input"
+    input_dir.mkdir()
+
+    location = _write_bundle(input_dir, mode)
+    members = _read_bundle(location, mode)
+
+    assert location == tmp_path / f"input_md.{mode}"
+    assert list(members) == ["a.md", "sub/b.md", "a_2.md", LOG_FILE_NAME]
+    assert members["sub/b.md"] == "# sub/b.xlsx\n"
+    assert members["a_2.md"] == "# a.pdf\n"
+    assert members[LOG_FILE_NAME].endswith("INFO: Completed.\n")
+    if mode == "jsonl":
+        record = json.loads(location.read_text(encoding="utf-8").splitlines()[2])
+        assert (record["source"], record["warnings"]) == (str(input_dir / "a.pdf"), ["注意"])
@@ -0,0 +1,135 @@
+"""Tests for the write-behind output stage."""
+
+from __future__ import annotations
+
+import threading
+from dataclasses import dataclass
+from pathlib import Path
+
+import pytest
+
+from app.core.logger import MemoryConversionLogger
+from app.core.output_sink import OutputSink
+from app.core.output_writer import WriteBehindWriter, WriteJob
+
+
+class _FailingSink(OutputSink):
+    def __init__(self, location: Path, failing: str) -> None:
+        super().__init__(location)
+        self.failing = failing
+
+    def write(self, output_file: Path, markdown: str, source: Path, warnings: list[str]) -> None:
+        if source.name == self.failing:
+            raise OSError("disk full")
+        super().write(output_file, markdown, source, warnings)
+
+
+def test_outcomes_are_attributed_to_their_source(tmp_path: Path) -> None:
+    sink = _FailingSink(tmp_path / "out", failing="b.docx")
+    sink.open()
+    with WriteBehindWriter(sink, max_pending=1) as writer:
+        for name in ("a.docx", "b.docx", "c.docx"):
+            source = tmp_path / "in" / "sub" / name
+            writer.submit(WriteJob(source, sink.location / "sub" / f"{name}.md", name, ["w"]))
+        outcomes = writer.completed() + writer.close()
+
+    results = {outcome.job.source.name: outcome.error for outcome in outcomes}
+    assert set(results) == {"a.docx", "b.docx", "c.docx"}
+    assert isinstance(results["b.docx"], OSError)
+    assert results["a.docx"] is None and results["c.docx"] is None
+    assert (sink.location / "sub" / "c.docx.md").read_text(encoding="utf-8") == "c.docx"
+    assert not (sink.location / "sub" / "b.docx.md").exists()
+
+
+def test_directories_are_created_once(tmp_path: Path, monkeypatch: pytest.MonkeyPatch) -> None:
+    sink = OutputSink(tmp_path / "out")
+    sink.open()
+    created: list[Path] = []
+    original_mkdir = Path.mkdir
+
+    def counting_mkdir(self: Path, *args: object, **kwargs: object) -> None:
+        created.append(self)
+        original_mkdir(self, *args, **kwargs)
+
+    monkeypatch.setattr(Path, "mkdir", counting_mkdir)
+    for index in range(5):
+        for folder in ("a", "a/b"):
+            sink.write(sink.location / folder / f"{index}.md", "x", Path("src"), [])
+
+    assert created == [sink.location / "a", sink.location / "a" / "b"]
+
+
+def test_submit_blocks_while_the_queue_is_full(tmp_path: Path) -> None:
+    release = threading.Event()
+
+    class _SlowSink(OutputSink):
+        def write(self, output_file: Path, markdown: str, source: Path, warnings: list[str]) -> None:
+            release.wait()
+
+    writer = WriteBehindWriter(_SlowSink(tmp_path), max_pending=1)
+    submitted = threading.Event()
+
+    def submit_three() -> None:
+        for index in range(3):
+            writer.submit(WriteJob(Path(f"{index}"), tmp_path / f"{index}.md", "x"))
+        submitted.set()
+
+    thread = threading.Thread(target=submit_three, daemon=True)
+    thread.start()
+    assert not submitted.wait(0.3)
+    release.set()
+    assert submitted.wait(5)
+    assert len(writer.close()) == 3
+
+
+def test_same_stem_inputs_get_distinct_names_before_writes_land(tmp_path: Path) -> None:
+    release = threading.Event()
+
+    class _DelayedSink(OutputSink):
+        def write(self, output_file: Path, markdown: str, source: Path, warnings: list[str]) -> None:
+            release.wait(5)
+            super().write(output_file, markdown, source, warnings)
+
+    input_root = tmp_path / "in"
+    sink = _DelayedSink(tmp_path / "in_md")
+    sink.open()
+    with WriteBehindWriter(sink) as writer:
+        for name in ("report.docx", "report.xlsx"):
+            source = input_root / name
+            writer.submit(WriteJob(source, sink.plan(source, input_root), name))
+        release.set()
+        outcomes = writer.completed() + writer.close()
+
+    assert sorted(outcome.job.output_file.name for outcome in outcomes) == ["report.md", "report_2.md"]
+    assert (sink.location / "report.md").read_text(encoding="utf-8") == "report.docx"
+    assert (sink.location / "report_2.md").read_text(encoding="utf-8") == "report.xlsx"
+
+
+def test_deferred_log_lines_are_written_on_the_writer_thread(tmp_path: Path) -> None:
+    writes: list[tuple[str, int]] = []
+
+    @dataclass(frozen=True)
+    class _RecordingLogger(MemoryConversionLogger):
+        def write_lines(self, lines: list[str]) -> None:
+            writes.append((threading.current_thread().name, len(lines)))
+            super().write_lines(lines)
+
+    target = _RecordingLogger(tmp_path / "conversion.log")
+    sink = OutputSink(tmp_path / "out")
+    sink.open()
+    writer = WriteBehindWriter(sink)
+    logger = writer.deferred_logger(target)
+    for index in range(3):
+        logger.info(f"line {index}")
+    writer.close()
+    logger.info("after close")
+
+    assert [line.split("INFO: ")[1] for line in target.lines] == [
+        "line 0\n",
+        "line 1\n",
+        "line 2\n",
+        "after close\n",
+    ]
+    assert {name for name, _count in writes[:-1]} == {"output-writer"}
+    assert writes[-1] == (threading.current_thread().name, 1)
+    assert not (tmp_path / "conversion.log").exists()
@@ -0,0 +1,92 @@
+"""Tests for outlier profiling capture."""
+
+from __future__ import annotations
+
+import pstats
+import threading
+from pathlib import Path
+
+from openpyxl import Workbook
+
+from app.config import PROFILE_DIR_NAME
+from app.controllers.conversion_controller import ConversionController, ConversionSummary
+from app.core.profiling import OutlierProfiler
+from app.models.conversion_options import ConversionOptions
+
+
+def _run(input_dir: Path, options: ConversionOptions) -> ConversionSummary:
+    done = threading.Event()
+    outcome: dict[str, object] = {}
+
+    def finish(key: str):
+        def callback(value: object) -> None:
+            outcome[key] = value
+            done.set()
+
+        return callback
+
+    controller = ConversionController(
+        dispatch=lambda callback: callback(),
+        on_start=lambda output_dir, total: None,
+        on_progress=lambda event: None,
+        on_complete=finish("summary"),
+        on_error=finish("error"),
+    )
+    controller.start(input_dir, options)
+    assert done.wait(60)
+    assert "error" not in outcome, outcome.get("error")
+    summary = outcome["summary"]
+    assert isinstance(summary, ConversionSummary)
+    return summary
+
+
+def test_outlier_files_are_profiled_up_to_the_limit(tmp_path: Path) -> None:
+    input_dir = tmp_path / "in"
+    input_dir.mkdir()
+    for name in ("a.xlsx", "b.xlsx"):
+        workbook = Workbook()
+        workbook.active.append(["name", "value"])
+        workbook.active.append([name, 1])
+        workbook.save(input_dir / name)
+
+    summary = _run(
+        input_dir,
+        ConversionOptions(use_scan_index=False, profile_seconds=0.0, profile_limit=1),
+    )
+
+    assert summary.success_count == 2
+    profile_dir = summary.output_dir / PROFILE_DIR_NAME
+    profiles = sorted(profile_dir.glob("*.prof"))
+    assert [path.name for path in profiles] == ["00001_a.xlsx.prof"]
+    pstats.Stats(str(profiles[0]))
+    report = (profile_dir / "00001_a.xlsx.alloc.txt").read_text(encoding="utf-8")
+    assert "traced peak:" in report and "cumulative" in report
+
+    log = summary.log_path.read_text(encoding="utf-8")
+    assert f"-> {profiles[0]}, {profile_dir / '00001_a.xlsx.alloc.txt'}" in log
+    assert "b.xlsx" in log and "limit=1 reached" in log
+
+
+def test_profiling_is_not_set_up_without_thresholds(tmp_path: Path) -> None:
+    input_dir = tmp_path / "in"
+    input_dir.mkdir()
+    Workbook().save(input_dir / "a.xlsx")
+
+    summary = _run(input_dir, ConversionOptions(use_scan_index=False))
+
+    assert summary.success_count == 1
+    assert not (summary.output_dir / PROFILE_DIR_NAME).exists()
+    assert "PROFILE:" not in summary.log_path.read_text(encoding="utf-8")
+
+
+def test_capture_records_errors_of_the_rerun(tmp_path: Path) -> None:
+    profiler = OutlierProfiler(tmp_path / "profiles", seconds=0.0)
+
+    def broken() -> object:
+        raise ValueError("boom")
+
+    capture = profiler.capture(3, Path("dir/x y.docx"), broken)
+
+    assert capture is not None
+    assert capture.profile_path.name == "00003_x_y.docx.prof"
+    assert "error: ValueError: boom" in capture.allocations_path.read_text(encoding="utf-8")
@@ -0,0 +1,92 @@
+"""Tests for run-level I/O budgets."""
+
+from __future__ import annotations
+
+import threading
+import time
+from pathlib import Path
+
+from app.controllers.conversion_controller import ConversionController, ConversionSummary
+from app.core.resource_governor import ResourceGovernor, ResourceLimits, TokenBucket, parse_byte_rate
+from app.models.conversion_options import ConversionOptions
+
+
+def test_budget_overdraft_delays_the_next_caller_and_is_reported() -> None:
+    governor = ResourceGovernor(ResourceLimits(write_bytes_per_second=4000))
+    governor.write(6000)
+    started = time.monotonic()
+    governor.write(1000)
+
+    assert time.monotonic() - started >= 0.4
+    report = governor.report()
+    assert report.write.amount == 7000
+    assert report.write.configured == 4000
+    assert report.input.configured is None
+    assert parse_byte_rate("20M") == 20 * 1024 * 1024
+    assert parse_byte_rate("off") is None
+
+
+def test_report_keeps_each_limit_with_the_period_it_applied_to() -> None:
+    governor = ResourceGovernor()
+    governor.write(100)
+    governor.update(ResourceLimits(write_bytes_per_second=1e9))
+    governor.write(50)
+
+    report = governor.report()
+
+    assert [(period.write.amount, period.write.configured) for period in report.periods] == [
+        (100, None),
+        (50, 1e9),
+    ]
+    assert report.write.amount == 150
+    assert "(limit none)" in report.describe() and "(limit 953.7MB/s)" in report.describe()
+
+
+def test_changed_rate_releases_waiting_callers() -> None:
+    bucket = TokenBucket(rate=10)
+    bucket.take(10)
+    waited: list[float] = []
+    thread = threading.Thread(target=lambda: waited.append(bucket.take(10)))
+    thread.start()
+    time.sleep(0.1)
+    bucket.set_rate(None)
+    thread.join(timeout=2)
+
+    assert waited and waited[0] < 0.5
+
+
+def test_controller_paces_files_and_reports_rates(tmp_path: Path) -> None:
+    input_dir = tmp_path / "input"
+    input_dir.mkdir()
+    workbook = (Path(__file__).parent / "fixtures" / "xlwt_legacy.xls").read_bytes()
+    for name in ("a", "b", "c"):
+        (input_dir / f"{name}.xls").write_bytes(workbook)
+    done = threading.Event()
+    summaries: list[ConversionSummary] = []
+
+    def on_complete(summary: ConversionSummary) -> None:
+        summaries.append(summary)
+        done.set()
+
+    controller = ConversionController(
+        dispatch=lambda callback: callback(),
+        on_start=lambda output_dir, total: None,
+        on_progress=lambda event: None,
+        on_complete=on_complete,
+        on_error=lambda error: done.set(),
+    )
+    assert not controller.update_limits(ResourceLimits())
+    controller.start(
+        input_dir,
+        ConversionOptions(use_scan_index=False, files_per_second=2, read_bytes_per_second=1e9),
+    )
+    assert done.wait(timeout=30)
+
+    summary = summaries[0]
+    resources = summary.resources
+    assert summary.success_count == 3
+    assert resources is not None
+    assert resources.files.amount == 3 and resources.files.configured == 2
+    assert resources.seconds >= 0.4
+    assert resources.input.amount == sum(path.stat().st_size for path in input_dir.iterdir())
+    assert "Resources: input=" in summary.log_path.read_text(encoding="utf-8")
@@ -0,0 +1,114 @@
+"""Tests for the local HTTP conversion service (localhost only)."""
+
+from __future__ import annotations
+
+import asyncio
+import json
+import threading
+from concurrent.futures import ThreadPoolExecutor
+from pathlib import Path
+
+from app.core.document_converter import ConversionResult
+from app.server import ConversionServer
+
+
+async def _request(port: int, head: str, body: bytes = b"") -> tuple[int, dict[str, str], bytes]:
+    reader, writer = await asyncio.open_connection("127.0.0.1", port)
+    writer.write(head.encode("latin-1") + body)
+    await writer.drain()
+    raw = await reader.read()
+    writer.close()
+    header_blob, _, payload = raw.partition(b"\r\n\r\n")
+    lines = header_blob.decode("latin-1").split("\r\n")
+    headers = {}
+    for line in lines[1:]:
+        name, _, value = line.partition(":")
+        headers[name.strip().lower()] = value.strip()
+    if headers.get("transfer-encoding") == "chunked":
+        payload = _dechunk(payload)
+    return int(lines[0].split(" ")[1]), headers, payload
+
+
+def _dechunk(payload: bytes) -> bytes:
+    decoded = b""
+    while True:
+        size_line, _, rest = payload.partition(b"\r\n")
+        size = int(size_line, 16)
+        if size == 0:
+            return decoded
+        decoded += rest[:size]
+        payload = rest[size + 2 :]
+
+
+def _upload(name: str, body: bytes) -> str:
+    return (
+        f"POST /convert?filename={name} HTTP/1.1\r\n"
+        f"Host: localhost\r\nContent-Length: {len(body)}\r\n\r\n"
+    )
+
+
+def test_convert_upload_health_and_metrics() -> None:
+    def convert(path: Path, data: bytes | None = None) -> ConversionResult:
+        return ConversionResult(markdown="x" * 200_000 + path.name, warnings=["注意"])
+
+    async def scenario() -> None:
+        with ThreadPoolExecutor(max_workers=2) as executor:
+            server = ConversionServer(executor, workers=2, convert=convert)
+            listener = await server.start("127.0.0.1", 0)
+            port = listener.sockets[0].getsockname()[1]
+            async with listener:
+                status, headers, body = await _request(port, _upload("a.docx", b"data"), b"data")
+                assert status == 200
+                assert body.decode("utf-8").endswith("a.docx")
+                assert json.loads(headers["x-conversion-warnings"]) == ["注意"]
+
+                status, _, body = await _request(port, _upload("a.txt", b"data"), b"data")
+                assert status == 415
+
+                path_request = f"POST /convert?path={Path(__file__)} HTTP/1.1\r\n\r\n"
+                status, _, body = await _request(port, path_request)
+                assert status == 403
+
+                status, _, body = await _request(port, "GET /health HTTP/1.1\r\n\r\n")
+                assert status == 200 and json.loads(body)["status"] == "ok"
+
+                status, _, body = await _request(port, "GET /metrics HTTP/1.1\r\n\r\n")
+                metrics = json.loads(body)
+                assert metrics["completed"] == 1
+                assert metrics["latency_p95"] is not None
+
+    asyncio.run(scenario())
+
+
+def test_queue_limit_rejects_excess_requests() -> None:
+    release = threading.Event()
+
+    def convert(path: Path, data: bytes | None = None) -> ConversionResult:
+        release.wait(timeout=10)
+        return ConversionResult(markdown="ok", warnings=[])
+
+    async def scenario() -> None:
+        with ThreadPoolExecutor(max_workers=1) as executor:
+            server = ConversionServer(executor, workers=1, max_queue=1, convert=convert)
+            listener = await server.start("127.0.0.1", 0)
+            port = listener.sockets[0].getsockname()[1]
+            async with listener:
+                first = asyncio.create_task(_request(port, _upload("a.docx", b"1"), b"1"))
+                second = asyncio.create_task(_request(port, _upload("b.docx", b"2"), b"2"))
+                while server.metrics()["queue_depth"] < 1:
+                    await asyncio.sleep(0.01)
+
+                # Rejected from the headers alone: the announced body is never sent.
+                status, headers, _ = await asyncio.wait_for(
+                    _request(port, _upload("c.docx", b"3" * 1_000_000)),
+                    timeout=5,
+                )
+                assert status == 503
+                assert headers["retry-after"] == "1"
+
+                release.set()
+                assert (await first)[0] == 200
+                assert (await second)[0] == 200
+                assert server.metrics()["rejected"] == 1
+
+    asyncio.run(scenario())
@@ -0,0 +1,116 @@
+"""Tests for sharded conversion over a shared work queue (local processes)."""
+
+from __future__ import annotations
+
+import multiprocessing
+import threading
+import time
+from pathlib import Path
+
+from app.controllers.shard_runner import ShardedConversionRunner
+from app.core.document_converter import ConversionResult
+from app.core.work_queue import Job, WorkQueue
+
+
+def _slow_convert(path: Path) -> ConversionResult:
+    time.sleep(0.05)
+    if path.name.startswith("broken"):
+        raise ValueError("cannot convert")
+    return ConversionResult(markdown=f"# {path.name}\n", warnings=["w"])
+
+
+def _run_node(input_dir: str, queue_path: str, node_id: str) -> None:
+    ShardedConversionRunner(
+        Path(input_dir),
+        queue_path=Path(queue_path),
+        node_id=node_id,
+        lease_seconds=1.0,
+        poll_interval=0.1,
+        convert=_slow_convert,
+    ).run()
+
+
+def test_nodes_share_queue_reclaim_dead_leases_and_merge_log(tmp_path: Path) -> None:
+    input_dir = tmp_path / "docs"
+    for index in range(4):
+        folder = input_dir / f"dir{index}"
+        folder.mkdir(parents=True)
+        for name in ("a.docx", "a.xlsx", "b.xls"):
+            (folder / name).write_bytes(b"")
+    (input_dir / "broken.docx").write_bytes(b"")
+    queue_path = tmp_path / "queue.sqlite"
+
+    # A node that leases work and dies without finishing it.
+    seeder = ShardedConversionRunner(input_dir, queue_path=queue_path, node_id="dead")
+    with WorkQueue(queue_path, "dead") as queue:
+        output_dir = seeder._join(queue)
+        abandoned, _ = queue.lease(count=2, lease_seconds=0.5)
+    assert len(abandoned) == 2
+
+    context = multiprocessing.get_context("spawn")
+    nodes = [
+        context.Process(target=_run_node, args=(str(input_dir), str(queue_path), f"node{index}"))
+        for index in range(3)
+    ]
+    for node in nodes:
+        node.start()
+    for node in nodes:
+        node.join(timeout=60)
+        assert node.exitcode == 0
+
+    summary = ShardedConversionRunner(
+        input_dir, queue_path=queue_path, node_id="reader", convert=_slow_convert
+    ).run()
+    assert summary.total == 13
+    assert summary.success_count == 12
+    assert summary.failure_count == 1
+    assert summary.warning_count == 12
+
+    outputs = sorted(p.relative_to(output_dir).as_posix() for p in output_dir.rglob("*.md"))
+    assert len(outputs) == 12 and len(set(outputs)) == 12
+    assert "dir0/a.md" in outputs and "dir0/a_2.md" in outputs
+
+    log = (output_dir / "conversion.log").read_text(encoding="utf-8")
+    assert log.count("SUCCESS:") == 12
+    assert "FAILED:" in log and "cannot convert" in log
+    assert "node=dead" not in log
+
+
+def test_hung_conversion_stops_renewing_and_is_reclaimed(tmp_path: Path) -> None:
+    input_dir = tmp_path / "docs"
+    input_dir.mkdir()
+    (input_dir / "hang.docx").write_bytes(b"")
+    queue_path = tmp_path / "queue.sqlite"
+    release = threading.Event()
+
+    def hanging_convert(path: Path) -> ConversionResult:
+        release.wait(timeout=30)
+        return ConversionResult(markdown="late", warnings=[])
+
+    runner = ShardedConversionRunner(
+        input_dir,
+        queue_path=queue_path,
+        node_id="hung",
+        lease_seconds=0.3,
+        max_job_seconds=0.2,
+        poll_interval=0.05,
+        convert=hanging_convert,
+    )
+    thread = threading.Thread(target=runner.run, daemon=True)
+    thread.start()
+
+    with WorkQueue(queue_path, "other") as queue:
+        deadline = time.monotonic() + 10
+        reclaimed: list[Job] = []
+        while not reclaimed and time.monotonic() < deadline:
+            time.sleep(0.05)
+            if queue.is_initialized():
+                reclaimed, _ = queue.lease(count=1, lease_seconds=60)
+        assert [job.source for job in reclaimed] == ["hang.docx"]
+        assert queue.complete(reclaimed[0], [], 0.0)
+
+    release.set()
+    thread.join(timeout=10)
+    assert not thread.is_alive()
+    with WorkQueue(queue_path, "reader") as queue:
+        assert [record.node for record in queue.records()] == ["other"]
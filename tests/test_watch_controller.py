@@ -0,0 +1,98 @@
+"""Tests for watch-folder mode."""
+
+from __future__ import annotations
+
+import threading
+import time
+import zipfile
+from pathlib import Path
+
+from app.controllers.watch_controller import WatchController
+from app.core.document_converter import ConversionResult
+
+
+def _fake_convert(path: Path) -> ConversionResult:
+    return ConversionResult(markdown=f"# {path.name}\n", warnings=[])
+
+
+def _wait_for(predicate, timeout: float = 10.0) -> bool:
+    deadline = time.monotonic() + timeout
+    while time.monotonic() < deadline:
+        if predicate():
+            return True
+        time.sleep(0.05)
+    return False
+
+
+def test_watch_converts_dropped_files_into_stable_output(tmp_path: Path) -> None:
+    input_dir = tmp_path / "intake"
+    (input_dir / "sub").mkdir(parents=True)
+    controller = WatchController(
+        input_dir,
+        debounce_seconds=0.2,
+        poll_interval=0.1,
+        force_polling=True,
+        convert=_fake_convert,
+    )
+    stop = threading.Event()
+    thread = threading.Thread(target=controller.run, args=(stop,), daemon=True)
+    thread.start()
+    try:
+        dropped = input_dir / "sub" / "a.docx"
+        with zipfile.ZipFile(dropped, "w") as archive:
+            archive.writestr("word/document.xml", "<w/>")
+        (input_dir / "sub" / "~$a.docx").write_bytes(b"lock")
+
+        output = tmp_path / "intake_md" / "sub" / "a.md"
+        assert _wait_for(output.exists)
+        assert output.read_text(encoding="utf-8") == "# a.docx\n"
+
+        dropped.unlink()
+        assert _wait_for(lambda: not output.exists())
+    finally:
+        stop.set()
+        thread.join(timeout=10)
+
+    metrics = controller.metrics()
+    assert metrics.converted == 1
+    assert metrics.removed == 1
+    assert metrics.latency_p50 is not None
+    assert not (tmp_path / "intake_md" / "sub" / "~$a.md").exists()
+
+
+def test_failed_reconversion_removes_the_previous_output(tmp_path: Path) -> None:
+    input_dir = tmp_path / "intake"
+    input_dir.mkdir()
+    source = input_dir / "a.docx"
+
+    def convert(path: Path) -> ConversionResult:
+        if path.read_bytes().endswith(b"broken"):
+            raise ValueError("corrupt")
+        return _fake_convert(path)
+
+    controller = WatchController(
+        input_dir,
+        debounce_seconds=0.2,
+        poll_interval=0.1,
+        force_polling=True,
+        convert=convert,
+    )
+    stop = threading.Event()
+    thread = threading.Thread(target=controller.run, args=(stop,), daemon=True)
+    thread.start()
+    try:
+        with zipfile.ZipFile(source, "w") as archive:
+            archive.writestr("word/document.xml", "<w/>")
+        output = tmp_path / "intake_md" / "a.md"
+        assert _wait_for(output.exists)
+
+        with source.open("ab") as handle:
+            handle.write(b"broken")
+        assert _wait_for(lambda: not output.exists())
+    finally:
+        stop.set()
+        thread.join(timeout=10)
+
+    assert controller.metrics().failed == 1
+    log = (tmp_path / "intake_md" / "conversion.log").read_text(encoding="utf-8")
+    assert "FAILED:" in log and "REMOVED:" in log
@@ -0,0 +1,87 @@
+"""Tests for the streaming .xls engine."""
+
+from __future__ import annotations
+
+import re
+from pathlib import Path
+
+import pytest
+
+from app.core.document_converter import convert_document
+from app.core.xls_reader import XlsFormatError, XlsWorkbook
+
+# Written by xlwt (see fixtures/make_xlwt_legacy.py), not by this project.
+FIXTURE = Path(__file__).parent / "fixtures" / "xlwt_legacy.xls"
+
+
+def test_xls_sheets_are_rendered_with_image_headings() -> None:
+    result = convert_document(FIXTURE)
+
+    assert result.markdown == (
+        "## 売上（画像あり）\n"
+        "| name | Unnamed: 1 | amount | name.1 | date |\n"
+        "| --- | --- | --- | --- | --- |\n"
+        "| a\\|b | 1.5 | 3 | TRUE | 2024-01-31 |\n"
+        "|  |  |  |  |  |\n"
+        "| x<br>y |  |  |  |  |\n"
+        "\n"
+        "## Empty"
+    )
+    assert result.warnings == []
+    assert convert_document(Path("member.xls"), FIXTURE.read_bytes()) == result
+
+
+def test_formula_results_of_kind_empty_string_are_cached_values() -> None:
+    # xlwt stores formula results the way Excel stores an empty string:
+    # 0xFFFF marker with result kind 3.
+    with XlsWorkbook(FIXTURE) as workbook:
+        sheet = next(workbook.sheets())
+        rows = dict(sheet.rows())
+
+    assert rows[3][2] == ""
+    assert sheet.missing_formula_count == 0
+
+
+def test_string_formulas_without_a_string_record_are_reported() -> None:
+    data = bytearray(FIXTURE.read_bytes())
+    # FORMULA record for C4; switch its result kind from 3 (empty string)
+    # to 0 (string in the following STRING record), which xlwt never writes.
+    match = re.search(rb"\x06\x00..\x03\x00\x02\x00", bytes(data), re.DOTALL)
+    assert match is not None and data[match.start() + 10] == 3
+    data[match.start() + 10] = 0
+
+    result = convert_document(Path("member.xls"), bytes(data))
+
+    assert result.warnings == ["数式結果が取得できないセルがあります。（例: 売上!C4）"]
+
+
+def test_cells_beyond_a_stale_dimensions_record_are_kept() -> None:
+    data = bytearray(FIXTURE.read_bytes())
+    # DIMENSIONS of the first sheet: claim a single column instead of five.
+    position = bytes(data).index(b"\x00\x02\x0e\x00") + 4
+    data[position + 10 : position + 12] = (1).to_bytes(2, "little")
+
+    result = convert_document(Path("member.xls"), bytes(data))
+
+    assert result.markdown == convert_document(FIXTURE).markdown
+    assert result.warnings == []
+
+
+def test_shared_strings_continued_across_records_are_joined(tmp_path: Path) -> None:
+    xlwt = pytest.importorskip("xlwt")
+    texts = [f"行{index}" * 3 for index in range(3000)] + ["x" * 9000, "日本語" * 5000]
+    book = xlwt.Workbook(encoding="utf-8")
+    sheet = book.add_sheet("S")
+    for row, text in enumerate(texts):
+        sheet.write(row, 0, text)
+    book.save(str(tmp_path / "strings.xls"))
+
+    with XlsWorkbook(tmp_path / "strings.xls") as workbook:
+        rows = [cells[0] for sheet in workbook.sheets() for _row, cells in sheet.rows()]
+
+    assert rows == texts
+
+
+def test_files_that_are_not_biff8_are_rejected() -> None:
+    with pytest.raises(XlsFormatError):
+        XlsWorkbook(b"not an OLE2 file" * 64)
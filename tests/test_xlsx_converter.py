@@ -0,0 +1,142 @@
+"""Tests for the compact .xlsx engine."""
+
+from __future__ import annotations
+
+import datetime as dt
+import zipfile
+from pathlib import Path
+
+import openpyxl
+
+from app.core import markitdown_engine
+from app.core.engine_registry import XLSX_COMPACT_MIN_SIZE, FilePreflight, default_registry
+from app.core.xlsx_converter import convert
+from app.core.xlsx_reader import SharedStringStore, XlsxWorkbook
+
+_MAIN = "http://schemas.openxmlformats.org/spreadsheetml/2006/main"
+_REL = "http://schemas.openxmlformats.org/officeDocument/2006/relationships"
+_PKG = "http://schemas.openxmlformats.org/package/2006/relationships"
+
+
+def _write_workbook(path: Path, sheet_xml: str | None = None) -> None:
+    parts = {
+        "_rels/.rels": f'<Relationships xmlns="{_PKG}">'
+        f'<Relationship Id="rId1" Type="{_REL}/officeDocument" Target="xl/workbook.xml"/></Relationships>',
+        "xl/workbook.xml": f'<workbook xmlns="{_MAIN}" xmlns:r="{_REL}"><sheets>'
+        '<sheet name="一覧" sheetId="1" r:id="rId1"/><sheet name="Chart" sheetId="2" r:id="rId4"/>'
+        "</sheets></workbook>",
+        "xl/_rels/workbook.xml.rels": f'<Relationships xmlns="{_PKG}">'
+        f'<Relationship Id="rId1" Type="{_REL}/worksheet" Target="worksheets/sheet1.xml"/>'
+        f'<Relationship Id="rId2" Type="{_REL}/styles" Target="styles.xml"/>'
+        f'<Relationship Id="rId3" Type="{_REL}/sharedStrings" Target="/xl/sharedStrings.xml"/>'
+        f'<Relationship Id="rId4" Type="{_REL}/chartsheet" Target="chartsheets/sheet1.xml"/>'
+        "</Relationships>",
+        "xl/styles.xml": f'<styleSheet xmlns="{_MAIN}"><numFmts count="1">'
+        '<numFmt numFmtId="164" formatCode="yyyy/mm/dd"/></numFmts>'
+        '<cellXfs count="2"><xf numFmtId="0"/><xf numFmtId="164"/></cellXfs></styleSheet>',
+        "xl/sharedStrings.xml": f'<sst xmlns="{_MAIN}">'
+        "<si><t>氏名</t></si>"
+        "<si><r><t>田中</t></r><r><t xml:space=\"preserve\"> 太郎</t></r>"
+        "<rPh sb=\"0\" eb=\"2\"><t>タナカ</t></rPh></si>"
+        "<si><t>line_x000D_break|pipe</t></si>"
+        "</sst>",
+        "xl/worksheets/sheet1.xml": f'<worksheet xmlns="{_MAIN}"><dimension ref="A1:C4"/><sheetData>'
+        '<row r="1"><c r="A1" t="s"><v>0</v></c><c r="B1" t="inlineStr"><is><t>日付</t></is></c></row>'
+        '<row r="2"><c r="A2" t="s"><v>1</v></c><c r="B2" s="1"><v>45292</v></c>'
+        '<c r="C2" t="b"><v>1</v></c></row>'
+        '<row r="4"><c r="A4" t="s"><v>2</v></c><c r="B4"><f>SUM(1,2)</f></c></row>'
+        "</sheetData><drawing r:id=\"rId1\" xmlns:r=\"" + _REL + "\"/></worksheet>",
+        "xl/worksheets/_rels/sheet1.xml.rels": f'<Relationships xmlns="{_PKG}">'
+        f'<Relationship Id="rId1" Type="{_REL}/drawing" Target="../drawings/drawing1.xml"/>'
+        "</Relationships>",
+        "xl/drawings/drawing1.xml": '<xdr:wsDr xmlns:xdr="urn:xdr"><xdr:twoCellAnchor>'
+        "<xdr:pic/></xdr:twoCellAnchor></xdr:wsDr>",
+    }
+    if sheet_xml is not None:
+        parts["xl/worksheets/sheet1.xml"] = (
+            f'<worksheet xmlns="{_MAIN}"><sheetData>{sheet_xml}</sheetData></worksheet>'
+        )
+    with zipfile.ZipFile(path, "w") as archive:
+        for name, text in parts.items():
+            archive.writestr(name, text)
+
+
+def test_shared_strings_dates_formulas_and_pictures_are_rendered(tmp_path: Path) -> None:
+    path = tmp_path / "export.xlsx"
+    _write_workbook(path)
+
+    result = convert(path)
+
+    assert result.markdown == (
+        "## 一覧（画像あり）\n"
+        "| 氏名 | 日付 | Unnamed: 2 |\n"
+        "| --- | --- | --- |\n"
+        "| 田中 太郎 | 2024-01-01 | TRUE |\n"
+        "|  |  |  |\n"
+        "| line<br>break\\|pipe |  |  |"
+    )
+    assert result.warnings == ["数式結果が取得できないセルがあります。（例: 一覧!B4）"]
+
+
+def test_later_wider_rows_keep_every_column_without_dimension(tmp_path: Path) -> None:
+    path = tmp_path / "export.xlsx"
+    _write_workbook(
+        path,
+        '<row r="1"><c r="A1" t="s"><v>0</v></c><c r="B1" t="inlineStr"><is><t>日付</t></is></c></row>'
+        '<row r="2"><c><v>1</v></c><c><v>2</v></c><c><v>3</v></c><c r="D2"><v>4</v></c></row>',
+    )
+
+    result = convert(path)
+
+    assert result.markdown == (
+        "## 一覧（画像あり）\n"
+        "| 氏名 | 日付 | Unnamed: 2 | Unnamed: 3 |\n"
+        "| --- | --- | --- | --- |\n"
+        "| 1 | 2 | 3 | 4 |"
+    )
+    assert result.warnings == []
+
+
+def test_cell_text_differs_from_markitdown_as_documented(tmp_path: Path) -> None:
+    path = tmp_path / "mixed.xlsx"
+    workbook = openpyxl.Workbook()
+    sheet = workbook.active
+    sheet.title = "一覧"
+    sheet.append(["name", "count", "ratio", "date", "flag"])
+    sheet.append(["a", 1, 1.5, dt.datetime(2024, 1, 31), True])
+    sheet.append(["b", None, 2.0, None, False])
+    workbook.save(path)
+
+    compact = convert(path).markdown.splitlines()
+    fallback = markitdown_engine.convert(path).markdown.splitlines()
+
+    # Same heading, header and shape; cells are formatted one by one
+    # instead of by pandas column dtype.
+    assert compact[:3] == fallback[:3]
+    assert compact[3:] == ["| a | 1 | 1.5 | 2024-01-31 | TRUE |", "| b |  | 2 |  | FALSE |"]
+    assert fallback[3:] == [
+        "| a | 1.0 | 1.5 | 2024-01-31 | True |",
+        "| b | NaN | 2.0 | NaT | False |",
+    ]
+
+
+def test_spilled_store_matches_in_memory_store(tmp_path: Path) -> None:
+    path = tmp_path / "export.xlsx"
+    _write_workbook(path)
+    with XlsxWorkbook(path, spill_bytes=4) as spilled, XlsxWorkbook(path.read_bytes()) as in_memory:
+        assert spilled.strings.spilled and not in_memory.strings.spilled
+        assert [spilled.strings[i] for i in range(3)] == [in_memory.strings[i] for i in range(3)]
+        assert spilled.strings[1] == "田中 太郎"
+
+    store = SharedStringStore(spill_bytes=None)
+    for text in ("", "a", "日本語"):
+        store.append(text)
+    store.finish()
+    assert (len(store), store[0], store[2]) == (3, "", "日本語")
+
+
+def test_only_large_workbooks_use_the_compact_engine() -> None:
+    large = FilePreflight(Path("big.xlsx"), b"PK\x03\x04" + bytes(XLSX_COMPACT_MIN_SIZE))
+    small = FilePreflight(Path("small.xlsx"), b"PK\x03\x04")
+    assert [spec.name for spec in default_registry.chain(large)] == ["xlsx-compact", "markitdown"]
+    assert [spec.name for spec in default_registry.chain(small)] == ["markitdown"]